@@ -0,0 +1,108 @@
+"""Compare transcription throughput for different splits of a CPU core budget.
+
+For each worker count, the same audio file is transcribed ``--episodes`` times by that many
+concurrent workers. This runs twice: once "unmanaged", where every worker uses torch's
+default of one thread per core, and once with a ``CpuPlan``, where each worker gets its own
+cores. Models are loaded before the clock starts.
+
+    uv run python scripts/benchmark_cpu_split.py episode.mp3 --budget 8 --workers 1,2,4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+import torch
+import whisper
+
+from pod2text.resources import PROCESS_CORES, activate, pinned, plan_cpus
+from pod2text.transcribe import ModelPool, transcribe_segments
+
+
+def run_split(
+    audio_path: Path,
+    model_name: str,
+    language: str,
+    budget: int,
+    workers: int,
+    episodes: int,
+    managed: bool,
+) -> dict[str, object]:
+    plan = plan_cpus(budget, workers) if managed else None
+    cores = PROCESS_CORES[:budget]
+    pool = ModelPool(model_name, workers, cpu_slots=plan.transcribe if plan else None)
+    if plan is not None:
+        activate(plan)
+    else:
+        torch.set_num_threads(len(cores))
+
+    def transcribe(_: int) -> None:
+        with pool.acquire() as model:
+            transcribe_segments(audio_path, model_name, language, model=model)
+
+    started = time.perf_counter()
+    try:
+        with pinned(cores) if plan is None else nullcontext():
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(transcribe, range(episodes)))
+    finally:
+        activate(None)
+    wall = time.perf_counter() - started
+    return {
+        "workers": workers,
+        "threads_per_worker": plan.threads_per_worker if plan else len(cores),
+        "mode": "planned" if managed else "unmanaged",
+        "wall_seconds": round(wall, 2),
+        "episodes_per_hour": round(episodes / wall * 3600, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio", type=Path)
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--budget", type=int, default=len(PROCESS_CORES))
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts.")
+    parser.add_argument("--episodes", type=int, default=4)
+    parser.add_argument("--json", type=Path, help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    audio_seconds = len(whisper.load_audio(str(args.audio))) / whisper.audio.SAMPLE_RATE
+    print(f"{args.audio}: {audio_seconds:.0f}s of audio, {args.budget} core(s), '{args.model}'.")
+    results = []
+    for workers in (int(value) for value in args.workers.split(",")):
+        if workers > args.budget:
+            print(f"Skipping {workers} workers: more than {args.budget} cores.")
+            continue
+        for managed in (False, True):
+            result = run_split(
+                args.audio,
+                args.model,
+                args.language,
+                args.budget,
+                workers,
+                args.episodes,
+                managed,
+            )
+            result["x_real_time"] = round(
+                audio_seconds * args.episodes / float(result["wall_seconds"]), 2
+            )
+            results.append(result)
+            print(
+                f"{result['workers']} worker(s) x {result['threads_per_worker']} thread(s) "
+                f"{result['mode']:>9}: {result['wall_seconds']:>7.1f}s, "
+                f"{result['episodes_per_hour']:>6.1f} episodes/h, "
+                f"{result['x_real_time']:.1f}x real time"
+            )
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compare CPU time and peak memory of feedparser and the streaming feed reader.
+
+Builds a synthetic podcast feed with ``--items`` episodes (long show notes, iTunes tags) unless
+feed files are given, then parses each one four ways: feedparser on the whole document, and the
+streaming reader for the latest episode, for the episodes newer than a known one
+(``--known-position``) and for every episode.
+
+    uv run python scripts/benchmark_feed_parse.py --items 3000
+    uv run python scripts/benchmark_feed_parse.py big_feed.xml
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from itertools import islice
+from pathlib import Path
+
+import feedparser
+
+from pod2text.podcast import FEED_CHUNK_BYTES, _episode_from_entry, iter_feed_episodes
+
+NOTES = "Show notes with links, chapter marks and sponsor reads. " * 40
+
+
+def build_feed(items: int) -> bytes:
+    entries = "".join(
+        f"""<item>
+  <title>Folge {number}</title>
+  <guid isPermaLink="false">episode-{number}</guid>
+  <link>https://example.com/episodes/{number}</link>
+  <pubDate>Mon, 01 Jan 2024 05:00:00 +0000</pubDate>
+  <description><![CDATA[<p>{NOTES}</p>]]></description>
+  <itunes:summary>{NOTES}</itunes:summary>
+  <itunes:duration>00:42:{number % 60:02d}</itunes:duration>
+  <itunes:episode>{number}</itunes:episode>
+  <podcast:transcript url="https://example.com/{number}.vtt" type="text/vtt"/>
+  <enclosure url="https://cdn.example.com/{number}.mp3" type="audio/mpeg" length="1"/>
+</item>
+"""
+        for number in range(items, 0, -1)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"
+     xmlns:podcast="https://podcastindex.org/namespace/1.0">
+<channel><title>Benchmark</title>
+{entries}</channel></rss>""".encode()
+
+
+def measure(label: str, parse: Callable[[], int]) -> dict[str, object]:
+    tracemalloc.start()
+    started = time.process_time()
+    episodes = parse()
+    cpu = time.process_time() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "parser": label,
+        "episodes": episodes,
+        "cpu_ms": round(cpu * 1000, 1),
+        "peak_mib": round(peak / 2**20, 2),
+    }
+
+
+def benchmark(feed: bytes, known_position: int) -> list[dict[str, object]]:
+    offsets = range(0, len(feed), FEED_CHUNK_BYTES)
+    chunks = [feed[offset : offset + FEED_CHUNK_BYTES] for offset in offsets]
+    every = list(iter_feed_episodes(chunks))
+    known = {every[min(known_position, len(every) - 1)].identifier}
+
+    def until_known() -> int:
+        return sum(1 for _ in iter_feed_episodes(chunks, stop_at=known))
+
+    def full_feedparser() -> int:
+        entries = feedparser.parse(feed).entries
+        return sum(_episode_from_entry(entry) is not None for entry in entries)
+
+    return [
+        measure("feedparser, whole feed", full_feedparser),
+        measure("stream, latest", lambda: len(list(islice(iter_feed_episodes(chunks), 1)))),
+        measure("stream, until known", until_known),
+        measure("stream, whole feed", lambda: sum(1 for _ in iter_feed_episodes(chunks))),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("feeds", type=Path, nargs="*", help="Feed files (default: synthetic).")
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--known-position", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    fixtures = {str(path): path.read_bytes() for path in args.feeds} or {
+        f"synthetic ({args.items} items)": build_feed(args.items)
+    }
+    results = []
+    for name, feed in fixtures.items():
+        print(f"{name}: {len(feed) / 2**20:.1f} MiB")
+        for result in benchmark(feed, args.known_position):
+            result["feed"] = name
+            results.append(result)
+            print(
+                f"  {result['parser']:<24} {result['episodes']:>6} episode(s) "
+                f"{result['cpu_ms']:>9.1f} ms CPU {result['peak_mib']:>8.2f} MiB peak"
+            )
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,12 @@ IMAGE_NAME="${IMAGE_NAME:-pod2text:latest}"
 CONTAINER_NAME="${CONTAINER_NAME:-pod2text-server}"
 PODCAST="${PODCAST:-Was jetzt}"
 INTERVAL_MINUTES="${INTERVAL_MINUTES:-30}"
+DOCKERFILE="${DOCKERFILE:-Dockerfile}"
+WHISPER_MODELS="${WHISPER_MODELS:-small}"
+MODEL_VOLUME="${MODEL_VOLUME:-}"
+READY_TIMEOUT_SECONDS="${READY_TIMEOUT_SECONDS:-300}"
+IMAGE_SIZE="unknown"
+READY_SECONDS="unknown"
 DEPLOY_STARTED_AT="$(date +%s)"
 
 log() {
@@ -54,21 +60,55 @@ run_step() {
   log "${step_label} completed in $((step_ended_at - step_started_at))s"
 }
 
+build_image() {
+  env DOCKER_BUILDKIT=1 docker build \
+    -f "${DOCKERFILE}" \
+    --build-arg WHISPER_MODELS="${WHISPER_MODELS}" \
+    -t "${IMAGE_NAME}" .
+  size_bytes="$(docker image inspect -f '{{.Size}}' "${IMAGE_NAME}")"
+  IMAGE_SIZE="$((size_bytes / 1024 / 1024)) MB"
+  log "Image ${IMAGE_NAME} is ${IMAGE_SIZE}"
+}
+
 replace_container() {
   mkdir -p output
   if docker ps -a --format '{{.Names}}' | grep -Fx "${CONTAINER_NAME}" >/dev/null 2>&1; then
     docker rm -f "${CONTAINER_NAME}" >/dev/null
   fi
 
+  # An optional named volume for Whisper weights (images built with WHISPER_MODELS="").
+  set -- -v "$(pwd)/output:/app/output"
+  if [ -n "${MODEL_VOLUME}" ]; then
+    set -- "$@" -v "${MODEL_VOLUME}:/models"
+  fi
+
   docker run -d \
     --name "${CONTAINER_NAME}" \
     --env-file .env \
     -e PODCAST="${PODCAST}" \
     -e INTERVAL_MINUTES="${INTERVAL_MINUTES}" \
-    -v "$(pwd)/output:/app/output" \
+    "$@" \
     "${IMAGE_NAME}" >/dev/null
 }
 
+wait_until_ready() {
+  started_at="$(date +%s)"
+  while ! docker logs "${CONTAINER_NAME}" 2>&1 | grep -F "pod2text is ready." >/dev/null; do
+    if [ "$(docker inspect -f '{{.State.Running}}' "${CONTAINER_NAME}")" != "true" ]; then
+      docker logs --tail 20 "${CONTAINER_NAME}" >&2 || true
+      log "Container exited before it was ready."
+      return 1
+    fi
+    if [ "$(($(date +%s) - started_at))" -ge "${READY_TIMEOUT_SECONDS}" ]; then
+      log "Container not ready after ${READY_TIMEOUT_SECONDS}s."
+      return 1
+    fi
+    sleep 1
+  done
+  READY_SECONDS="$(($(date +%s) - started_at))s"
+  log "Container ready ${READY_SECONDS} after start"
+}
+
 on_exit() {
   exit_code="$1"
   deploy_ended_at="$(date +%s)"
@@ -76,7 +116,7 @@ on_exit() {
 
   if [ "$exit_code" -eq 0 ]; then
     log "Deploy succeeded in ${total_duration}s"
-    send_telegram_notification "✅ pod2text deploy succeeded (${IMAGE_NAME}) in ${total_duration}s on $(hostname)."
+    send_telegram_notification "✅ pod2text deploy succeeded (${IMAGE_NAME}, ${IMAGE_SIZE}) in ${total_duration}s on $(hostname); ready ${READY_SECONDS} after start."
   else
     log "Deploy failed in ${total_duration}s (exit ${exit_code})"
     send_telegram_notification "❌ pod2text deploy failed (${IMAGE_NAME}) after ${total_duration}s on $(hostname). Exit code: ${exit_code}."
@@ -85,8 +125,9 @@ on_exit() {
 
 trap 'on_exit "$?"' EXIT
 
-run_step "Step 1/3: Running setup wizard" python3 scripts/setup_env.py
-run_step "Step 2/3: Building Docker image (${IMAGE_NAME})" env DOCKER_BUILDKIT=1 docker build -t "${IMAGE_NAME}" .
-run_step "Step 3/3: Replacing container (${CONTAINER_NAME})" replace_container
+run_step "Step 1/4: Running setup wizard" python3 scripts/setup_env.py
+run_step "Step 2/4: Building Docker image (${IMAGE_NAME} from ${DOCKERFILE})" build_image
+run_step "Step 3/4: Replacing container (${CONTAINER_NAME})" replace_container
+run_step "Step 4/4: Waiting for the ready message" wait_until_ready
 
 log "Container is running. Follow logs with: docker logs -f ${CONTAINER_NAME}"
@@ -9,6 +9,22 @@ TRANSCRIPTION_MODEL="${TRANSCRIPTION_MODEL:-small}"
 LLM_MODEL="${LLM_MODEL:-gpt-4o-mini}"
 LANGUAGE="${LANGUAGE:-de}"
 
+if [ -n "${POD2TEXT_MODEL_DIR:-}" ]; then
+  # Verify the weights before serving. Baked models are only checksummed; a mounted, empty
+  # model volume is filled once. Set MODELS_OFFLINE=1 to fail instead of downloading.
+  WHISPER_MODELS="${WHISPER_MODELS:-$TRANSCRIPTION_MODEL}"
+  if [ "$LANGUAGE" = "auto" ]; then
+    WHISPER_MODELS="$WHISPER_MODELS tiny"
+  fi
+  if [ "${MODELS_OFFLINE:-0}" = "1" ]; then
+    # shellcheck disable=SC2086
+    /app/.venv/bin/pod2text models $WHISPER_MODELS --offline
+  else
+    # shellcheck disable=SC2086
+    /app/.venv/bin/pod2text models $WHISPER_MODELS
+  fi
+fi
+
 exec /app/.venv/bin/pod2text serve \
   --podcast "$PODCAST" \
   --interval-minutes "$INTERVAL_MINUTES" \
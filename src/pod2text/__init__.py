@@ -1,5 +1,5 @@
 """pod2text package."""
 
-from .main import run_pipeline
+from .main import run_pipeline, run_pipeline_async
 
-__all__ = ["run_pipeline"]
+__all__ = ["run_pipeline", "run_pipeline_async"]
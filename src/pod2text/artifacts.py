@@ -0,0 +1,174 @@
+"""Per-feed, per-episode artifact layout with atomic writes and audio retention."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from pod2text.download import DEFAULT_BASENAME
+from pod2text.podcast import Episode
+
+FEEDS_DIRNAME = "feeds"
+LATEST_LINK_NAME = "latest"
+AUDIO_BASENAME = "audio"
+SUMMARY_FILENAME = "summary.md"
+METADATA_FILENAME = "episode.json"
+DEFAULT_KEEP_AUDIO = 5
+KEY_LENGTH = 16
+
+
+@dataclass(slots=True)
+class EpisodeArtifacts:
+    output_dir: Path
+    feed_key: str
+    episode_key: str
+
+    @property
+    def directory(self) -> Path:
+        return self.output_dir / FEEDS_DIRNAME / self.feed_key / self.episode_key
+
+    @property
+    def summary_path(self) -> Path:
+        return self.directory / SUMMARY_FILENAME
+
+    @property
+    def metadata_path(self) -> Path:
+        return self.directory / METADATA_FILENAME
+
+    def find_audio(self) -> Path | None:
+        matches = sorted(self.directory.glob(f"{AUDIO_BASENAME}.*"))
+        return matches[0] if matches else None
+
+    def read_metadata(self) -> dict[str, Any]:
+        try:
+            metadata = json.loads(self.metadata_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return metadata if isinstance(metadata, dict) else {}
+
+    def update_metadata(self, **fields: Any) -> None:
+        metadata = self.read_metadata()
+        metadata.update(fields)
+        atomic_write_text(self.metadata_path, json.dumps(metadata, indent=2))
+
+
+def artifact_key(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+
+def episode_artifacts(output_dir: Path, feed_url: str, episode: Episode) -> EpisodeArtifacts:
+    artifacts = EpisodeArtifacts(
+        output_dir=output_dir,
+        feed_key=artifact_key(feed_url),
+        episode_key=artifact_key(episode.identifier),
+    )
+    artifacts.directory.mkdir(parents=True, exist_ok=True)
+    if not artifacts.metadata_path.exists():
+        metadata = {
+            "feed_url": feed_url,
+            "identifier": episode.identifier,
+            "title": episode.title,
+            "audio_url": episode.audio_url,
+            "published": episode.published,
+            "created_at": datetime.now(UTC).isoformat(),
+        }
+        atomic_write_text(artifacts.metadata_path, json.dumps(metadata, indent=2))
+    return artifacts
+
+
+@contextmanager
+def atomic_target(path: Path) -> Iterator[Path]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, raw_tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    tmp_path = Path(raw_tmp)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def atomic_write_text(path: Path, text: str) -> Path:
+    with atomic_target(path) as tmp_path:
+        tmp_path.write_text(text, encoding="utf-8")
+    return path
+
+
+def update_latest_links(artifacts: EpisodeArtifacts, audio_path: Path) -> None:
+    output_dir = artifacts.output_dir
+    latest = output_dir / LATEST_LINK_NAME
+    _replace_symlink(latest, artifacts.directory.relative_to(output_dir))
+    _replace_symlink(output_dir / SUMMARY_FILENAME, Path(LATEST_LINK_NAME) / SUMMARY_FILENAME)
+
+    audio_link = output_dir / f"{DEFAULT_BASENAME}{audio_path.suffix}"
+    _replace_symlink(audio_link, Path(LATEST_LINK_NAME) / audio_path.name)
+    for stale in output_dir.glob(f"{DEFAULT_BASENAME}.*"):
+        if stale != audio_link and (stale.is_symlink() or stale.is_file()):
+            stale.unlink(missing_ok=True)
+
+
+def prune_audio(output_dir: Path, keep_per_feed: int = DEFAULT_KEEP_AUDIO) -> list[Path]:
+    if keep_per_feed < 0:
+        raise ValueError("keep_per_feed must not be negative.")
+
+    protected = _latest_directory(output_dir)
+    removed: list[Path] = []
+    feeds_root = output_dir / FEEDS_DIRNAME
+    if not feeds_root.is_dir():
+        return removed
+
+    for feed_dir in sorted(path for path in feeds_root.iterdir() if path.is_dir()):
+        episode_dirs = sorted(
+            (path for path in feed_dir.iterdir() if path.is_dir()),
+            key=_episode_created_at,
+            reverse=True,
+        )
+        for episode_dir in episode_dirs[keep_per_feed:]:
+            if protected is not None and episode_dir.resolve() == protected:
+                continue
+            for audio in episode_dir.glob(f"{AUDIO_BASENAME}.*"):
+                audio.unlink()
+                removed.append(audio)
+    return removed
+
+
+def _replace_symlink(link: Path, target: Path) -> None:
+    tmp_link = link.with_name(f".{link.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_link.unlink(missing_ok=True)
+    try:
+        tmp_link.symlink_to(target)
+    except OSError as error:
+        print(f"Could not create symlink {link} -> {target}: {error}")
+        return
+    if link.is_dir() and not link.is_symlink():
+        tmp_link.unlink()
+        print(f"Not replacing directory {link} with a symlink.")
+        return
+    os.replace(tmp_link, link)
+
+
+def _latest_directory(output_dir: Path) -> Path | None:
+    latest = output_dir / LATEST_LINK_NAME
+    if not latest.is_symlink():
+        return None
+    return latest.resolve()
+
+
+def _episode_created_at(episode_dir: Path) -> str:
+    metadata_path = episode_dir / METADATA_FILENAME
+    try:
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return datetime.fromtimestamp(episode_dir.stat().st_mtime, UTC).isoformat()
+    created_at = metadata.get("created_at") if isinstance(metadata, dict) else None
+    return str(created_at or "")
@@ -0,0 +1,199 @@
+"""Disk-budgeted episode audio cache with LRU eviction and Opus recompression."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from pod2text.artifacts import (
+    AUDIO_BASENAME,
+    FEEDS_DIRNAME,
+    EpisodeArtifacts,
+    atomic_target,
+    atomic_write_text,
+)
+from pod2text.metrics import METRICS, record_cache_lookup
+from pod2text.resources import decoding, ffmpeg_threads
+
+STATS_FILENAME = "audio_store.json"
+OPUS_EXTENSION = ".opus"
+OPUS_BITRATE = "24k"
+AUDIO_EVICTIONS = "pod2text_audio_evictions_total"
+AUDIO_STORE_BYTES = "pod2text_audio_store_bytes"
+
+_STATS_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class AudioStoreStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+    recompressions: int = 0
+    recompression_saved_bytes: int = 0
+    stored_bytes: int = 0
+    stored_files: int = 0
+
+
+class AudioStore:
+    def __init__(self, output_dir: Path, budget_bytes: int = 0) -> None:
+        if budget_bytes < 0:
+            raise ValueError("budget_bytes must not be negative.")
+        self.output_dir = output_dir
+        self.budget_bytes = budget_bytes
+
+    @property
+    def stats_path(self) -> Path:
+        return self.output_dir / FEEDS_DIRNAME / STATS_FILENAME
+
+    def lookup(self, artifacts: EpisodeArtifacts) -> Path | None:
+        audio = artifacts.find_audio()
+        hit = audio is not None and audio.stat().st_size > 0
+        record_cache_lookup("audio", hit)
+        self._update_stats(hits=1 if hit else 0, misses=0 if hit else 1)
+        if audio is None or not hit:
+            return None
+        _touch(audio)
+        return audio
+
+    def admit(self, audio_path: Path) -> list[Path]:
+        _touch(audio_path)
+        return self.evict(protect={audio_path})
+
+    def evict(self, protect: set[Path] | None = None) -> list[Path]:
+        protected = {path.resolve() for path in protect or set()}
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(entry[1].st_size for entry in entries)
+        removed: list[Path] = []
+        removed_bytes = 0
+
+        if self.budget_bytes > 0:
+            for path, stat in entries:
+                if total <= self.budget_bytes:
+                    break
+                if path.resolve() in protected:
+                    continue
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+                removed_bytes += stat.st_size
+                removed.append(path)
+
+        if removed:
+            METRICS.inc(AUDIO_EVICTIONS, amount=len(removed))
+        METRICS.set_gauge(AUDIO_STORE_BYTES, total)
+        self._update_stats(
+            evictions=len(removed),
+            evicted_bytes=removed_bytes,
+            stored_bytes=total,
+            stored_files=len(entries) - len(removed),
+            absolute={"stored_bytes", "stored_files"},
+        )
+        return removed
+
+    def recompress(self, audio_path: Path, bitrate: str = OPUS_BITRATE) -> Path:
+        if audio_path.suffix == OPUS_EXTENSION:
+            return audio_path
+        if shutil.which("ffmpeg") is None:
+            print("ffmpeg not found, keeping original audio.")
+            return audio_path
+
+        target = audio_path.with_suffix(OPUS_EXTENSION)
+        with atomic_target(target) as tmp_path, decoding():
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-nostdin",
+                    "-loglevel",
+                    "error",
+                    "-y",
+                    "-threads",
+                    ffmpeg_threads(),
+                    "-i",
+                    str(audio_path),
+                    "-vn",
+                    "-ac",
+                    "1",
+                    "-c:a",
+                    "libopus",
+                    "-b:a",
+                    bitrate,
+                    "-application",
+                    "voip",
+                    "-f",
+                    "ogg",
+                    str(tmp_path),
+                ],
+                check=True,
+            )
+        original_size = audio_path.stat().st_size
+        saved = max(original_size - target.stat().st_size, 0)
+        audio_path.unlink()
+        self._update_stats(recompressions=1, recompression_saved_bytes=saved)
+        print(
+            f"Recompressed {audio_path.name} to Opus: "
+            f"{original_size / 1e6:.1f} MB -> {target.stat().st_size / 1e6:.1f} MB."
+        )
+        return target
+
+    def stats(self) -> AudioStoreStats:
+        return _read_stats(self.stats_path)
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        feeds_root = self.output_dir / FEEDS_DIRNAME
+        if not feeds_root.is_dir():
+            return []
+        entries: list[tuple[Path, os.stat_result]] = []
+        for path in feeds_root.glob(f"*/*/{AUDIO_BASENAME}.*"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _update_stats(self, absolute: set[str] | None = None, **changes: int) -> None:
+        with _STATS_LOCK:
+            stats = _read_stats(self.stats_path)
+            for name, value in changes.items():
+                if name in (absolute or set()):
+                    setattr(stats, name, value)
+                else:
+                    setattr(stats, name, getattr(stats, name) + value)
+            atomic_write_text(self.stats_path, json.dumps(asdict(stats), indent=2))
+
+
+def format_stats(stats: AudioStoreStats) -> str:
+    lookups = stats.hits + stats.misses
+    hit_rate = (stats.hits / lookups * 100) if lookups else 0.0
+    return (
+        f"Audio store: {stats.stored_files} file(s), {stats.stored_bytes / 1e6:.1f} MB, "
+        f"hit rate {hit_rate:.0f}% ({stats.hits}/{lookups}), "
+        f"{stats.evictions} eviction(s) ({stats.evicted_bytes / 1e6:.1f} MB), "
+        f"{stats.recompressions} recompression(s) saving "
+        f"{stats.recompression_saved_bytes / 1e6:.1f} MB."
+    )
+
+
+def _read_stats(path: Path) -> AudioStoreStats:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return AudioStoreStats()
+    if not isinstance(raw, dict):
+        return AudioStoreStats()
+    fields = AudioStoreStats.__dataclass_fields__
+    return AudioStoreStats(
+        **{key: int(value) for key, value in raw.items() if key in fields}
+    )
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,305 @@
+"""Batch processing of many feeds or episodes in one long-lived process."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from pod2text.artifacts import atomic_write_text, episode_artifacts, update_latest_links
+from pod2text.download import looks_like_audio_url
+from pod2text.env import get_telegram_bot_token, get_telegram_chat_id
+from pod2text.llm_batch import (
+    DEFAULT_POLL_SECONDS,
+    LLM_BATCHES_DIRNAME,
+    BatchBackend,
+    SummaryJob,
+    run_summary_batch,
+)
+from pod2text.main import episode_language, process_episode
+from pod2text.metrics import METRICS, QUEUE_DEPTH, STAGE_SECONDS, stage_timer
+from pod2text.options import PipelineOptions
+from pod2text.podcast import Episode, fetch_episodes, resolve_feed_url
+from pod2text.resources import activate, plan_cpus
+from pod2text.telegram import post_summary
+from pod2text.transcribe import ModelPool
+
+DIRECT_EPISODES_FEED = "direct-episodes"
+REPORT_FILENAME = "batch_report.json"
+
+
+@dataclass(slots=True)
+class BatchItem:
+    feed_url: str
+    episode: Episode
+
+
+@dataclass(slots=True)
+class BatchItemResult:
+    title: str
+    feed_url: str
+    audio_path: str | None = None
+    transcript_path: str | None = None
+    summary_path: str | None = None
+    audio_bytes: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class BatchReport:
+    wall_seconds: float
+    succeeded: int
+    failed: int
+    audio_bytes: int
+    episodes_per_hour: float
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    items: list[BatchItemResult] = field(default_factory=list)
+
+
+def read_opml(path: Path) -> list[str]:
+    tree = ET.parse(path)
+    feeds: list[str] = []
+    for outline in tree.iter("outline"):
+        url = outline.get("xmlUrl") or outline.get("xmlurl")
+        if url and url not in feeds:
+            feeds.append(url)
+    if not feeds:
+        raise ValueError(f"No feed URLs found in OPML file: {path}")
+    return feeds
+
+
+def collect_batch_items(sources: list[str], episodes_per_feed: int = 1) -> list[BatchItem]:
+    if episodes_per_feed <= 0:
+        raise ValueError("episodes_per_feed must be greater than zero.")
+
+    items: list[BatchItem] = []
+    for source in sources:
+        if _is_direct_episode_url(source):
+            title = unquote(Path(urlparse(source).path).stem) or source
+            episode = Episode(identifier=source, title=title, audio_url=source)
+            items.append(BatchItem(feed_url=DIRECT_EPISODES_FEED, episode=episode))
+            continue
+
+        feed_url = resolve_feed_url(source)
+        for episode in fetch_episodes(feed_url, limit=episodes_per_feed):
+            items.append(BatchItem(feed_url=feed_url, episode=episode))
+    return items
+
+
+def run_batch(
+    items: list[BatchItem],
+    output_dir: Path,
+    options: PipelineOptions | None = None,
+    download_workers: int = 2,
+    transcribe_workers: int = 1,
+    summarize_workers: int = 4,
+    post_to_telegram: bool = True,
+    llm_batch: BatchBackend | None = None,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    cpu_budget: int = 0,
+) -> BatchReport:
+    for name, value in (
+        ("download_workers", download_workers),
+        ("transcribe_workers", transcribe_workers),
+        ("summarize_workers", summarize_workers),
+    ):
+        if value <= 0:
+            raise ValueError(f"{name} must be greater than zero.")
+
+    options = options or PipelineOptions()
+    # Keep every queued episode's audio until the batch is done with it.
+    item_options = replace(
+        options,
+        keep_audio=max(options.keep_audio, len(items)),
+        defer_summary=llm_batch is not None,
+    )
+    cpu_plan = plan_cpus(cpu_budget, transcribe_workers) if cpu_budget > 0 else None
+    print(f"Loading {transcribe_workers} '{options.transcription_model}' Whisper model(s).")
+    model_pool = ModelPool(
+        options.transcription_model,
+        size=transcribe_workers,
+        cpu_slots=cpu_plan.transcribe if cpu_plan is not None else None,
+    )
+    stage_limits = {
+        "download": threading.Semaphore(download_workers),
+        "summarize": threading.Semaphore(summarize_workers),
+        "telegram": threading.Semaphore(1),
+    }
+    stage_before = _stage_seconds()
+    pending = len(items)
+    pending_lock = threading.Lock()
+    METRICS.set_gauge(QUEUE_DEPTH, pending, queue="batch")
+
+    def run_item(item: BatchItem) -> BatchItemResult:
+        nonlocal pending
+        result = BatchItemResult(title=item.episode.title, feed_url=item.feed_url)
+        started = time.perf_counter()
+        try:
+            episode_result = process_episode(
+                feed_url=item.feed_url,
+                episode=item.episode,
+                output_dir=output_dir,
+                options=item_options,
+                prompt_for_key=False,
+                post_to_telegram=post_to_telegram and llm_batch is None,
+                model_pool=model_pool,
+                stage_limits=stage_limits,
+            )
+            audio_path = episode_result.audio_path
+            result.transcript_path = str(episode_result.transcript_path)
+            if episode_result.summary_path is not None:
+                result.summary_path = str(episode_result.summary_path)
+            if audio_path is not None and audio_path.exists():
+                result.audio_path = str(audio_path)
+                result.audio_bytes = audio_path.stat().st_size
+            print(f"Batch: finished '{item.episode.title}'.")
+        except Exception as error:  # noqa: BLE001
+            result.error = f"{type(error).__name__}: {error}"
+            print(f"Batch: failed '{item.episode.title}': {result.error}")
+        result.seconds = round(time.perf_counter() - started, 3)
+        with pending_lock:
+            pending -= 1
+            METRICS.set_gauge(QUEUE_DEPTH, pending, queue="batch")
+        return result
+
+    max_in_flight = download_workers + transcribe_workers + summarize_workers
+    started = time.perf_counter()
+    if cpu_plan is not None:
+        # Worker threads inherit the I/O cores; transcription and decoding pin themselves.
+        activate(cpu_plan)
+    try:
+        with ThreadPoolExecutor(max_in_flight, thread_name_prefix="batch") as executor:
+            results = list(executor.map(run_item, items))
+    finally:
+        if cpu_plan is not None:
+            activate(None)
+    if llm_batch is not None:
+        _summarize_in_llm_batch(
+            items, results, output_dir, options, llm_batch, post_to_telegram, poll_seconds
+        )
+    wall_seconds = time.perf_counter() - started
+
+    stage_after = _stage_seconds()
+    succeeded = sum(1 for result in results if result.error is None)
+    return BatchReport(
+        wall_seconds=round(wall_seconds, 3),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        audio_bytes=sum(result.audio_bytes for result in results),
+        episodes_per_hour=round(succeeded / wall_seconds * 3600, 2) if wall_seconds else 0.0,
+        stage_seconds={
+            stage: round(seconds - stage_before.get(stage, 0.0), 3)
+            for stage, seconds in sorted(stage_after.items())
+            if seconds - stage_before.get(stage, 0.0) > 0
+        },
+        items=results,
+    )
+
+
+def write_report(report: BatchReport, output_dir: Path) -> Path:
+    return atomic_write_text(output_dir / REPORT_FILENAME, json.dumps(asdict(report), indent=2))
+
+
+def format_report(report: BatchReport) -> str:
+    lines = [
+        f"Batch finished in {report.wall_seconds:.1f}s: "
+        f"{report.succeeded} succeeded, {report.failed} failed.",
+        f"Throughput: {report.episodes_per_hour:.1f} episodes/hour, "
+        f"{report.audio_bytes / 1e6:.1f} MB audio.",
+    ]
+    for stage, seconds in report.stage_seconds.items():
+        lines.append(f"  {stage}: {seconds:.1f}s total")
+    return "\n".join(lines)
+
+
+def _summarize_in_llm_batch(
+    items: list[BatchItem],
+    results: list[BatchItemResult],
+    output_dir: Path,
+    options: PipelineOptions,
+    backend: BatchBackend,
+    post_to_telegram: bool,
+    poll_seconds: float,
+) -> None:
+    pending: dict[str, tuple[BatchItem, BatchItemResult]] = {}
+    jobs: list[SummaryJob] = []
+    for item, result in zip(items, results, strict=True):
+        if result.error is not None or result.transcript_path is None:
+            continue
+        transcript_path = Path(result.transcript_path)
+        custom_id = f"{transcript_path.parent.parent.name}/{transcript_path.parent.name}"
+        pending[custom_id] = (item, result)
+        artifacts = episode_artifacts(output_dir, item.feed_url, item.episode)
+        language = episode_language(artifacts, item.feed_url, options.language)
+        jobs.append(SummaryJob(custom_id, item.episode.title, transcript_path, language))
+
+    try:
+        with stage_timer("summarize"):
+            summaries = run_summary_batch(
+                jobs,
+                backend,
+                work_dir=output_dir / LLM_BATCHES_DIRNAME,
+                model=options.llm_model,
+                language=options.language,
+                clean=options.clean,
+                drop_ads=options.drop_ads,
+                poll_seconds=poll_seconds,
+            )
+    except Exception as error:  # noqa: BLE001
+        # Transcripts are kept; every episode still waiting on the batch fails with the backend.
+        for item, result in pending.values():
+            result.error = f"LLM batch: {type(error).__name__}: {error}"
+            print(f"Batch: failed '{item.episode.title}': {result.error}")
+        return
+
+    for custom_id, (item, result) in pending.items():
+        summary = summaries[custom_id]
+        if summary.summary is None:
+            result.error = f"LLM batch: {summary.error}"
+            print(f"Batch: failed '{item.episode.title}': {result.error}")
+            continue
+        artifacts = episode_artifacts(output_dir, item.feed_url, item.episode)
+        result.summary_path = str(atomic_write_text(artifacts.summary_path, summary.summary))
+        if result.audio_path is not None:
+            update_latest_links(artifacts, Path(result.audio_path))
+        if post_to_telegram:
+            try:
+                with stage_timer("telegram"):
+                    post_summary(
+                        bot_token=get_telegram_bot_token(),
+                        chat_id=get_telegram_chat_id(),
+                        summary=summary.summary,
+                        episode_title=item.episode.title,
+                    )
+            except (ConnectionError, RuntimeError, ValueError) as error:
+                result.error = f"Telegram: {error}"
+                print(f"Batch: could not post '{item.episode.title}': {error}")
+
+
+def _stage_seconds() -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for histogram in METRICS.snapshot()["histograms"]:
+        stage = _stage_label(histogram)
+        if stage is not None:
+            totals[stage] = totals.get(stage, 0.0) + float(histogram["sum"])
+    return totals
+
+
+def _stage_label(histogram: dict[str, Any]) -> str | None:
+    if histogram["name"] != STAGE_SECONDS:
+        return None
+    return histogram["labels"].get("stage")
+
+
+def _is_direct_episode_url(source: str) -> bool:
+    parsed = urlparse(source)
+    if parsed.scheme not in {"http", "https"}:
+        return False
+    return looks_like_audio_url(source)
@@ -0,0 +1,234 @@
+"""Window-by-window transcription with an append-only on-disk journal."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import whisper
+
+from pod2text.resources import decoding
+from pod2text.stream import PcmBuffer
+from pod2text.transcribe import load_model
+from pod2text.transcript import Segment, Transcript
+
+JOURNAL_FILENAME = "transcript.journal.ndjson"
+JOURNAL_FORMAT = "pod2text-journal"
+DEFAULT_WINDOW_SECONDS = 300
+SAMPLE_RATE = whisper.audio.SAMPLE_RATE
+PROMPT_TAIL_CHARS = 200
+MIN_CARRY_SECONDS = 5.0
+
+ProgressCallback = Callable[[float, float], None]
+
+
+def transcribe_resumable(
+    audio_path: Path,
+    journal_path: Path,
+    model_name: str = "small",
+    language: str = "de",
+    model: whisper.Whisper | None = None,
+    window_seconds: int = DEFAULT_WINDOW_SECONDS,
+    progress: ProgressCallback | None = None,
+) -> Transcript:
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be greater than zero.")
+
+    with decoding():
+        audio = whisper.load_audio(str(audio_path))
+    return transcribe_windows(
+        audio,
+        journal_path=journal_path,
+        model=model or load_model(model_name),
+        language=language,
+        window_seconds=window_seconds,
+        header=_journal_header(audio_path, model_name, language, window_seconds),
+        progress=progress,
+    )
+
+
+def transcribe_stream(
+    pcm: PcmBuffer,
+    audio_url: str,
+    journal_path: Path,
+    model_name: str = "small",
+    language: str = "de",
+    model: whisper.Whisper | None = None,
+    window_seconds: int = DEFAULT_WINDOW_SECONDS,
+    progress: ProgressCallback | None = None,
+) -> Transcript:
+    """Transcribe windows as soon as the decoder has produced them, while audio downloads."""
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be greater than zero.")
+
+    header = {
+        "format": JOURNAL_FORMAT,
+        "audio_url": audio_url,
+        "model": model_name,
+        "language": language,
+        "window_seconds": window_seconds,
+    }
+    return transcribe_windows(
+        pcm,
+        journal_path=journal_path,
+        model=model or load_model(model_name),
+        language=language,
+        window_seconds=window_seconds,
+        header=header,
+        progress=progress,
+    )
+
+
+def transcribe_windows(
+    audio: np.ndarray | PcmBuffer,
+    journal_path: Path,
+    model: Any,
+    language: str,
+    window_seconds: int,
+    header: dict[str, Any],
+    progress: ProgressCallback | None = None,
+) -> Transcript:
+    source = audio if isinstance(audio, PcmBuffer) else PcmBuffer.from_array(audio)
+    offset, segments = read_journal(journal_path, header)
+    if offset > 0:
+        print(f"Resuming transcription at {offset:.0f}s of {source.total_seconds:.0f}s.")
+    else:
+        _write_lines(journal_path, [header], mode="w")
+
+    while True:
+        available, finished = source.wait_for(offset + window_seconds)
+        if offset >= available:
+            break
+        window_end = min(offset + window_seconds, available)
+        window = source.window(offset, window_end)
+        prompt = " ".join(segment.text for segment in segments[-3:])[-PROMPT_TAIL_CHARS:]
+        result = model.transcribe(window, language=language, initial_prompt=prompt or None)
+        window_segments, next_offset = _commit_window(
+            result.get("segments") or [],
+            offset=offset,
+            window_end=window_end,
+            is_last=finished and window_end >= available,
+        )
+        _write_lines(
+            journal_path,
+            [
+                {
+                    "offset": round(next_offset, 3),
+                    "segments": [
+                        [segment.start, segment.end, segment.tokens, segment.text]
+                        for segment in window_segments
+                    ],
+                }
+            ],
+            mode="a",
+        )
+        segments.extend(window_segments)
+        offset = next_offset
+        if progress is not None:
+            total_seconds = source.total_seconds
+            progress(min(offset, total_seconds), total_seconds)
+
+    transcript = Transcript.from_segments(segments)
+    if not transcript.text:
+        raise ValueError("Transcription returned no text.")
+    return transcript
+
+
+def read_journal(journal_path: Path, header: dict[str, Any]) -> tuple[float, list[Segment]]:
+    if not journal_path.exists():
+        return 0.0, []
+
+    with journal_path.open(encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    if not lines or _parse_line(lines[0]) != header:
+        print("Existing transcription journal does not match this run; starting over.")
+        return 0.0, []
+
+    offset = 0.0
+    segments: list[Segment] = []
+    valid = 1
+    for line in lines[1:]:
+        record = _parse_line(line)
+        if record is None:
+            break
+        offset = float(record["offset"])
+        segments.extend(
+            Segment(start=start, end=end, tokens=tokens, text=text)
+            for start, end, tokens, text in record["segments"]
+        )
+        valid += 1
+
+    if valid < len(lines):
+        # Drop a record torn by a crash so new windows append after the last good one.
+        journal_path.write_text("\n".join(lines[:valid]) + "\n", encoding="utf-8")
+    return offset, segments
+
+
+def format_progress(done_seconds: float, total_seconds: float) -> str:
+    percent = done_seconds / total_seconds * 100 if total_seconds else 100.0
+    return (
+        f"Transcription progress: {percent:.0f}% "
+        f"({done_seconds / 60:.1f} / {total_seconds / 60:.1f} min)"
+    )
+
+
+def _commit_window(
+    raw_segments: list[dict[str, Any]],
+    offset: float,
+    window_end: float,
+    is_last: bool,
+) -> tuple[list[Segment], float]:
+    segments = [
+        Segment(
+            start=round(offset + float(raw.get("start", 0.0)), 3),
+            end=round(offset + float(raw.get("end", 0.0)), 3),
+            tokens=len(raw.get("tokens") or []),
+            text=str(raw.get("text", "")).strip(),
+        )
+        for raw in raw_segments
+        if str(raw.get("text", "")).strip()
+    ]
+    if is_last or len(segments) < 2:
+        return segments, window_end
+
+    # The final segment is likely cut by the window edge; re-transcribe it next time.
+    carried = segments[-1]
+    if carried.start - offset < MIN_CARRY_SECONDS:
+        return segments, window_end
+    return segments[:-1], carried.start
+
+
+def _journal_header(
+    audio_path: Path,
+    model_name: str,
+    language: str,
+    window_seconds: int,
+) -> dict[str, Any]:
+    return {
+        "format": JOURNAL_FORMAT,
+        "audio": audio_path.name,
+        "audio_bytes": audio_path.stat().st_size,
+        "model": model_name,
+        "language": language,
+        "window_seconds": window_seconds,
+    }
+
+
+def _write_lines(path: Path, records: list[dict[str, Any]], mode: str) -> None:
+    with path.open(mode, encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _parse_line(line: str) -> dict[str, Any] | None:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
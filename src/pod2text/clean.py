@@ -0,0 +1,201 @@
+"""Deterministic transcript cleaning that trims LLM input before summarization."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from pod2text.metrics import METRICS
+from pod2text.transcript import Segment, Transcript
+
+TOKENS_REMOVED = "pod2text_transcript_tokens_removed_total"
+CHARS_PER_TOKEN = 4.0
+MAX_REPEATED_WORDS = 6
+
+FILLERS: dict[str, tuple[str, ...]] = {
+    "de": ("äh", "ähm", "äähm", "öh", "öhm", "hm", "hmm", "mhm", "ähh", "ehm"),
+    "en": ("uh", "uhm", "um", "umm", "erm", "er", "hm", "hmm", "mhm", "ah"),
+}
+# Discourse markers that are only filler when set off by a comma, e.g. "Also, ..." or "..., ne,".
+SOFT_FILLERS: dict[str, tuple[str, ...]] = {
+    "de": ("also", "ne", "halt", "sozusagen", "quasi", "irgendwie"),
+    "en": ("like", "you know", "i mean", "basically", "actually"),
+}
+NON_SPEECH_MARKERS = (
+    "musik",
+    "music",
+    "applaus",
+    "applause",
+    "lachen",
+    "lacht",
+    "laughter",
+    "jingle",
+    "intro",
+    "outro",
+    "stille",
+    "silence",
+)
+AD_MARKERS: dict[str, tuple[str, ...]] = {
+    "de": (
+        "werbung",
+        "anzeige",
+        "sponsored",
+        "unterstützt von",
+        "präsentiert von",
+        "mit dem code",
+        "rabattcode",
+        "gutscheincode",
+    ),
+    "en": (
+        "sponsored by",
+        "brought to you by",
+        "promo code",
+        "use code",
+        "this episode is supported by",
+    ),
+}
+# Lines Whisper is known to hallucinate over silence and music.
+HALLUCINATIONS = (
+    "untertitel im auftrag des zdf",
+    "untertitelung des zdf",
+    "untertitel der amara.org-community",
+    "subtitles by the amara.org community",
+)
+
+_BRACKETED = re.compile(r"[\[(*♪]+\s*([^\])*♪]{0,40}?)\s*[\])*♪]+")
+# A single word must repeat three times ("die die" is valid German), phrases twice.
+_REPEATED_WORD = re.compile(r"\b(\w+)(?:[\s,.!?…-]+\1\b){2,}", re.IGNORECASE)
+_REPEATED_PHRASE = re.compile(
+    rf"\b(\w+(?:[\s,]+\w+){{1,{MAX_REPEATED_WORDS - 1}}})(?:[\s,.!?…-]+\1\b)+",
+    re.IGNORECASE,
+)
+_HALLUCINATION = re.compile("|".join(re.escape(line) for line in HALLUCINATIONS), re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+_SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([,.!?;:])")
+_DUPLICATE_COMMAS = re.compile(r",(?:\s*,)+")
+_LEADING_PUNCTUATION = re.compile(r"^[\s,;:.]+")
+
+
+@dataclass(slots=True)
+class CleaningReport:
+    segments_before: int = 0
+    segments_after: int = 0
+    chars_before: int = 0
+    chars_after: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    fillers_removed: int = 0
+    repetitions_collapsed: int = 0
+    segments_dropped: int = 0
+
+    @property
+    def tokens_removed(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def clean_transcript(
+    transcript: str | Transcript,
+    language: str = "de",
+    drop_ads: bool = False,
+) -> tuple[Transcript | str, CleaningReport]:
+    if isinstance(transcript, str):
+        segments = [Segment(0.0, 0.0, estimate_tokens(transcript), transcript)]
+    else:
+        segments = list(transcript)
+
+    cleaner = _Cleaner(language, drop_ads)
+    report = CleaningReport(segments_before=len(segments))
+    kept: list[Segment] = []
+    previous_key = ""
+    for segment in segments:
+        report.chars_before += len(segment.text)
+        report.tokens_before += segment.tokens
+        text = cleaner.clean(segment.text, report)
+        key = text.casefold()
+        if not text or key == previous_key:
+            # Empty after cleaning, non-speech, an ad read, or a repeated hallucination line.
+            report.segments_dropped += 1
+            continue
+        previous_key = key
+        tokens = round(segment.tokens * len(text) / len(segment.text)) if segment.text else 0
+        kept.append(Segment(start=segment.start, end=segment.end, tokens=tokens, text=text))
+        report.chars_after += len(text)
+        report.tokens_after += tokens
+
+    report.segments_after = len(kept)
+    METRICS.inc(TOKENS_REMOVED, amount=max(report.tokens_removed, 0))
+    if isinstance(transcript, str):
+        return " ".join(segment.text for segment in kept), report
+    return Transcript.from_segments(kept), report
+
+
+def estimate_tokens(text: str) -> int:
+    return round(len(text) / CHARS_PER_TOKEN)
+
+
+def format_cleaning_report(report: CleaningReport) -> str:
+    percent = report.tokens_removed / report.tokens_before * 100 if report.tokens_before else 0.0
+    return (
+        f"Transcript cleaning removed ~{report.tokens_removed} tokens ({percent:.0f}%): "
+        f"{report.fillers_removed} filler(s), {report.repetitions_collapsed} repetition(s), "
+        f"{report.segments_dropped} segment(s) dropped."
+    )
+
+
+class _Cleaner:
+    def __init__(self, language: str, drop_ads: bool) -> None:
+        base_language = language.split("-")[0].lower()
+        # "uh" or "er" are words elsewhere ("er" is German for "he"): no list, no removal.
+        fillers = FILLERS.get(base_language, ())
+        soft_fillers = SOFT_FILLERS.get(base_language, ())
+        self.fillers = (
+            re.compile(
+                rf"(?:^|(?<=[\s,]))(?:{_alternation(fillers)})(?:[,.…]*)(?=\s|$)",
+                re.IGNORECASE,
+            )
+            if fillers
+            else None
+        )
+        self.soft_fillers = (
+            re.compile(
+                rf"(?:^|(?<=,)|(?<=[.!?]))\s*(?:{_alternation(soft_fillers)})\s*,",
+                re.IGNORECASE,
+            )
+            if soft_fillers
+            else None
+        )
+        # Podcasts in any language read English sponsor lines, so those markers always apply.
+        ad_markers = AD_MARKERS.get(base_language, ()) + AD_MARKERS["en"] if drop_ads else ()
+        self.ads = re.compile(_alternation(ad_markers), re.IGNORECASE) if ad_markers else None
+
+    def clean(self, text: str, report: CleaningReport) -> str:
+        if _HALLUCINATION.search(text) or (self.ads is not None and self.ads.search(text)):
+            return ""
+
+        text = _BRACKETED.sub(self._bracketed, text)
+        if self.fillers is not None:
+            text, count = self.fillers.subn("", text)
+            report.fillers_removed += count
+        if self.soft_fillers is not None:
+            text, count = self.soft_fillers.subn(" ", text)
+            report.fillers_removed += count
+        for pattern in (_REPEATED_PHRASE, _REPEATED_WORD):
+            text, count = pattern.subn(r"\1", text)
+            report.repetitions_collapsed += count
+
+        text = _DUPLICATE_COMMAS.sub(",", text)
+        text = _SPACE_BEFORE_PUNCTUATION.sub(r"\1", text)
+        text = _LEADING_PUNCTUATION.sub("", _SPACES.sub(" ", text)).strip()
+        return text if any(char.isalnum() for char in text) else ""
+
+    @staticmethod
+    def _bracketed(match: re.Match[str]) -> str:
+        label = match.group(1).strip().casefold()
+        if not label or any(marker in label for marker in NON_SPEECH_MARKERS):
+            return " "
+        return match.group(0)
+
+
+def _alternation(words: tuple[str, ...]) -> str:
+    # Longest first so "ähm" wins over "äh".
+    return "|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
@@ -2,14 +2,57 @@
 
 from __future__ import annotations
 
+import os
+import socket
+import time
 from pathlib import Path
 from typing import Annotated
 
 import typer
 
+from pod2text.artifacts import DEFAULT_KEEP_AUDIO
+from pod2text.batch import (
+    collect_batch_items,
+    format_report,
+    read_opml,
+    run_batch,
+    write_report,
+)
+from pod2text.checkpoint import DEFAULT_WINDOW_SECONDS
+from pod2text.env import get_openai_api_key
+from pod2text.events import DEFAULT_MAX_MB as DEFAULT_JOURNAL_MB
+from pod2text.events import (
+    EVENTS_FILENAME,
+    compare_windows,
+    format_comparison,
+    format_journal,
+    in_window,
+    open_journal,
+    parse_window,
+    read_events,
+)
+from pod2text.language import DEFAULT_STABLE_EPISODES
+from pod2text.llm_batch import (
+    DEFAULT_POLL_SECONDS,
+    BatchBackend,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+)
 from pod2text.main import run_pipeline
+from pod2text.metrics import METRICS
+from pod2text.model_store import ensure_models
+from pod2text.options import PipelineOptions
+from pod2text.search import format_hits, reindex, search, search_db_path
 from pod2text.server import run_server
 from pod2text.setup_wizard import run_setup_wizard
+from pod2text.transcribe_worker import DEFAULT_MAX_JOBS, DEFAULT_MAX_RSS_MB
+from pod2text.work_queue import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    WorkQueue,
+    run_worker,
+)
+from pod2text.work_queue import DEFAULT_POLL_SECONDS as DEFAULT_QUEUE_POLL_SECONDS
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
@@ -34,17 +77,101 @@ def transcribe(
     llm_model: Annotated[
         str, typer.Option(help="OpenAI model for chaptered summarization.")
     ] = "gpt-4o-mini",
-    language: Annotated[str, typer.Option(help="Language code used by Whisper.")] = "de",
+    language: Annotated[
+        str, typer.Option(help="Language code used by Whisper, or 'auto' to detect per episode.")
+    ] = "de",
+    language_stable_episodes: Annotated[
+        int,
+        typer.Option(help="With --language auto, stop detecting after N agreeing episodes."),
+    ] = DEFAULT_STABLE_EPISODES,
+    profile: Annotated[
+        bool,
+        typer.Option(help="Write per-stage .prof and .folded profiles to <episode-dir>/profile."),
+    ] = False,
+    keep_audio: Annotated[
+        int, typer.Option(help="Keep audio for the newest N episodes per feed.")
+    ] = DEFAULT_KEEP_AUDIO,
+    audio_budget_mb: Annotated[
+        int, typer.Option(help="Evict least recently used audio above this size (0 = no limit).")
+    ] = 0,
+    recompress_audio: Annotated[
+        bool, typer.Option(help="Recompress audio to low-bitrate mono Opus after transcription.")
+    ] = False,
+    resumable: Annotated[
+        bool, typer.Option(help="Transcribe in checkpointed windows that survive restarts.")
+    ] = False,
+    window_seconds: Annotated[
+        int, typer.Option(help="Audio window length for --resumable transcription.")
+    ] = DEFAULT_WINDOW_SECONDS,
+    progress_telegram: Annotated[
+        bool, typer.Option(help="Post transcription progress to Telegram at 25/50/75%.")
+    ] = False,
+    clean: Annotated[
+        bool, typer.Option(help="Strip fillers and repetitions before summarization.")
+    ] = True,
+    drop_ads: Annotated[
+        bool, typer.Option(help="Drop transcript segments that look like ad reads.")
+    ] = False,
+    local_chapters: Annotated[
+        bool,
+        typer.Option(help="Find chapters locally and summarize them concurrently."),
+    ] = False,
+    latency_budget_minutes: Annotated[
+        float,
+        typer.Option(
+            help="Pick the largest model up to --transcription-model that finishes "
+            "transcription within this many minutes (0 = always use it)."
+        ),
+    ] = 0.0,
+    stream_audio: Annotated[
+        bool,
+        typer.Option(help="Decode and transcribe windows while the audio is still downloading."),
+    ] = False,
+    skip_duplicates: Annotated[
+        bool,
+        typer.Option(help="Reuse the transcript of an already processed copy of the same audio."),
+    ] = False,
+    skip_jingles: Annotated[
+        bool,
+        typer.Option(help="Learn the feed's recurring jingles and ad spots and skip them."),
+    ] = False,
+    event_journal_mb: Annotated[
+        int,
+        typer.Option(help="Rotate the events.ndjson run journal at this size in MB (0 = off)."),
+    ] = DEFAULT_JOURNAL_MB,
 ) -> None:
-    audio_path, summary_path = run_pipeline(
-        podcast=podcast,
-        output_dir=output_dir,
-        transcription_model=transcription_model,
-        llm_model=llm_model,
-        language=language,
-        prompt_for_key=False,
-    )
-    typer.echo(f"Downloaded audio: {audio_path}")
+    open_journal(output_dir, event_journal_mb)
+    try:
+        audio_path, summary_path = run_pipeline(
+            podcast=podcast,
+            output_dir=output_dir,
+            options=PipelineOptions(
+                transcription_model=transcription_model,
+                llm_model=llm_model,
+                language=language,
+                language_stable_episodes=language_stable_episodes,
+                profile=profile,
+                keep_audio=keep_audio,
+                audio_budget_mb=audio_budget_mb,
+                recompress_audio=recompress_audio,
+                resumable=resumable,
+                window_seconds=window_seconds,
+                progress_telegram=progress_telegram,
+                clean=clean,
+                drop_ads=drop_ads,
+                local_chapters=local_chapters,
+                latency_budget_minutes=latency_budget_minutes,
+                stream_audio=stream_audio,
+                skip_duplicates=skip_duplicates,
+                skip_jingles=skip_jingles,
+            ),
+            prompt_for_key=False,
+        )
+    finally:
+        metrics_path = METRICS.write_json(output_dir / "metrics.json")
+        typer.echo(f"Run metrics: {metrics_path}")
+    if audio_path is not None:
+        typer.echo(f"Downloaded audio: {audio_path}")
     typer.echo(f"Chapter summary: {summary_path}")
     typer.echo("Summary was posted to Telegram.")
 
@@ -64,7 +191,13 @@ def serve(
     llm_model: Annotated[
         str, typer.Option(help="OpenAI model for chaptered summarization.")
     ] = "gpt-4o-mini",
-    language: Annotated[str, typer.Option(help="Language code used by Whisper.")] = "de",
+    language: Annotated[
+        str, typer.Option(help="Language code used by Whisper, or 'auto' to detect per episode.")
+    ] = "de",
+    language_stable_episodes: Annotated[
+        int,
+        typer.Option(help="With --language auto, stop detecting after N agreeing episodes."),
+    ] = DEFAULT_STABLE_EPISODES,
     interval_minutes: Annotated[
         int, typer.Option(help="Polling interval in minutes.")
     ] = 30,
@@ -72,16 +205,346 @@ def serve(
         Path,
         typer.Option(help="State file for tracking the last processed episode."),
     ] = Path(".pod2text_state.json"),
+    metrics_port: Annotated[
+        int,
+        typer.Option(help="Serve Prometheus metrics on 127.0.0.1:<port>/metrics (0 disables)."),
+    ] = 0,
+    profile: Annotated[
+        bool,
+        typer.Option(help="Write per-stage .prof and .folded profiles to <episode-dir>/profile."),
+    ] = False,
+    keep_audio: Annotated[
+        int, typer.Option(help="Keep audio for the newest N episodes per feed.")
+    ] = DEFAULT_KEEP_AUDIO,
+    audio_budget_mb: Annotated[
+        int, typer.Option(help="Evict least recently used audio above this size (0 = no limit).")
+    ] = 0,
+    recompress_audio: Annotated[
+        bool, typer.Option(help="Recompress audio to low-bitrate mono Opus after transcription.")
+    ] = False,
+    resumable: Annotated[
+        bool, typer.Option(help="Transcribe in checkpointed windows that survive restarts.")
+    ] = False,
+    window_seconds: Annotated[
+        int, typer.Option(help="Audio window length for --resumable transcription.")
+    ] = DEFAULT_WINDOW_SECONDS,
+    progress_telegram: Annotated[
+        bool, typer.Option(help="Post transcription progress to Telegram at 25/50/75%.")
+    ] = False,
+    clean: Annotated[
+        bool, typer.Option(help="Strip fillers and repetitions before summarization.")
+    ] = True,
+    drop_ads: Annotated[
+        bool, typer.Option(help="Drop transcript segments that look like ad reads.")
+    ] = False,
+    local_chapters: Annotated[
+        bool,
+        typer.Option(help="Find chapters locally and summarize them concurrently."),
+    ] = False,
+    latency_budget_minutes: Annotated[
+        float,
+        typer.Option(
+            help="Pick the largest model up to --transcription-model that finishes "
+            "transcription within this many minutes (0 = always use it)."
+        ),
+    ] = 0.0,
+    stream_audio: Annotated[
+        bool,
+        typer.Option(help="Decode and transcribe windows while the audio is still downloading."),
+    ] = False,
+    skip_duplicates: Annotated[
+        bool,
+        typer.Option(help="Reuse the transcript of an already processed copy of the same audio."),
+    ] = False,
+    skip_jingles: Annotated[
+        bool,
+        typer.Option(help="Learn the feed's recurring jingles and ad spots and skip them."),
+    ] = False,
+    event_journal_mb: Annotated[
+        int,
+        typer.Option(help="Rotate the events.ndjson run journal at this size in MB (0 = off)."),
+    ] = DEFAULT_JOURNAL_MB,
+    isolate_transcription: Annotated[
+        bool,
+        typer.Option(help="Run Whisper in a recycled child process to bound server memory."),
+    ] = False,
+    worker_max_jobs: Annotated[
+        int, typer.Option(help="Restart the transcription worker after this many episodes.")
+    ] = DEFAULT_MAX_JOBS,
+    worker_max_rss_mb: Annotated[
+        int,
+        typer.Option(help="Restart the transcription worker above this RSS (0 = never)."),
+    ] = DEFAULT_MAX_RSS_MB,
+    worker_memory_limit_mb: Annotated[
+        int,
+        typer.Option(help="Hard address-space limit for the transcription worker (0 = none)."),
+    ] = 0,
+    backfill_episodes: Annotated[
+        int,
+        typer.Option(help="Queue this many older episodes at low priority on startup."),
+    ] = 0,
+    work_queue: Annotated[
+        Path | None,
+        typer.Option(help="Shared SQLite queue; transcription is left to `pod2text worker`."),
+    ] = None,
+    cpu_budget: Annotated[
+        int,
+        typer.Option(help="Cores to split between transcription, decoding and I/O (0 = off)."),
+    ] = 0,
 ) -> None:
+    open_journal(output_dir, event_journal_mb)
     run_server(
         podcast=podcast,
         output_dir=output_dir,
-        transcription_model=transcription_model,
-        llm_model=llm_model,
-        language=language,
+        options=PipelineOptions(
+            transcription_model=transcription_model,
+            llm_model=llm_model,
+            language=language,
+            language_stable_episodes=language_stable_episodes,
+            profile=profile,
+            keep_audio=keep_audio,
+            audio_budget_mb=audio_budget_mb,
+            recompress_audio=recompress_audio,
+            resumable=resumable,
+            window_seconds=window_seconds,
+            progress_telegram=progress_telegram,
+            clean=clean,
+            drop_ads=drop_ads,
+            local_chapters=local_chapters,
+            latency_budget_minutes=latency_budget_minutes,
+            stream_audio=stream_audio,
+            skip_duplicates=skip_duplicates,
+            skip_jingles=skip_jingles,
+            isolate_transcription=isolate_transcription,
+            worker_max_jobs=worker_max_jobs,
+            worker_max_rss_mb=worker_max_rss_mb,
+            worker_memory_limit_mb=worker_memory_limit_mb,
+        ),
         interval_minutes=interval_minutes,
         state_file=state_file,
+        metrics_port=metrics_port,
+        backfill_episodes=backfill_episodes,
+        work_queue=work_queue,
+        cpu_budget=cpu_budget,
+    )
+
+
+@app.command("worker")
+def worker(
+    queue: Annotated[
+        Path, typer.Option(..., help="Shared SQLite queue written by `pod2text serve`.")
+    ],
+    output_dir: Annotated[
+        Path,
+        typer.Option(help="Shared directory for episode artifacts (same as the server's)."),
+    ] = Path("./output"),
+    worker_id: Annotated[
+        str | None, typer.Option(help="Name shown in leases (default: <host>-<pid>).")
+    ] = None,
+    lease_seconds: Annotated[
+        float, typer.Option(help="Lease length; renewed every third of it while working.")
+    ] = DEFAULT_LEASE_SECONDS,
+    poll_seconds: Annotated[
+        float, typer.Option(help="Seconds between checks of an empty queue.")
+    ] = DEFAULT_QUEUE_POLL_SECONDS,
+    max_attempts: Annotated[
+        int, typer.Option(help="Give up on a job after this many failed attempts.")
+    ] = DEFAULT_MAX_ATTEMPTS,
+    once: Annotated[
+        bool, typer.Option(help="Process at most one job, then exit.")
+    ] = False,
+) -> None:
+    completed = run_worker(
+        WorkQueue(queue),
+        output_dir=output_dir,
+        worker=worker_id or f"{socket.gethostname()}-{os.getpid()}",
+        lease_seconds=lease_seconds,
+        poll_seconds=poll_seconds,
+        max_attempts=max_attempts,
+        once=once,
     )
+    typer.echo(f"Completed {completed} job(s).")
+
+
+@app.command("batch")
+def batch(
+    sources: Annotated[
+        list[str] | None,
+        typer.Argument(help="Podcast names, RSS URLs or direct episode audio URLs."),
+    ] = None,
+    opml: Annotated[
+        Path | None, typer.Option(help="OPML file with additional feeds.")
+    ] = None,
+    episodes_per_feed: Annotated[
+        int, typer.Option(help="Newest episodes to process per feed.")
+    ] = 1,
+    output_dir: Annotated[
+        Path,
+        typer.Option(help="Directory for downloaded audio and summary."),
+    ] = Path("./output"),
+    transcription_model: Annotated[
+        str, typer.Option(help="Whisper model size, e.g. tiny/base/small/medium.")
+    ] = "small",
+    llm_model: Annotated[
+        str, typer.Option(help="OpenAI model for chaptered summarization.")
+    ] = "gpt-4o-mini",
+    language: Annotated[
+        str, typer.Option(help="Language code used by Whisper, or 'auto' to detect per episode.")
+    ] = "de",
+    language_stable_episodes: Annotated[
+        int,
+        typer.Option(help="With --language auto, stop detecting after N agreeing episodes."),
+    ] = DEFAULT_STABLE_EPISODES,
+    download_workers: Annotated[int, typer.Option(help="Concurrent downloads.")] = 2,
+    transcribe_workers: Annotated[
+        int, typer.Option(help="Concurrent transcriptions (one Whisper model each).")
+    ] = 1,
+    summarize_workers: Annotated[int, typer.Option(help="Concurrent LLM calls.")] = 4,
+    cpu_budget: Annotated[
+        int,
+        typer.Option(help="Cores to split between transcription, decoding and I/O (0 = off)."),
+    ] = 0,
+    telegram: Annotated[
+        bool, typer.Option(help="Post each summary to Telegram.")
+    ] = True,
+    llm_batch: Annotated[
+        bool,
+        typer.Option(help="Summarize all episodes in one OpenAI Batch API job (backfills)."),
+    ] = False,
+    llm_batch_local: Annotated[
+        Path | None,
+        typer.Option(help="Answer the LLM batch offline from this directory instead of OpenAI."),
+    ] = None,
+    poll_seconds: Annotated[
+        float, typer.Option(help="Seconds between LLM batch status checks.")
+    ] = DEFAULT_POLL_SECONDS,
+    skip_duplicates: Annotated[
+        bool,
+        typer.Option(help="Reuse the transcript of an already processed copy of the same audio."),
+    ] = False,
+    skip_jingles: Annotated[
+        bool,
+        typer.Option(help="Learn the feed's recurring jingles and ad spots and skip them."),
+    ] = False,
+    event_journal_mb: Annotated[
+        int,
+        typer.Option(help="Rotate the events.ndjson run journal at this size in MB (0 = off)."),
+    ] = DEFAULT_JOURNAL_MB,
+) -> None:
+    all_sources = list(sources or [])
+    if opml is not None:
+        all_sources.extend(read_opml(opml))
+    if not all_sources:
+        raise typer.BadParameter("Pass at least one source or --opml.")
+
+    backend: BatchBackend | None = None
+    if llm_batch_local is not None:
+        backend = LocalBatchBackend(llm_batch_local)
+    elif llm_batch:
+        backend = OpenAIBatchBackend(get_openai_api_key(prompt_if_missing=False))
+
+    open_journal(output_dir, event_journal_mb)
+    items = collect_batch_items(all_sources, episodes_per_feed=episodes_per_feed)
+    typer.echo(f"Queued {len(items)} episode(s) from {len(all_sources)} source(s).")
+    report = run_batch(
+        items,
+        output_dir=output_dir,
+        options=PipelineOptions(
+            transcription_model=transcription_model,
+            llm_model=llm_model,
+            language=language,
+            language_stable_episodes=language_stable_episodes,
+            skip_duplicates=skip_duplicates,
+            skip_jingles=skip_jingles,
+        ),
+        download_workers=download_workers,
+        transcribe_workers=transcribe_workers,
+        summarize_workers=summarize_workers,
+        cpu_budget=cpu_budget,
+        post_to_telegram=telegram,
+        llm_batch=backend,
+        poll_seconds=poll_seconds,
+    )
+    typer.echo(format_report(report))
+    typer.echo(f"Batch report: {write_report(report, output_dir)}")
+    METRICS.write_json(output_dir / "metrics.json")
+    if report.failed:
+        raise typer.Exit(code=1)
+
+
+@app.command("search")
+def search_transcripts(
+    terms: Annotated[
+        list[str], typer.Argument(help="Words to find; end a word with * for prefixes.")
+    ],
+    output_dir: Annotated[
+        Path,
+        typer.Option(help="Directory holding the transcript archive."),
+    ] = Path("./output"),
+    limit: Annotated[int, typer.Option(help="Maximum number of passages to show.")] = 10,
+    reindex_archive: Annotated[
+        bool,
+        typer.Option("--reindex", help="Rebuild the index from stored transcripts first."),
+    ] = False,
+) -> None:
+    if reindex_archive:
+        typer.echo(f"Indexed {reindex(output_dir)} transcript(s).")
+    started = time.perf_counter()
+    hits = search(search_db_path(output_dir), " ".join(terms), limit=limit)
+    typer.echo(format_hits(hits))
+    typer.echo(f"{len(hits)} result(s) in {(time.perf_counter() - started) * 1000:.1f} ms.")
+
+
+@app.command("journal")
+def journal(
+    output_dir: Annotated[
+        Path,
+        typer.Option(help="Directory holding events.ndjson and its rotated copies."),
+    ] = Path("./output"),
+    window: Annotated[
+        str | None,
+        typer.Option(help="Only events in START..END (ISO 8601, either side may be empty)."),
+    ] = None,
+    baseline: Annotated[
+        str | None,
+        typer.Option(help="Compare stage medians in this START..END window against --window."),
+    ] = None,
+    limit: Annotated[int, typer.Option(help="Slowest episodes and stages to list.")] = 5,
+) -> None:
+    try:
+        current = parse_window(window or "..")
+        before = parse_window(baseline) if baseline else None
+    except ValueError as error:
+        raise typer.BadParameter(str(error)) from error
+    recorded = list(read_events(output_dir / EVENTS_FILENAME))
+    if before is not None:
+        typer.echo(
+            format_comparison(
+                compare_windows(in_window(recorded, *before), in_window(recorded, *current))
+            )
+        )
+        return
+    typer.echo(format_journal(in_window(recorded, *current), limit=limit))
+
+
+@app.command("models")
+def models(
+    names: Annotated[list[str], typer.Argument(help="Whisper models, e.g. small tiny.")],
+    model_dir: Annotated[
+        Path | None,
+        typer.Option(help="Where weights live (default: $POD2TEXT_MODEL_DIR or ~/.cache/whisper)."),
+    ] = None,
+    offline: Annotated[
+        bool, typer.Option(help="Only verify checksums; fail instead of downloading.")
+    ] = False,
+) -> None:
+    started = time.perf_counter()
+    checks = ensure_models(names, model_dir, download=not offline)
+    for check in checks:
+        typer.echo(check.describe())
+    typer.echo(f"Checked {len(checks)} model(s) in {time.perf_counter() - started:.1f}s.")
+    if not all(check.ok for check in checks):
+        raise typer.Exit(code=1)
 
 
 @app.command("setup")
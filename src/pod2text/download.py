@@ -2,29 +2,92 @@
 
 from __future__ import annotations
 
+import os
 import re
+import time
+from collections.abc import Callable
 from pathlib import Path
 from urllib.parse import urlparse
 
+import httpx
 import requests
 
+from pod2text import events
+
 DEFAULT_BASENAME = "latest_episode"
 
 
-def download_audio(audio_url: str, output_dir: Path) -> Path:
+def download_audio(audio_url: str, output_dir: Path, basename: str = DEFAULT_BASENAME) -> Path:
     output_dir.mkdir(parents=True, exist_ok=True)
     extension = _guess_extension(audio_url)
-    target = output_dir / f"{DEFAULT_BASENAME}{extension}"
+    target = output_dir / f"{basename}{extension}"
+    partial = target.with_name(f".{target.name}.part")
+    started = time.perf_counter()
+    received = 0
+    finished = False
+
+    try:
+        with requests.get(audio_url, stream=True, timeout=120) as response:
+            response.raise_for_status()
+            with partial.open("wb") as file:
+                for chunk in response.iter_content(chunk_size=1024 * 512):
+                    if chunk:
+                        file.write(chunk)
+                        received += len(chunk)
+        os.replace(partial, target)
+        finished = True
+    finally:
+        partial.unlink(missing_ok=True)
+        _record_download(audio_url, received, started, finished)
+    return target
 
-    with requests.get(audio_url, stream=True, timeout=120) as response:
-        response.raise_for_status()
-        with target.open("wb") as file:
-            for chunk in response.iter_content(chunk_size=1024 * 512):
-                if chunk:
+
+async def download_audio_async(
+    audio_url: str,
+    output_dir: Path,
+    client: httpx.AsyncClient,
+    basename: str = DEFAULT_BASENAME,
+    on_chunk: Callable[[bytes], None] | None = None,
+) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    extension = _guess_extension(audio_url)
+    target = output_dir / f"{basename}{extension}"
+    partial = target.with_name(f".{target.name}.part")
+    started = time.perf_counter()
+    received = 0
+    finished = False
+
+    try:
+        async with client.stream("GET", audio_url, timeout=120) as response:
+            response.raise_for_status()
+            with partial.open("wb") as file:
+                async for chunk in response.aiter_bytes(chunk_size=1024 * 512):
                     file.write(chunk)
+                    received += len(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+        os.replace(partial, target)
+        finished = True
+    finally:
+        partial.unlink(missing_ok=True)
+        _record_download(audio_url, received, started, finished)
     return target
 
 
+def _record_download(audio_url: str, received: int, started: float, ok: bool) -> None:
+    events.record(
+        "download",
+        host=urlparse(audio_url).hostname,
+        bytes=received,
+        seconds=round(time.perf_counter() - started, 6),
+        ok=ok,
+    )
+
+
+def looks_like_audio_url(url: str) -> bool:
+    return _guess_extension(url) != ".audio"
+
+
 def _guess_extension(audio_url: str) -> str:
     path = urlparse(audio_url).path.lower()
     match = re.search(r"\.(mp3|m4a|aac|wav|ogg|flac)$", path)
@@ -0,0 +1,352 @@
+"""Structured run journal: one NDJSON record per stage, HTTP call, retry and cache decision.
+
+Records are appended to ``<output-dir>/events.ndjson`` and carry the ID of the episode being
+processed, so ``pod2text journal`` can work out per-stage percentiles, the slowest episodes and
+how two time windows (e.g. before and after a deploy) compare without a metrics backend. The
+file is rotated at a size limit like a log file: ``events.ndjson.1`` is the previous one.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+EVENTS_FILENAME = "events.ndjson"
+DEFAULT_MAX_MB = 20
+DEFAULT_BACKUPS = 5
+REGRESSION_THRESHOLD = 0.2
+
+Event = dict[str, Any]
+
+_EPISODE: ContextVar[str | None] = ContextVar("pod2text_episode", default=None)
+
+
+class EventJournal:
+    def __init__(self, path: Path, max_bytes: int, backups: int = DEFAULT_BACKUPS) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, event: str, **fields: Any) -> None:
+        record: Event = {"ts": datetime.now(UTC).isoformat(timespec="milliseconds"), "event": event}
+        episode = _EPISODE.get()
+        if episode is not None:
+            record["episode"] = episode
+        record.update(fields)
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(line) > self.max_bytes:
+                self._rotate()
+            with self.path.open("ab") as file:
+                file.write(line)
+
+    def _rotate(self) -> None:
+        for index in range(self.backups - 1, 0, -1):
+            source = _backup_path(self.path, index)
+            if source.exists():
+                source.replace(_backup_path(self.path, index + 1))
+        if self.backups:
+            self.path.replace(_backup_path(self.path, 1))
+        else:
+            self.path.unlink()
+
+
+_JOURNAL: EventJournal | None = None
+
+
+def open_journal(
+    output_dir: Path, max_mb: int = DEFAULT_MAX_MB, backups: int = DEFAULT_BACKUPS
+) -> EventJournal | None:
+    """Journal this process's events to ``output_dir``; ``max_mb <= 0`` turns it off."""
+    global _JOURNAL
+    _JOURNAL = (
+        EventJournal(output_dir / EVENTS_FILENAME, max_mb * 1024 * 1024, backups)
+        if max_mb > 0
+        else None
+    )
+    return _JOURNAL
+
+
+def close_journal() -> None:
+    global _JOURNAL
+    _JOURNAL = None
+
+
+def record(event: str, **fields: Any) -> None:
+    journal = _JOURNAL
+    if journal is None:
+        return
+    try:
+        journal.write(event, **fields)
+    except OSError as error:
+        print(f"Could not write event journal: {error}")
+
+
+@contextmanager
+def episode_scope(identifier: str) -> Iterator[None]:
+    """Tag events from this task (and executor calls given its context) with the episode."""
+    token = _EPISODE.set(identifier)
+    try:
+        yield
+    finally:
+        _EPISODE.reset(token)
+
+
+def http_event_hooks() -> dict[str, list[Any]]:
+    """``httpx.AsyncClient`` hooks recording one ``http`` event per response.
+
+    Only the host is kept: Telegram puts the bot token in the URL path.
+    """
+
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions["pod2text_started"] = time.perf_counter()
+
+    async def on_response(response: httpx.Response) -> None:
+        request = response.request
+        started = request.extensions.get("pod2text_started")
+        length = response.headers.get("content-length")
+        record(
+            "http",
+            method=request.method,
+            host=request.url.host,
+            status=response.status_code,
+            seconds=round(time.perf_counter() - started, 6) if started else None,
+            bytes=int(length) if length and length.isdigit() else None,
+        )
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def read_events(path: Path) -> Iterator[Event]:
+    """Records from ``path`` and its rotated backups, oldest first; broken lines are skipped."""
+    backups = sorted(
+        (candidate for candidate in path.parent.glob(f"{path.name}.*") if _backup_index(candidate)),
+        key=_backup_index,
+        reverse=True,
+    )
+    for file_path in [*backups, path]:
+        if not file_path.exists():
+            continue
+        with file_path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict) and "ts" in event:
+                    yield event
+
+
+def parse_window(value: str) -> tuple[datetime, datetime]:
+    """``START..END`` in ISO 8601; either side may be empty for an open end."""
+    start, separator, end = value.partition("..")
+    if not separator:
+        raise ValueError(f"Expected START..END, got {value!r}.")
+    return (
+        _parse_time(start) if start else datetime.min.replace(tzinfo=UTC),
+        _parse_time(end) if end else datetime.max.replace(tzinfo=UTC),
+    )
+
+
+def in_window(events: Iterable[Event], start: datetime, end: datetime) -> list[Event]:
+    return [event for event in events if start <= _parse_time(event["ts"]) < end]
+
+
+@dataclass(slots=True)
+class Percentiles:
+    count: int
+    p50: float
+    p90: float
+    p99: float
+    maximum: float
+
+    @classmethod
+    def of(cls, values: list[float]) -> Percentiles:
+        ordered = sorted(values)
+        return cls(
+            len(ordered),
+            _percentile(ordered, 0.5),
+            _percentile(ordered, 0.9),
+            _percentile(ordered, 0.99),
+            ordered[-1],
+        )
+
+
+@dataclass(slots=True)
+class StageChange:
+    stage: str
+    baseline: Percentiles | None
+    current: Percentiles | None
+
+    @property
+    def change(self) -> float | None:
+        """Relative change of the median, e.g. 0.25 for 25% slower."""
+        if self.baseline is None or self.current is None or not self.baseline.p50:
+            return None
+        return self.current.p50 / self.baseline.p50 - 1
+
+    @property
+    def regressed(self) -> bool:
+        change = self.change
+        return change is not None and change > REGRESSION_THRESHOLD
+
+
+def stage_percentiles(events: Iterable[Event]) -> dict[str, Percentiles]:
+    seconds: dict[str, list[float]] = defaultdict(list)
+    for event in events:
+        if event["event"] == "stage_end":
+            seconds[event["stage"]].append(event["seconds"])
+    return {stage: Percentiles.of(values) for stage, values in sorted(seconds.items())}
+
+
+def http_percentiles(events: Iterable[Event]) -> dict[str, tuple[Percentiles, int, int]]:
+    """Per host: request latency, failed requests and bytes transferred."""
+    seconds: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    transferred: dict[str, int] = defaultdict(int)
+    for event in events:
+        if event["event"] != "http":
+            continue
+        host = event.get("host", "?")
+        seconds[host].append(event.get("seconds") or 0.0)
+        errors[host] += not 200 <= event.get("status", 0) < 400
+        transferred[host] += event.get("bytes") or 0
+    return {
+        host: (Percentiles.of(values), errors[host], transferred[host])
+        for host, values in sorted(seconds.items())
+    }
+
+
+def slowest_episodes(events: Iterable[Event], limit: int = 5) -> list[Event]:
+    ends = [event for event in events if event["event"] == "episode_end"]
+    return sorted(ends, key=lambda event: event["seconds"], reverse=True)[:limit]
+
+
+def slowest_stages(events: Iterable[Event], limit: int = 5) -> list[Event]:
+    ends = [event for event in events if event["event"] == "stage_end"]
+    return sorted(ends, key=lambda event: event["seconds"], reverse=True)[:limit]
+
+
+def compare_windows(baseline: list[Event], current: list[Event]) -> list[StageChange]:
+    before = stage_percentiles(baseline)
+    after = stage_percentiles(current)
+    return [
+        StageChange(stage, before.get(stage), after.get(stage))
+        for stage in sorted(before.keys() | after.keys())
+    ]
+
+
+def format_journal(events: list[Event], limit: int = 5) -> str:
+    if not events:
+        return "No journal events."
+    lines = [f"{len(events)} event(s) from {events[0]['ts']} to {events[-1]['ts']}.", ""]
+    lines.append(f"{'stage':<14}{'count':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for stage, stats in stage_percentiles(events).items():
+        lines.append(
+            f"{stage:<14}{stats.count:>7}{stats.p50:>9.2f}s{stats.p90:>9.2f}s"
+            f"{stats.p99:>9.2f}s{stats.maximum:>9.2f}s"
+        )
+    hosts = http_percentiles(events)
+    if hosts:
+        lines += ["", f"{'host':<32}{'calls':>7}{'p50':>10}{'p90':>10}{'errors':>8}{'MB':>9}"]
+        for host, (stats, errors, transferred) in hosts.items():
+            lines.append(
+                f"{host[:31]:<32}{stats.count:>7}{stats.p50:>9.2f}s{stats.p90:>9.2f}s"
+                f"{errors:>8}{transferred / 1024 / 1024:>9.1f}"
+            )
+    episodes = slowest_episodes(events, limit)
+    if episodes:
+        lines += ["", "Slowest episodes:"]
+        lines += [
+            f"  {event['seconds']:>8.1f}s  {event.get('status', '?'):<9} "
+            f"{event.get('title') or event.get('episode', '?')}"
+            for event in episodes
+        ]
+    stages = slowest_stages(events, limit)
+    if stages:
+        lines += ["", "Slowest stages:"]
+        lines += [
+            f"  {event['seconds']:>8.1f}s  {event['stage']:<12} {event.get('episode', '-')}"
+            for event in stages
+        ]
+    downloads = [event for event in events if event["event"] == "download"]
+    if downloads:
+        rates = [
+            event["bytes"] / 1024 / 1024 / event["seconds"]
+            for event in downloads
+            if event["seconds"]
+        ]
+        lines += [
+            "",
+            f"Downloads: {len(downloads)}, "
+            f"{sum(event['bytes'] for event in downloads) / 1024 / 1024:.1f} MB, "
+            f"median {Percentiles.of(rates).p50 if rates else 0.0:.1f} MB/s",
+        ]
+    retries: dict[str, int] = defaultdict(int)
+    caches: dict[str, list[bool]] = defaultdict(list)
+    for event in events:
+        if event["event"] == "retry":
+            retries[event.get("target", "?")] += 1
+        elif event["event"] == "cache":
+            caches[event["cache"]].append(bool(event["hit"]))
+    if retries or caches:
+        lines.append("")
+    lines += [f"Retries ({target}): {count}" for target, count in sorted(retries.items())]
+    lines += [
+        f"Cache {cache}: {sum(hits)}/{len(hits)} hit(s)" for cache, hits in sorted(caches.items())
+    ]
+    return "\n".join(lines)
+
+
+def format_comparison(changes: list[StageChange]) -> str:
+    if not changes:
+        return "No stage events in either window."
+    lines = [f"{'stage':<14}{'before p50':>12}{'after p50':>12}{'change':>9}{'runs':>11}"]
+    for change in changes:
+        before = f"{change.baseline.p50:.2f}s" if change.baseline else "-"
+        after = f"{change.current.p50:.2f}s" if change.current else "-"
+        relative = f"{change.change:+.0%}" if change.change is not None else "-"
+        runs = (
+            f"{change.baseline.count if change.baseline else 0}"
+            f"/{change.current.count if change.current else 0}"
+        )
+        flag = "  regression" if change.regressed else ""
+        lines.append(f"{change.stage:<14}{before:>12}{after:>12}{relative:>9}{runs:>11}{flag}")
+    return "\n".join(lines)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _backup_path(path: Path, index: int) -> Path:
+    return path.with_name(f"{path.name}.{index}")
+
+
+def _backup_index(path: Path) -> int:
+    suffix = path.name.rpartition(".")[2]
+    return int(suffix) if suffix.isdigit() else 0
@@ -0,0 +1,237 @@
+"""Episode fingerprints for spotting re-published and cross-posted audio.
+
+Publishers re-issue episodes under a new GUID, and the same audio can appear in more than one
+feed. Every processed episode is recorded with its enclosure's ETag and byte length and a hash of
+its first minute of audio. A new episode that matches one of them reuses that episode's
+transcript and summary instead of being transcribed and summarized again.
+
+The audio hash is one bit per 100 ms frame, set when the frame is louder than the one before.
+It survives re-encoding and volume changes, but not audio shifted in time (e.g. a pre-roll ad).
+A show's own intro is the same in every episode, so an audio match also requires the same byte
+length or a duration within ``DURATION_TOLERANCE``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import subprocess
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from pod2text.artifacts import EpisodeArtifacts
+from pod2text.language import load_audio_prefix
+from pod2text.model_select import probe_duration
+from pod2text.podcast import Episode
+from pod2text.stream import SAMPLE_RATE
+
+FINGERPRINT_DB_FILENAME = "fingerprints.sqlite"
+HEAD_SECONDS = 60
+FRAME_SECONDS = 0.1
+MIN_BITS = 100
+MAX_BIT_ERROR = 0.1
+DURATION_TOLERANCE = 0.01
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    directory TEXT PRIMARY KEY,
+    feed_url TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    title TEXT NOT NULL,
+    etag TEXT,
+    length INTEGER,
+    duration REAL,
+    audio_bits TEXT,
+    bit_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS fingerprints_etag ON fingerprints (etag, length);
+CREATE INDEX IF NOT EXISTS fingerprints_length ON fingerprints (length);
+CREATE INDEX IF NOT EXISTS fingerprints_duration ON fingerprints (duration);
+"""
+
+
+@dataclass(slots=True)
+class Fingerprint:
+    etag: str | None = None
+    length: int | None = None
+    duration: float | None = None
+    audio_bits: int | None = None
+    bit_count: int = 0
+
+
+@dataclass(slots=True)
+class FingerprintMatch:
+    directory: str
+    feed_url: str
+    identifier: str
+    title: str
+    reason: str
+    bit_error: float = 0.0
+
+    def artifacts(self, output_dir: Path) -> EpisodeArtifacts:
+        _, feed_key, episode_key = Path(self.directory).parts
+        return EpisodeArtifacts(output_dir, feed_key, episode_key)
+
+    def describe(self) -> str:
+        evidence = (
+            "same ETag and length"
+            if self.reason == "etag"
+            else f"same opening audio, {self.bit_error:.0%} bit difference"
+        )
+        return (
+            f"Duplicate of already processed episode '{self.title}' ({self.feed_url}, "
+            f"{evidence}); reusing its transcript and summary."
+        )
+
+
+def fingerprint_db_path(output_dir: Path) -> Path:
+    return output_dir / FINGERPRINT_DB_FILENAME
+
+
+async def probe_enclosure(client: httpx.AsyncClient, audio_url: str) -> Fingerprint:
+    """ETag and length from a HEAD request; empty when the host does not answer it."""
+    try:
+        response = await client.head(audio_url, timeout=30, follow_redirects=True)
+    except httpx.HTTPError as error:
+        print(f"Could not probe enclosure ({error}); fingerprinting the audio only.")
+        return Fingerprint()
+    if response.is_error:
+        return Fingerprint()
+    return Fingerprint(
+        etag=response.headers.get("etag") or None,
+        length=_parse_length(response.headers.get("content-length")),
+    )
+
+
+def fingerprint_audio(
+    audio_path: Path, fingerprint: Fingerprint, feed_duration: float | None = None
+) -> Fingerprint:
+    """``fingerprint`` completed from the downloaded file: its length, duration and audio bits."""
+    result = replace(
+        fingerprint,
+        length=audio_path.stat().st_size,
+        duration=probe_duration(audio_path) or feed_duration or fingerprint.duration,
+    )
+    try:
+        samples = load_audio_prefix(audio_path, HEAD_SECONDS)
+    except (ValueError, OSError, subprocess.CalledProcessError) as error:
+        print(f"Could not fingerprint audio: {error}")
+        return result
+    bits, count = audio_bits(samples)
+    if count >= MIN_BITS:
+        result.audio_bits, result.bit_count = bits, count
+    return result
+
+
+def audio_bits(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> tuple[int, int]:
+    """One bit per frame: whether it is louder than the previous frame."""
+    frame = int(FRAME_SECONDS * sample_rate)
+    frames = len(samples) // frame
+    if frames < 2:
+        return 0, 0
+    power = np.square(samples[: frames * frame].reshape(frames, frame)).mean(axis=1)
+    rising = np.diff(np.log10(power + 1e-10)) > 0
+    return int.from_bytes(np.packbits(rising).tobytes(), "big"), len(rising)
+
+
+def find_duplicate(
+    db_path: Path, fingerprint: Fingerprint, exclude: str = ""
+) -> FingerprintMatch | None:
+    """The recorded episode with the same enclosure or opening audio, if any.
+
+    Candidates come from the indexed ETag, length and duration columns, so only a handful of
+    rows are compared bit by bit however many episodes are recorded.
+    """
+    if not db_path.exists():
+        return None
+    with _connect(db_path) as connection:
+        if fingerprint.etag and fingerprint.length:
+            row = connection.execute(
+                """
+                SELECT directory, feed_url, identifier, title FROM fingerprints
+                WHERE etag = ? AND length = ? AND directory != ?
+                LIMIT 1
+                """,
+                (fingerprint.etag, fingerprint.length, exclude),
+            ).fetchone()
+            if row is not None:
+                return FingerprintMatch(*row, reason="etag")
+        if fingerprint.audio_bits is None:
+            return None
+        duration = fingerprint.duration or 0.0
+        rows = connection.execute(
+            """
+            SELECT directory, feed_url, identifier, title, audio_bits FROM fingerprints
+            WHERE (length = ? OR duration BETWEEN ? AND ?)
+                AND bit_count = ? AND directory != ?
+            """,
+            (
+                fingerprint.length or -1,
+                duration * (1 - DURATION_TOLERANCE),
+                duration * (1 + DURATION_TOLERANCE) if duration else -1,
+                fingerprint.bit_count,
+                exclude,
+            ),
+        ).fetchall()
+    best: FingerprintMatch | None = None
+    for directory, feed_url, identifier, title, bits in rows:
+        bit_error = (int(bits, 16) ^ fingerprint.audio_bits).bit_count() / fingerprint.bit_count
+        if bit_error <= MAX_BIT_ERROR and (best is None or bit_error < best.bit_error):
+            best = FingerprintMatch(directory, feed_url, identifier, title, "audio", bit_error)
+    return best
+
+
+def record_fingerprint(
+    db_path: Path,
+    artifacts: EpisodeArtifacts,
+    feed_url: str,
+    episode: Episode,
+    fingerprint: Fingerprint,
+) -> None:
+    with _connect(db_path) as connection:
+        connection.execute(
+            """
+            INSERT OR REPLACE INTO fingerprints
+                (directory, feed_url, identifier, title, etag, length, duration, audio_bits,
+                 bit_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                episode_directory(artifacts),
+                feed_url,
+                episode.identifier,
+                episode.title,
+                fingerprint.etag,
+                fingerprint.length,
+                fingerprint.duration,
+                None if fingerprint.audio_bits is None else format(fingerprint.audio_bits, "x"),
+                fingerprint.bit_count,
+            ),
+        )
+
+
+def episode_directory(artifacts: EpisodeArtifacts) -> str:
+    """The episode directory relative to the output directory, as stored in the index."""
+    return artifacts.directory.relative_to(artifacts.output_dir).as_posix()
+
+
+def _parse_length(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+@contextmanager
+def _connect(db_path: Path) -> Iterator[sqlite3.Connection]:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    with closing(sqlite3.connect(db_path, timeout=30)) as connection:
+        # Same rollback journal as the work queue: the output directory may be a network share.
+        connection.execute("PRAGMA journal_mode=DELETE")
+        connection.executescript(SCHEMA)
+        with connection:
+            yield connection
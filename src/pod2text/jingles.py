@@ -0,0 +1,356 @@
+"""Learn a feed's recurring intros, outros and sponsor spots and cut them before transcription.
+
+Audio is reduced to one 32-bit sub-fingerprint per 16 ms hop. Each bit is the sign of an energy
+difference between neighbouring frequency bands, compared with the previous frame. Two copies
+of the same jingle agree in most bits even when they are re-encoded or start at a different
+sample offset.
+
+Each new episode is compared with the last ``RECENT_EPISODES`` episodes of its feed. Spans of
+``MIN_SEGMENT_SECONDS`` to ``MAX_SEGMENT_SECONDS`` that occur in both join the feed's library.
+Library entries found in later episodes are cut from the audio, and transcript timestamps are
+mapped back to the original audio afterwards.
+
+Matching votes on alignment offsets from exact sub-fingerprint hits (a sorted-array lookup),
+then checks the bit error only along the few offsets that got enough votes.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import whisper
+
+from pod2text.artifacts import FEEDS_DIRNAME, artifact_key, atomic_target, atomic_write_text
+from pod2text.metrics import JINGLE_SECONDS, METRICS, stage_timer
+from pod2text.resources import decoding
+from pod2text.stream import SAMPLE_RATE
+from pod2text.transcribe import transcribe_samples
+from pod2text.transcript import Segment, Transcript
+
+JINGLES_FILENAME = "jingles.npz"
+JINGLE_REPORT_FILENAME = "jingles.json"
+FRAME_SAMPLES = 2048
+HOP_SAMPLES = 256
+HOP_SECONDS = HOP_SAMPLES / SAMPLE_RATE
+BAND_EDGES_HZ = np.geomspace(300, 3000, 34)
+SPECTRUM_CHUNK = 1024
+MIN_SEGMENT_SECONDS = 3.0
+MAX_SEGMENT_SECONDS = 90.0
+RECENT_EPISODES = 3
+MAX_ENTRIES = 32
+# Mean fraction of differing bits, over SMOOTH_SECONDS, still counted as the same audio.
+MATCH_BIT_ERROR = 0.35
+SMOOTH_SECONDS = 0.5
+# An entry counts as found when this much of it lines up with the episode.
+MIN_ENTRY_COVERAGE = 0.8
+MIN_VOTES = 8
+CANDIDATE_OFFSETS = 16
+# Sub-fingerprints seen more often than this (silence, steady tones) cast no votes.
+MAX_VALUE_HITS = 8
+# Kept on both sides of a cut so speech next to a jingle is not clipped.
+EDGE_SECONDS = 0.25
+
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+_LIBRARY_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class JingleSpan:
+    start: float
+    end: float
+    entry: int
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass(slots=True)
+class JingleReport:
+    spans: list[JingleSpan] = field(default_factory=list)
+    learned: int = 0
+    audio_seconds: float = 0.0
+
+    @property
+    def seconds_saved(self) -> float:
+        return sum(span.duration for span in self.spans)
+
+    def describe(self) -> str:
+        return (
+            f"Cut {len(self.spans)} recurring segment(s), {self.seconds_saved:.1f}s of "
+            f"{self.audio_seconds:.1f}s audio, before transcription; "
+            f"learned {self.learned} new one(s)."
+        )
+
+
+@dataclass(slots=True)
+class JingleLibrary:
+    entries: list[np.ndarray] = field(default_factory=list)
+    seen: list[int] = field(default_factory=list)
+    recent: list[np.ndarray] = field(default_factory=list)
+
+
+def jingle_library_path(output_dir: Path, feed_url: str) -> Path:
+    return output_dir / FEEDS_DIRNAME / artifact_key(feed_url) / JINGLES_FILENAME
+
+
+def transcribe_without_jingles(
+    audio_path: Path,
+    jingles_path: Path,
+    model_name: str = "small",
+    language: str = "de",
+    model: Any = None,
+) -> Transcript:
+    """Transcribe ``audio_path`` with the feed's known jingles cut out, in original time."""
+    with decoding():
+        samples = whisper.load_audio(str(audio_path))
+    with stage_timer("jingles"):
+        kept, pieces, report = strip_jingles(samples, jingles_path)
+    print(report.describe())
+    METRICS.inc(JINGLE_SECONDS, report.seconds_saved)
+    atomic_write_text(
+        audio_path.parent / JINGLE_REPORT_FILENAME,
+        json.dumps(
+            {
+                "seconds_saved": round(report.seconds_saved, 2),
+                "audio_seconds": round(report.audio_seconds, 2),
+                "learned": report.learned,
+                "spans": [asdict(span) for span in report.spans],
+            },
+            indent=2,
+        ),
+    )
+    transcript = transcribe_samples(kept, model_name=model_name, language=language, model=model)
+    return restore_times(transcript, pieces)
+
+
+def strip_jingles(
+    samples: np.ndarray, jingles_path: Path
+) -> tuple[np.ndarray, list[tuple[float, float]], JingleReport]:
+    """Find and learn the feed's jingles in ``samples`` and return the audio without them.
+
+    ``pieces`` pairs each kept stretch's start in the cut audio with the seconds removed
+    before it, for ``restore_times``.
+    """
+    prints = sub_fingerprints(samples)
+    with _LIBRARY_LOCK:
+        library = load_library(jingles_path)
+        spans = find_jingles(library, prints)
+        learned = learn_jingles(library, prints, spans)
+        spans = sorted(spans + learned, key=lambda span: span.start)
+        save_library(jingles_path, library)
+    report = JingleReport(
+        _trim(spans, len(samples) / SAMPLE_RATE), len(learned), len(samples) / SAMPLE_RATE
+    )
+    kept, pieces = cut_spans(samples, report.spans)
+    return kept, pieces, report
+
+
+def sub_fingerprints(samples: np.ndarray) -> np.ndarray:
+    if len(samples) < FRAME_SAMPLES + HOP_SAMPLES:
+        return np.zeros(0, dtype=np.uint32)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SAMPLES)[::HOP_SAMPLES]
+    window = np.hanning(FRAME_SAMPLES).astype(np.float32)
+    bins = np.fft.rfftfreq(FRAME_SAMPLES, 1 / SAMPLE_RATE)
+    edges = np.searchsorted(bins, BAND_EDGES_HZ)
+    energies = np.empty((len(frames), len(edges) - 1), dtype=np.float32)
+    # Chunked so the spectra in memory do not grow with the episode length.
+    for start in range(0, len(frames), SPECTRUM_CHUNK):
+        spectrum = np.abs(np.fft.rfft(frames[start : start + SPECTRUM_CHUNK] * window)) ** 2
+        energies[start : start + SPECTRUM_CHUNK] = np.add.reduceat(spectrum, edges, axis=1)[:, :-1]
+    band_diff = -np.diff(energies, axis=1)
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    return np.packbits(bits, axis=1).view(">u4").ravel().astype(np.uint32)
+
+
+def align(query: np.ndarray, reference: np.ndarray, min_frames: int) -> list[tuple[int, int, int]]:
+    """Stretches of ``query`` found in ``reference``: ``(query_start, reference_start, frames)``.
+
+    Offsets with enough exact sub-fingerprint hits are candidates; along each, the bit error
+    decides where the two actually match.
+    """
+    if len(query) < min_frames or len(reference) < min_frames:
+        return []
+    order = np.argsort(reference, kind="stable")
+    ordered = reference[order]
+    low = np.searchsorted(ordered, query, side="left")
+    hits = np.searchsorted(ordered, query, side="right") - low
+    voting = np.flatnonzero((hits > 0) & (hits <= MAX_VALUE_HITS))
+    if not len(voting):
+        return []
+    repeats = hits[voting]
+    query_index = np.repeat(voting, repeats)
+    # Position of each hit within its run of equal reference values.
+    within = np.arange(len(query_index)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    reference_index = order[np.repeat(low[voting], repeats) + within]
+    offsets, votes = np.unique(query_index - reference_index, return_counts=True)
+    candidates = offsets[votes >= MIN_VOTES]
+    candidates = candidates[np.argsort(-votes[votes >= MIN_VOTES])][:CANDIDATE_OFFSETS]
+
+    matches: list[tuple[int, int, int]] = []
+    covered: list[tuple[int, int]] = []
+    smooth = max(1, int(SMOOTH_SECONDS / HOP_SECONDS))
+    for offset in sorted(int(value) for value in candidates):
+        start = max(0, offset)
+        stop = min(len(query), len(reference) + offset)
+        if stop - start < min_frames:
+            continue
+        errors = _bit_errors(query[start:stop], reference[start - offset : stop - offset])
+        smoothed = np.convolve(errors, np.ones(smooth) / smooth, mode="same")
+        for run_start, run_stop in _runs(smoothed <= MATCH_BIT_ERROR * 32, min_frames):
+            stretch = (start + run_start, start + run_stop)
+            if any(_overlaps(stretch, other) for other in covered):
+                # Neighbouring offsets find the same stretch; the first one wins.
+                continue
+            covered.append(stretch)
+            matches.append((stretch[0], stretch[0] - offset, run_stop - run_start))
+    return matches
+
+
+def find_jingles(library: JingleLibrary, prints: np.ndarray) -> list[JingleSpan]:
+    spans: list[JingleSpan] = []
+    for index, entry in enumerate(library.entries):
+        needed = int(len(entry) * MIN_ENTRY_COVERAGE)
+        found = False
+        for query_start, _, frames in align(prints, entry, needed):
+            spans.append(_span(query_start, frames, index))
+            found = True
+        if found:
+            library.seen[index] += 1
+    return spans
+
+
+def learn_jingles(
+    library: JingleLibrary, prints: np.ndarray, known: list[JingleSpan]
+) -> list[JingleSpan]:
+    """Add stretches shared with recent episodes to ``library``; returns their spans here."""
+    min_frames = int(MIN_SEGMENT_SECONDS / HOP_SECONDS)
+    max_frames = int(MAX_SEGMENT_SECONDS / HOP_SECONDS)
+    taken = [(_frame(span.start), _frame(span.end)) for span in known]
+    learned: list[JingleSpan] = []
+    for previous in library.recent:
+        for query_start, _, frames in align(prints, previous, min_frames):
+            stretch = (query_start, query_start + frames)
+            # Longer stretches are re-published episodes, not jingles.
+            if frames > max_frames or any(_overlaps(stretch, other) for other in taken):
+                continue
+            taken.append(stretch)
+            library.entries.append(prints[query_start : query_start + frames].copy())
+            library.seen.append(2)
+            learned.append(_span(query_start, frames, len(library.entries) - 1))
+    library.recent = [prints, *library.recent][:RECENT_EPISODES]
+    if len(library.entries) > MAX_ENTRIES:
+        keep = sorted(
+            sorted(range(len(library.entries)), key=lambda index: -library.seen[index])[
+                :MAX_ENTRIES
+            ]
+        )
+        library.entries = [library.entries[index] for index in keep]
+        library.seen = [library.seen[index] for index in keep]
+    return learned
+
+
+def cut_spans(
+    samples: np.ndarray, spans: list[JingleSpan]
+) -> tuple[np.ndarray, list[tuple[float, float]]]:
+    parts: list[np.ndarray] = []
+    pieces: list[tuple[float, float]] = []
+    kept_seconds = removed_seconds = 0.0
+    position = 0.0
+    for span in [*spans, JingleSpan(len(samples) / SAMPLE_RATE, len(samples) / SAMPLE_RATE, -1)]:
+        part = samples[int(position * SAMPLE_RATE) : int(span.start * SAMPLE_RATE)]
+        if len(part):
+            pieces.append((kept_seconds, removed_seconds))
+            parts.append(part)
+            kept_seconds += len(part) / SAMPLE_RATE
+        removed_seconds += span.duration
+        position = span.end
+    kept = np.concatenate(parts) if parts else samples[:0]
+    return kept, pieces
+
+
+def restore_times(transcript: Transcript, pieces: list[tuple[float, float]]) -> Transcript:
+    if not pieces or all(removed == 0 for _, removed in pieces):
+        return transcript
+    starts = [start for start, _ in pieces]
+
+    def original(seconds: float) -> float:
+        return seconds + pieces[max(bisect_right(starts, seconds) - 1, 0)][1]
+
+    return Transcript.from_segments(
+        Segment(original(segment.start), original(segment.end), segment.tokens, segment.text)
+        for segment in transcript
+    )
+
+
+def load_library(path: Path) -> JingleLibrary:
+    if not path.exists():
+        return JingleLibrary()
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            entries = sorted(name for name in data.files if name.startswith("entry_"))
+            recent = sorted(name for name in data.files if name.startswith("recent_"))
+            return JingleLibrary(
+                entries=[data[name] for name in entries],
+                seen=[int(value) for value in data["seen"]],
+                recent=[data[name] for name in recent],
+            )
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Ignoring unreadable jingle library {path}: {error}")
+        return JingleLibrary()
+
+
+def save_library(path: Path, library: JingleLibrary) -> None:
+    arrays = {f"entry_{index:03d}": entry for index, entry in enumerate(library.entries)}
+    arrays.update({f"recent_{index:03d}": prints for index, prints in enumerate(library.recent)})
+    with atomic_target(path) as tmp_path, tmp_path.open("wb") as file:
+        np.savez(file, seen=np.array(library.seen, dtype=np.int64), **arrays)
+
+
+def _trim(spans: list[JingleSpan], audio_seconds: float) -> list[JingleSpan]:
+    """Shrink spans by ``EDGE_SECONDS`` (not at the file edges) and merge overlaps."""
+    trimmed: list[JingleSpan] = []
+    for span in spans:
+        start = span.start + EDGE_SECONDS if span.start > EDGE_SECONDS else 0.0
+        end = span.end - EDGE_SECONDS if span.end < audio_seconds - EDGE_SECONDS else audio_seconds
+        if end - start <= 0:
+            continue
+        if trimmed and start <= trimmed[-1].end:
+            trimmed[-1].end = max(trimmed[-1].end, end)
+            continue
+        trimmed.append(JingleSpan(start, min(end, audio_seconds), span.entry))
+    return trimmed
+
+
+def _span(first_frame: int, frames: int, entry: int) -> JingleSpan:
+    # Bit i compares frames i and i + 1, so it describes audio from frame i + 1 on.
+    start = (first_frame + 1) * HOP_SECONDS
+    return JingleSpan(start, start + frames * HOP_SECONDS + FRAME_SAMPLES / SAMPLE_RATE, entry)
+
+
+def _frame(seconds: float) -> int:
+    return int(seconds / HOP_SECONDS)
+
+
+def _bit_errors(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    difference = np.bitwise_xor(first, second).view(np.uint8)
+    return _POPCOUNT[difference].reshape(-1, 4).sum(axis=1, dtype=np.float32)
+
+
+def _runs(mask: np.ndarray, min_length: int) -> list[tuple[int, int]]:
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return [
+        (int(start), int(stop))
+        for start, stop in zip(edges[::2], edges[1::2], strict=True)
+        if stop - start >= min_length
+    ]
+
+
+def _overlaps(first: tuple[int, int], second: tuple[int, int]) -> bool:
+    return first[0] < second[1] and second[0] < first[1]
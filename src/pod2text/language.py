@@ -0,0 +1,214 @@
+"""Detect an episode's language on a short speech window and remember it per feed."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import whisper
+
+from pod2text.artifacts import atomic_write_text
+from pod2text.resources import decoding, ffmpeg_threads
+from pod2text.stream import SAMPLE_RATE, PcmBuffer
+
+AUTO_LANGUAGE = "auto"
+LANGUAGE_CACHE_FILENAME = "feed_languages.json"
+# Cheapest multilingual model; used when the transcription model lives in another process.
+DETECTION_MODEL = "tiny"
+# Whisper decides the language from one 30-second context, so that is the probe length.
+PROBE_SECONDS = 30
+# Only the start of an episode is decoded to look for the probe.
+SEARCH_SECONDS = 300
+FRAME_SECONDS = 0.1
+PROBE_STEP_SECONDS = 5
+MIN_VOICED_FRACTION = 0.5
+MIN_FRAME_RMS = 0.005
+MIN_CONFIDENCE = 0.6
+DEFAULT_STABLE_EPISODES = 5
+FALLBACK_LANGUAGE = "de"
+
+_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class FeedLanguage:
+    language: str
+    confidence: float
+    stable_episodes: int = 1
+
+
+@dataclass(slots=True)
+class LanguageChoice:
+    language: str
+    confidence: float
+    source: str
+    probe_start: float | None = None
+
+    def describe(self) -> str:
+        where = f" at {self.probe_start:.0f}s" if self.probe_start is not None else ""
+        return (
+            f"Language '{self.language}' ({self.confidence:.0%} confidence) "
+            f"from {self.source}{where}."
+        )
+
+
+def cached_language(path: Path, feed_url: str, stable_after: int) -> LanguageChoice | None:
+    """The feed's language once ``stable_after`` confident detections in a row agreed."""
+    cached = load_languages(path).get(feed_url)
+    if cached is None or cached.stable_episodes < max(stable_after, 1):
+        return None
+    return LanguageChoice(
+        cached.language,
+        cached.confidence,
+        f"feed cache, stable for {cached.stable_episodes} episodes",
+    )
+
+
+def feed_language(path: Path, feed_url: str) -> str:
+    """Last confidently detected language of a feed, for work that has no audio at hand."""
+    cached = load_languages(path).get(feed_url)
+    return cached.language if cached is not None else FALLBACK_LANGUAGE
+
+
+def detect_feed_language(
+    path: Path, feed_url: str, audio: Path | PcmBuffer, model: Any
+) -> LanguageChoice:
+    """Detect on the best speech window of ``audio`` and update the feed's cache entry."""
+    prefix = _audio_prefix(audio)
+    start, window = probe_window(prefix)
+    language, confidence = detect_language(model, window)
+    if confidence < MIN_CONFIDENCE:
+        cached = load_languages(path).get(feed_url)
+        if cached is not None:
+            # Music or crosstalk in the probe: trust the feed's history over a coin flip.
+            return LanguageChoice(
+                cached.language,
+                cached.confidence,
+                f"feed cache (probe said '{language}' at {confidence:.0%})",
+                start,
+            )
+    else:
+        record_language(path, feed_url, language, confidence)
+    return LanguageChoice(language, confidence, "probe", start)
+
+
+def probe_window(audio: np.ndarray, seconds: int = PROBE_SECONDS) -> tuple[float, np.ndarray]:
+    """The ``seconds``-long stretch of ``audio`` that most looks like speech.
+
+    Frames louder than a level relative to the loudest parts count as voiced. Among the
+    windows that are mostly voiced, the one whose loudness varies the most wins: speech
+    pauses between words and syllables, while music beds and jingles stay level.
+    """
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    window_frames = int(seconds / FRAME_SECONDS)
+    count = len(audio) // frame
+    if count <= window_frames:
+        return 0.0, audio
+    frames = audio[: count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    voiced = rms > max(MIN_FRAME_RMS, 0.1 * float(np.percentile(rms, 95)))
+    loudness = np.log10(rms + 1e-5)
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        totals = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        starts = np.arange(0, count - window_frames + 1, int(PROBE_STEP_SECONDS / FRAME_SECONDS))
+        return totals[starts + window_frames] - totals[starts]
+
+    voiced_fraction = window_sums(voiced) / window_frames
+    mean = window_sums(loudness) / window_frames
+    modulation = window_sums(loudness**2) / window_frames - mean**2
+    score = np.where(voiced_fraction >= MIN_VOICED_FRACTION, modulation, -1.0 + voiced_fraction)
+    best = int(np.argmax(score)) * int(PROBE_STEP_SECONDS / FRAME_SECONDS)
+    return best * FRAME_SECONDS, audio[best * frame : (best + window_frames) * frame]
+
+
+def detect_language(model: Any, window: np.ndarray) -> tuple[str, float]:
+    mel = whisper.log_mel_spectrogram(
+        whisper.pad_or_trim(window.astype(np.float32)), model.dims.n_mels
+    )
+    _, probabilities = model.detect_language(mel.to(model.device))
+    language = max(probabilities, key=probabilities.get)
+    return language, float(probabilities[language])
+
+
+def load_languages(path: Path) -> dict[str, FeedLanguage]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    languages: dict[str, FeedLanguage] = {}
+    for feed_url, values in raw.items():
+        try:
+            languages[feed_url] = FeedLanguage(
+                str(values["language"]),
+                float(values["confidence"]),
+                int(values["stable_episodes"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return languages
+
+
+def record_language(path: Path, feed_url: str, language: str, confidence: float) -> FeedLanguage:
+    with _CACHE_LOCK:
+        languages = load_languages(path)
+        current = languages.get(feed_url)
+        if current is not None and current.language == language:
+            current.confidence = confidence
+            current.stable_episodes += 1
+        else:
+            current = languages[feed_url] = FeedLanguage(language, confidence)
+        atomic_write_text(
+            path,
+            json.dumps({url: asdict(entry) for url, entry in languages.items()}, indent=2),
+        )
+    return current
+
+
+def load_audio_prefix(audio_path: Path, seconds: int = SEARCH_SECONDS) -> np.ndarray:
+    """Decode only the first ``seconds`` of a file, like ``whisper.load_audio`` otherwise."""
+    if shutil.which("ffmpeg") is None:
+        raise ValueError("ffmpeg is required for language detection.")
+    with decoding():
+        completed = subprocess.run(
+            [
+                "ffmpeg",
+                "-nostdin",
+                "-loglevel",
+                "error",
+                "-threads",
+                ffmpeg_threads(),
+                "-t",
+                str(seconds),
+                "-i",
+                str(audio_path),
+                "-f",
+                "s16le",
+                "-ac",
+                "1",
+                "-acodec",
+                "pcm_s16le",
+                "-ar",
+                str(SAMPLE_RATE),
+                "-",
+            ],
+            capture_output=True,
+            check=True,
+        )
+    return np.frombuffer(completed.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def _audio_prefix(audio: Path | PcmBuffer) -> np.ndarray:
+    if isinstance(audio, PcmBuffer):
+        # Streaming: waits only until the search span has been decoded.
+        audio.wait_for(SEARCH_SECONDS)
+        return audio.window(0.0, SEARCH_SECONDS)
+    return load_audio_prefix(audio)
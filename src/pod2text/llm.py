@@ -0,0 +1,321 @@
+"""Shared OpenAI client with rate-limit-aware scheduling and jittered retries."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import openai
+from openai import AsyncOpenAI, OpenAI
+
+from pod2text import events
+from pod2text.metrics import METRICS
+
+LLM_REQUESTS = "pod2text_llm_requests_total"
+LLM_TOKENS = "pod2text_llm_tokens_total"
+LLM_THROTTLE_SECONDS = "pod2text_llm_throttle_seconds_total"
+LLM_RATE_LIMIT_REMAINING = "pod2text_llm_rate_limit_remaining"
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_OUTPUT_TOKENS = 1024
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+CHARS_PER_TOKEN = 4.0
+SLOT_POLL_SECONDS = 0.05
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_CLIENTS: dict[str, LLMClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class RateBudget:
+    """One OpenAI budget (requests or tokens) as last reported by the API."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float = 0.0
+
+    def wait_seconds(self, cost: int, now: float) -> float:
+        if self.remaining is None:
+            return 0.0
+        if now >= self.reset_at and self.limit is not None:
+            self.remaining = self.limit
+        if self.remaining >= cost or (self.limit is not None and cost > self.limit):
+            return 0.0
+        return max(self.reset_at - now, 0.0)
+
+    def spend(self, cost: int) -> None:
+        if self.remaining is not None:
+            self.remaining -= cost
+
+    def update(self, limit: str | None, remaining: str | None, reset: str | None) -> None:
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = time.monotonic() + parse_reset_duration(reset)
+
+
+@dataclass(slots=True)
+class LLMStats:
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    throttled: int = 0
+    throttled_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class LLMClient:
+    """Thread-safe wrapper around one pooled ``OpenAI`` client per API key.
+
+    Calls wait for a concurrency slot and for the request and token budgets reported in the
+    ``x-ratelimit-*`` headers of earlier responses, then retry retryable failures with
+    jittered exponential backoff (or the server's ``Retry-After``). Async calls share the
+    slots and budgets but go through an ``AsyncOpenAI`` client per event loop, since its
+    connection pool is bound to the loop that created it; ``aclose`` closes it before the
+    loop ends.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        client: Any | None = None,
+        async_client: Any | None = None,
+    ) -> None:
+        if max_retries < 0 or max_concurrency <= 0:
+            raise ValueError("max_retries must be >= 0 and max_concurrency > 0.")
+        self.api_key = api_key
+        # The SDK's own retries would bypass our budget accounting.
+        self.client = client or OpenAI(api_key=api_key, max_retries=0)
+        self.max_retries = max_retries
+        self.requests = RateBudget()
+        self.tokens = RateBudget()
+        self._async_client = async_client
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._stats = LLMStats()
+
+    def create_response(self, **request: Any) -> Any:
+        cost = estimate_request_tokens(request)
+        for attempt in range(self.max_retries + 1):
+            with self._slots:
+                while (wait := self._reserve(cost)) > 0:
+                    time.sleep(wait)
+                try:
+                    raw = self.client.responses.with_raw_response.create(**request)
+                except RETRYABLE_ERRORS as error:
+                    delay = self._retry_delay(error, attempt)
+                else:
+                    return self._parse(raw)
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def create_response_async(self, **request: Any) -> Any:
+        client = self._loop_client()
+        cost = estimate_request_tokens(request)
+        for attempt in range(self.max_retries + 1):
+            # The slots are shared with threads, so they are polled instead of blocked on.
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(SLOT_POLL_SECONDS)
+            try:
+                while (wait := self._reserve(cost)) > 0:
+                    await asyncio.sleep(wait)
+                try:
+                    raw = await client.responses.with_raw_response.create(**request)
+                except RETRYABLE_ERRORS as error:
+                    delay = self._retry_delay(error, attempt)
+                else:
+                    return self._parse(raw)
+            finally:
+                self._slots.release()
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        """Close the ``AsyncOpenAI`` client this client opened on the running loop, if any."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    def stats(self) -> LLMStats:
+        with self._lock:
+            return LLMStats(**asdict(self._stats))
+
+    def _loop_client(self) -> Any:
+        if self._async_client is not None:
+            return self._async_client
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+                self._async_clients[loop] = client
+            return client
+
+    def _reserve(self, cost: int) -> float:
+        """Spend ``cost`` from the budgets, or return how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self.requests.wait_seconds(1, now), self.tokens.wait_seconds(cost, now))
+            if wait <= 0:
+                self.requests.spend(1)
+                self.tokens.spend(cost)
+                return 0.0
+            self._stats.throttled += 1
+            self._stats.throttled_seconds += wait
+        METRICS.inc(LLM_THROTTLE_SECONDS, amount=wait)
+        return wait
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying ``error``; re-raises it when retries are used up."""
+        delay = self._failure_delay(error, attempt)
+        if attempt == self.max_retries:
+            self._count(failures=1)
+            raise error
+        reason = type(error).__name__
+        print(f"OpenAI request failed ({reason}), retrying in {delay:.1f}s.")
+        events.record("retry", target="openai", attempt=attempt + 1, error=reason, delay=delay)
+        return delay
+
+    def _parse(self, raw: Any) -> Any:
+        self._update_budgets(raw.headers)
+        response = raw.parse()
+        self._record_usage(response)
+        return response
+
+    def _update_budgets(self, headers: Any) -> None:
+        with self._lock:
+            for name, budget in (("requests", self.requests), ("tokens", self.tokens)):
+                budget.update(
+                    headers.get(f"x-ratelimit-limit-{name}"),
+                    headers.get(f"x-ratelimit-remaining-{name}"),
+                    headers.get(f"x-ratelimit-reset-{name}"),
+                )
+                if budget.remaining is not None:
+                    METRICS.set_gauge(LLM_RATE_LIMIT_REMAINING, budget.remaining, budget=name)
+
+    def _failure_delay(self, error: Exception, attempt: int) -> float:
+        status = "error"
+        retry_after: float | None = None
+        if isinstance(error, openai.APIStatusError):
+            headers = error.response.headers
+            self._update_budgets(headers)
+            retry_after = _retry_after_seconds(headers)
+            status = str(error.status_code)
+        METRICS.inc(LLM_REQUESTS, status=status)
+        self._count(
+            requests=1,
+            retries=1 if attempt < self.max_retries else 0,
+            rate_limited=1 if isinstance(error, openai.RateLimitError) else 0,
+        )
+        if retry_after is not None:
+            return retry_after
+        backoff = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+        return random.uniform(backoff / 2, backoff)
+
+    def _record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        input_tokens = int(getattr(usage, "input_tokens", 0) or 0)
+        output_tokens = int(getattr(usage, "output_tokens", 0) or 0)
+        METRICS.inc(LLM_REQUESTS, status="ok")
+        METRICS.inc(LLM_TOKENS, amount=input_tokens, kind="input")
+        METRICS.inc(LLM_TOKENS, amount=output_tokens, kind="output")
+        self._count(requests=1, input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def _count(self, **changes: int) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self._stats, name, getattr(self._stats, name) + value)
+
+
+def get_llm_client(api_key: str) -> LLMClient:
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(api_key)
+        if client is None:
+            client = LLMClient(api_key)
+            _CLIENTS[api_key] = client
+        return client
+
+
+async def close_loop_clients() -> None:
+    """Close every shared client's connection pool on the running loop before it ends."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+    for client in clients:
+        await client.aclose()
+
+
+def llm_stats() -> LLMStats:
+    totals = LLMStats()
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+    for client in clients:
+        for name, value in asdict(client.stats()).items():
+            setattr(totals, name, getattr(totals, name) + value)
+    return totals
+
+
+def format_llm_stats(stats: LLMStats) -> str:
+    return (
+        f"OpenAI: {stats.requests} request(s), {stats.retries} retries, "
+        f"{stats.rate_limited} rate-limited, throttled {stats.throttled} time(s) "
+        f"for {stats.throttled_seconds:.1f}s, "
+        f"{stats.input_tokens} input / {stats.output_tokens} output tokens."
+    )
+
+
+def estimate_request_tokens(request: dict[str, Any]) -> int:
+    text = json.dumps(request.get("input", ""), ensure_ascii=False)
+    output_tokens = int(request.get("max_output_tokens") or DEFAULT_OUTPUT_TOKENS)
+    return round(len(text) / CHARS_PER_TOKEN) + output_tokens
+
+
+def parse_reset_duration(value: str) -> float:
+    """Parse OpenAI reset durations such as ``"20ms"``, ``"1.5s"`` or ``"6m0s"``."""
+    parts = _DURATION_PART.findall(value.strip())
+    if not parts:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            return 0.0
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after_seconds(headers: Any) -> float | None:
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(float(value) * scale, 0.0)
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,254 @@
+"""Offline summarization through the OpenAI Batch API, with a local file-based stand-in."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from pod2text.artifacts import atomic_write_text
+from pod2text.clean import clean_transcript
+from pod2text.llm import get_llm_client
+from pod2text.summarize import summary_request
+from pod2text.transcript import Transcript
+
+BATCH_ENDPOINT = "/v1/responses"
+LLM_BATCHES_DIRNAME = "llm_batches"
+COMPLETION_WINDOW = "24h"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+DEFAULT_POLL_SECONDS = 60.0
+
+
+@dataclass(slots=True)
+class SummaryJob:
+    custom_id: str
+    title: str
+    transcript_path: Path
+    # Overrides the batch-wide language, e.g. for a backfill of a multilingual feed.
+    language: str | None = None
+
+
+@dataclass(slots=True)
+class SummaryResult:
+    custom_id: str
+    summary: str | None = None
+    error: str | None = None
+
+
+class BatchBackend(Protocol):
+    def submit(self, input_path: Path) -> str: ...
+
+    def status(self, batch_id: str) -> str: ...
+
+    def output_lines(self, batch_id: str) -> list[str]: ...
+
+
+class OpenAIBatchBackend:
+    def __init__(self, api_key: str) -> None:
+        # Reuse the pooled HTTP client of the shared LLM layer.
+        self.client = get_llm_client(api_key).client
+
+    def submit(self, input_path: Path) -> str:
+        with input_path.open("rb") as file:
+            uploaded = self.client.files.create(file=file, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def output_lines(self, batch_id: str) -> list[str]:
+        batch = self.client.batches.retrieve(batch_id)
+        lines: list[str] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                lines.extend(self.client.files.content(file_id).text.splitlines())
+        return lines
+
+
+class LocalBatchBackend:
+    """Answers batch files from disk, in the Batch API's input and output line format."""
+
+    def __init__(self, directory: Path, respond: Callable[[dict[str, Any]], str] | None = None):
+        self.directory = directory
+        self.respond = respond or offline_summary
+
+    def submit(self, input_path: Path) -> str:
+        batch_id = f"local_batch_{_file_digest(input_path)[:16]}"
+        batch_dir = self.directory / batch_id
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(batch_dir / "input.jsonl", input_path.read_text(encoding="utf-8"))
+        atomic_write_text(batch_dir / "status", "in_progress")
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        batch_dir = self.directory / batch_id
+        status = (batch_dir / "status").read_text(encoding="utf-8").strip()
+        if status != "in_progress":
+            return status
+
+        output: list[str] = []
+        for line in (batch_dir / "input.jsonl").read_text(encoding="utf-8").splitlines():
+            request = json.loads(line)
+            record: dict[str, Any] = {"id": f"{batch_id}_{len(output)}", "error": None}
+            record["custom_id"] = request["custom_id"]
+            try:
+                text = self.respond(request["body"])
+            except Exception as error:  # noqa: BLE001
+                record["response"] = {"status_code": 500, "body": {"error": str(error)}}
+            else:
+                record["response"] = {"status_code": 200, "body": {"output_text": text}}
+            output.append(json.dumps(record, ensure_ascii=False))
+        atomic_write_text(batch_dir / "output.jsonl", "\n".join(output) + "\n")
+        atomic_write_text(batch_dir / "status", "completed")
+        return "completed"
+
+    def output_lines(self, batch_id: str) -> list[str]:
+        path = self.directory / batch_id / "output.jsonl"
+        return path.read_text(encoding="utf-8").splitlines()
+
+
+def run_summary_batch(
+    jobs: list[SummaryJob],
+    backend: BatchBackend,
+    work_dir: Path,
+    model: str = "gpt-4o-mini",
+    language: str = "de",
+    clean: bool = True,
+    drop_ads: bool = False,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    timeout_seconds: float | None = None,
+) -> dict[str, SummaryResult]:
+    if not jobs:
+        return {}
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    input_path = write_batch_input(
+        jobs, work_dir, model=model, language=language, clean=clean, drop_ads=drop_ads
+    )
+    manifest_path = input_path.with_suffix(".json")
+    manifest = _read_manifest(manifest_path)
+    batch_id = manifest.get("batch_id")
+    if batch_id:
+        print(f"Resuming LLM batch {batch_id} for {len(jobs)} transcript(s).")
+    else:
+        batch_id = backend.submit(input_path)
+        manifest = {"batch_id": batch_id, "jobs": [_job_record(job) for job in jobs]}
+        atomic_write_text(manifest_path, json.dumps(manifest, indent=2))
+        print(f"Submitted LLM batch {batch_id} with {len(jobs)} transcript(s).")
+
+    started = time.monotonic()
+    while (status := backend.status(batch_id)) not in TERMINAL_STATUSES:
+        if timeout_seconds is not None and time.monotonic() - started > timeout_seconds:
+            raise TimeoutError(f"LLM batch {batch_id} still {status} after {timeout_seconds}s.")
+        print(f"LLM batch {batch_id} is {status}; checking again in {poll_seconds:.0f}s.")
+        time.sleep(poll_seconds)
+
+    results = parse_batch_output(backend.output_lines(batch_id))
+    for job in jobs:
+        results.setdefault(
+            job.custom_id, SummaryResult(job.custom_id, error=f"No result (batch {status}).")
+        )
+    manifest["status"] = status
+    atomic_write_text(manifest_path, json.dumps(manifest, indent=2))
+    return results
+
+
+def write_batch_input(
+    jobs: Iterable[SummaryJob],
+    work_dir: Path,
+    model: str,
+    language: str,
+    clean: bool,
+    drop_ads: bool,
+) -> Path:
+    lines: list[str] = []
+    for job in jobs:
+        transcript: str | Transcript = Transcript.read_ndjson(job.transcript_path)
+        if clean:
+            transcript, _ = clean_transcript(
+                transcript, language=job.language or language, drop_ads=drop_ads
+            )
+        request = {
+            "custom_id": job.custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": summary_request(transcript, model),
+        }
+        lines.append(json.dumps(request, ensure_ascii=False))
+    text = "\n".join(lines) + "\n"
+    # Named by content so an interrupted backfill finds and resumes the same batch.
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    return atomic_write_text(work_dir / f"batch_{digest}.jsonl", text)
+
+
+def parse_batch_output(lines: Iterable[str]) -> dict[str, SummaryResult]:
+    results: dict[str, SummaryResult] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = str(record.get("custom_id", ""))
+        result = SummaryResult(custom_id)
+        response = record.get("response") or {}
+        body = response.get("body") or {}
+        if record.get("error"):
+            result.error = json.dumps(record["error"])
+        elif response.get("status_code") != 200:
+            result.error = f"HTTP {response.get('status_code')}: {json.dumps(body.get('error'))}"
+        else:
+            text = _output_text(body).strip()
+            if text:
+                result.summary = text
+            else:
+                result.error = "LLM returned an empty summary."
+        results[custom_id] = result
+    return results
+
+
+def offline_summary(body: dict[str, Any]) -> str:
+    transcript = str(body["input"][-1]["content"]).split("Transcript:\n", 1)[-1]
+    first_line = " ".join(transcript.split())[:280]
+    return f"# Episode Summary\n\n## TL;DR\n- {first_line}\n"
+
+
+def _output_text(body: dict[str, Any]) -> str:
+    if "output_text" in body:
+        return str(body["output_text"])
+    parts: list[str] = []
+    for item in body.get("output") or []:
+        if item.get("type") != "message":
+            continue
+        for content in item.get("content") or []:
+            if content.get("type") == "output_text":
+                parts.append(str(content.get("text", "")))
+    return "".join(parts)
+
+
+def _job_record(job: SummaryJob) -> dict[str, Any]:
+    record = asdict(job)
+    record["transcript_path"] = str(job.transcript_path)
+    return record
+
+
+def _read_manifest(path: Path) -> dict[str, Any]:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    # A finished batch is not resumed; a re-run submits a fresh one.
+    if not isinstance(manifest, dict) or manifest.get("status") in TERMINAL_STATUSES:
+        return {}
+    return manifest
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
@@ -2,38 +2,933 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import shutil
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine, Mapping
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager, nullcontext, suppress
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
+from typing import Any, TypeVar
 
-from pod2text.download import download_audio
+import httpx
+
+from pod2text import events
+from pod2text.artifacts import (
+    AUDIO_BASENAME,
+    EpisodeArtifacts,
+    atomic_target,
+    atomic_write_text,
+    episode_artifacts,
+    prune_audio,
+    update_latest_links,
+)
+from pod2text.audio_store import AudioStore, format_stats
+from pod2text.checkpoint import (
+    JOURNAL_FILENAME,
+    format_progress,
+    transcribe_resumable,
+    transcribe_stream,
+)
+from pod2text.clean import clean_transcript, format_cleaning_report
+from pod2text.download import download_audio_async
 from pod2text.env import get_openai_api_key, get_telegram_bot_token, get_telegram_chat_id
-from pod2text.podcast import fetch_latest_episode, resolve_feed_url
-from pod2text.summarize import summarize_transcript
-from pod2text.telegram import post_summary
-from pod2text.transcribe import transcribe_audio
+from pod2text.fingerprint import (
+    Fingerprint,
+    FingerprintMatch,
+    episode_directory,
+    find_duplicate,
+    fingerprint_audio,
+    fingerprint_db_path,
+    probe_enclosure,
+    record_fingerprint,
+)
+from pod2text.jingles import jingle_library_path, transcribe_without_jingles
+from pod2text.language import (
+    AUTO_LANGUAGE,
+    DETECTION_MODEL,
+    LANGUAGE_CACHE_FILENAME,
+    LanguageChoice,
+    cached_language,
+    detect_feed_language,
+    feed_language,
+)
+from pod2text.llm import close_loop_clients, format_llm_stats, llm_stats
+from pod2text.metrics import DUPLICATE_EPISODES, METRICS, PIPELINE_RUNS, stage_timer
+from pod2text.model_select import (
+    MODEL_SPEED_FILENAME,
+    DurationEstimate,
+    choose_model,
+    estimate_duration,
+    load_speeds,
+    record_speed,
+)
+from pod2text.options import PipelineOptions
+from pod2text.podcast import Episode, fetch_latest_episode_async, resolve_feed_url
+from pod2text.profiling import PROFILE_DIRNAME, profile_stage
+from pod2text.resources import run_transcription
+from pod2text.scheduler import CancelToken, JobCancelled
+from pod2text.search import index_transcript, search_db_path
+from pod2text.stream import PcmBuffer, StreamDecodeError, StreamDecoder
+from pod2text.summarize import summarize_chapters_async, summarize_transcript_async
+from pod2text.telegram import post_summary_async, send_text, send_text_async
+from pod2text.topics import Chapter, segment_topics
+from pod2text.transcribe import ModelPool, load_model, transcribe_segments
+from pod2text.transcribe_worker import TranscriptionJob, shared_worker
+from pod2text.transcript import TRANSCRIPT_FILENAME, Transcript
+
+StageLimits = Mapping[str, threading.Semaphore]
+LIMIT_POLL_SECONDS = 0.05
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class EpisodeResult:
+    # None when a duplicate was reused before download and its audio is no longer kept.
+    audio_path: Path | None
+    transcript_path: Path
+    # None when the summary is deferred to a later LLM batch.
+    summary_path: Path | None
 
 
 def run_pipeline(
     podcast: str,
     output_dir: Path,
-    transcription_model: str = "small",
-    llm_model: str = "gpt-4o-mini",
-    language: str = "de",
+    options: PipelineOptions | None = None,
     prompt_for_key: bool = True,
-) -> tuple[Path, Path]:
-    feed_url = resolve_feed_url(podcast)
-    episode = fetch_latest_episode(feed_url)
-    audio_path = download_audio(episode.audio_url, output_dir)
+    cancel: CancelToken | None = None,
+) -> tuple[Path | None, Path]:
+    return _run(
+        run_pipeline_async(
+            podcast=podcast,
+            output_dir=output_dir,
+            options=options,
+            prompt_for_key=prompt_for_key,
+            cancel=cancel,
+        )
+    )
+
+
+async def run_pipeline_async(
+    podcast: str,
+    output_dir: Path,
+    options: PipelineOptions | None = None,
+    prompt_for_key: bool = True,
+    http_client: httpx.AsyncClient | None = None,
+    executor: Executor | None = None,
+    cancel: CancelToken | None = None,
+) -> tuple[Path | None, Path]:
+    if options is not None and options.defer_summary:
+        raise ValueError("run_pipeline always summarizes; use process_episode to defer it.")
+    async with _http_client(http_client) as client:
+        try:
+            with stage_timer("feed"):
+                feed_url = resolve_feed_url(podcast)
+                episode = await fetch_latest_episode_async(feed_url, client)
+        except Exception:
+            METRICS.inc(PIPELINE_RUNS, status="error")
+            raise
+
+        result = await process_episode_async(
+            feed_url=feed_url,
+            episode=episode,
+            output_dir=output_dir,
+            options=options,
+            prompt_for_key=prompt_for_key,
+            http_client=client,
+            executor=executor,
+            cancel=cancel,
+        )
+    assert result.summary_path is not None
+    return result.audio_path, result.summary_path
+
+
+def process_episode(
+    feed_url: str,
+    episode: Episode,
+    output_dir: Path,
+    options: PipelineOptions | None = None,
+    prompt_for_key: bool = True,
+    post_to_telegram: bool = True,
+    model_pool: ModelPool | None = None,
+    stage_limits: StageLimits | None = None,
+    cancel: CancelToken | None = None,
+) -> EpisodeResult:
+    return _run(
+        process_episode_async(
+            feed_url=feed_url,
+            episode=episode,
+            output_dir=output_dir,
+            options=options,
+            prompt_for_key=prompt_for_key,
+            post_to_telegram=post_to_telegram,
+            model_pool=model_pool,
+            stage_limits=stage_limits,
+            cancel=cancel,
+        )
+    )
+
+
+async def process_episode_async(
+    feed_url: str,
+    episode: Episode,
+    output_dir: Path,
+    options: PipelineOptions | None = None,
+    prompt_for_key: bool = True,
+    post_to_telegram: bool = True,
+    model_pool: ModelPool | None = None,
+    stage_limits: StageLimits | None = None,
+    http_client: httpx.AsyncClient | None = None,
+    executor: Executor | None = None,
+    cancel: CancelToken | None = None,
+) -> EpisodeResult:
+    with events.episode_scope(episode.identifier):
+        events.record("episode_start", feed=feed_url, title=episode.title)
+        started = time.perf_counter()
+        status = "interrupted"
+        try:
+            async with _http_client(http_client) as client:
+                result = await _run_stages(
+                    feed_url=feed_url,
+                    episode=episode,
+                    output_dir=output_dir,
+                    options=options or PipelineOptions(),
+                    prompt_for_key=prompt_for_key,
+                    post_to_telegram=post_to_telegram,
+                    model_pool=model_pool,
+                    stage_limits=stage_limits or {},
+                    client=client,
+                    executor=executor,
+                    cancel=cancel or CancelToken(),
+                )
+            status = "ok"
+        except JobCancelled:
+            status = "cancelled"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            if status != "interrupted":
+                METRICS.inc(PIPELINE_RUNS, status=status)
+            events.record(
+                "episode_end",
+                title=episode.title,
+                status=status,
+                seconds=round(time.perf_counter() - started, 6),
+            )
+    return result
+
+
+def summarize_episode(
+    feed_url: str,
+    episode: Episode,
+    output_dir: Path,
+    options: PipelineOptions | None = None,
+    prompt_for_key: bool = True,
+    post_to_telegram: bool = True,
+) -> Path:
+    return _run(
+        summarize_episode_async(
+            feed_url=feed_url,
+            episode=episode,
+            output_dir=output_dir,
+            options=options,
+            prompt_for_key=prompt_for_key,
+            post_to_telegram=post_to_telegram,
+        )
+    )
 
-    transcript = transcribe_audio(audio_path, model_name=transcription_model, language=language)
+
+async def summarize_episode_async(
+    feed_url: str,
+    episode: Episode,
+    output_dir: Path,
+    options: PipelineOptions | None = None,
+    prompt_for_key: bool = True,
+    post_to_telegram: bool = True,
+    http_client: httpx.AsyncClient | None = None,
+) -> Path:
+    """Summarize and post an episode whose ``transcript.ndjson`` was written elsewhere."""
+    options = options or PipelineOptions()
+    artifacts = episode_artifacts(output_dir, feed_url, episode)
+    options = replace(options, language=episode_language(artifacts, feed_url, options.language))
+    transcript = Transcript.read_ndjson(artifacts.directory / TRANSCRIPT_FILENAME)
+    async with _http_client(http_client) as client:
+        summary_path = await _summarize_and_post(
+            artifacts,
+            episode,
+            transcript,
+            artifacts.find_audio(),
+            options,
+            prompt_for_key=prompt_for_key,
+            post_to_telegram=post_to_telegram,
+            profile_dir=None,
+            stage_limits={},
+            client=client,
+        )
+    print(format_llm_stats(llm_stats()))
+    return summary_path
+
+
+def episode_language(artifacts: EpisodeArtifacts, feed_url: str, language: str) -> str:
+    """``language`` unless it is auto; then the one this episode was transcribed in.
+
+    The feed's cached language is only a guess for episodes transcribed before the language
+    was recorded in ``episode.json``.
+    """
+    if language != AUTO_LANGUAGE:
+        return language
+    return artifacts.read_metadata().get("language") or feed_language(
+        artifacts.output_dir / LANGUAGE_CACHE_FILENAME, feed_url
+    )
+
+
+async def _run_stages(
+    feed_url: str,
+    episode: Episode,
+    output_dir: Path,
+    options: PipelineOptions,
+    prompt_for_key: bool,
+    post_to_telegram: bool,
+    model_pool: ModelPool | None,
+    stage_limits: StageLimits,
+    client: httpx.AsyncClient,
+    executor: Executor | None,
+    cancel: CancelToken,
+) -> EpisodeResult:
+    audio_store = AudioStore(output_dir, budget_bytes=options.audio_budget_mb * 1024 * 1024)
+    artifacts = episode_artifacts(output_dir, feed_url, episode)
+    profile_dir = artifacts.directory / PROFILE_DIRNAME if options.profile else None
+    if options.language == AUTO_LANGUAGE:
+        # Transcription settles the language for this episode only; later stages read it.
+        options = replace(options)
+
+    transcribe = partial(
+        _transcribe,
+        options=options,
+        model_pool=model_pool,
+        profile_dir=profile_dir,
+        stage_limits=stage_limits,
+        # Raising from the progress callback stops a windowed run at a window boundary.
+        progress=cancel.guard(_progress_reporter(episode.title, options.progress_telegram)),
+        speed_path=output_dir / MODEL_SPEED_FILENAME,
+        feed_duration=episode.duration_seconds,
+        feed_url=feed_url,
+        language_path=output_dir / LANGUAGE_CACHE_FILENAME,
+        jingles_path=jingle_library_path(output_dir, feed_url),
+    )
+    transcript: Transcript | None = None
+    fingerprint = Fingerprint()
+    duplicate: FingerprintMatch | None = None
+    cached_audio = audio_store.lookup(artifacts)
+    if options.skip_duplicates and cached_audio is None:
+        # A matching ETag and length settle it before anything is downloaded.
+        fingerprint = await probe_enclosure(client, episode.audio_url)
+        duplicate = _find_duplicate(output_dir, artifacts, fingerprint)
+    if duplicate is not None:
+        summary_path = await _reuse_duplicate(
+            duplicate,
+            artifacts,
+            feed_url,
+            episode,
+            fingerprint,
+            None,
+            options,
+            prompt_for_key=prompt_for_key,
+            post_to_telegram=post_to_telegram,
+            client=client,
+        )
+        # Nothing was downloaded; point at the earlier episode's audio while it is kept.
+        return EpisodeResult(
+            duplicate.artifacts(output_dir).find_audio(),
+            artifacts.directory / TRANSCRIPT_FILENAME,
+            summary_path,
+        )
+    if cached_audio is not None:
+        print(f"Using cached audio: {cached_audio}")
+        audio_path = cached_audio
+    elif options.stream_audio and not options.isolate_transcription:
+        audio_path, transcript = await _download_streaming(
+            episode, artifacts, transcribe, profile_dir, stage_limits, client, executor
+        )
+    else:
+        async with _stage("download", profile_dir, stage_limits):
+            audio_path = await download_audio_async(
+                episode.audio_url, artifacts.directory, client, basename=AUDIO_BASENAME
+            )
+
+    cancel.check()
+    if options.skip_duplicates:
+        fingerprint = await _in_executor(
+            executor,
+            partial(
+                _blocking_stage,
+                "fingerprint",
+                profile_dir,
+                stage_limits,
+                partial(fingerprint_audio, audio_path, fingerprint, episode.duration_seconds),
+            ),
+        )
+        # A streamed transcript is already done; its fingerprint is only recorded.
+        duplicate = None if transcript else _find_duplicate(output_dir, artifacts, fingerprint)
+    if duplicate is not None:
+        summary_path = await _reuse_duplicate(
+            duplicate,
+            artifacts,
+            feed_url,
+            episode,
+            fingerprint,
+            audio_path,
+            options,
+            prompt_for_key=prompt_for_key,
+            post_to_telegram=post_to_telegram,
+            client=client,
+        )
+        _finish_audio(audio_store, audio_path, output_dir, options)
+        return EpisodeResult(audio_path, artifacts.directory / TRANSCRIPT_FILENAME, summary_path)
+    if transcript is None:
+        transcript = await _in_executor(executor, partial(transcribe, audio_path))
+    artifacts.update_metadata(language=options.language)
+    await _in_executor(
+        executor, partial(_index_transcript, output_dir, artifacts, feed_url, episode, transcript)
+    )
+    if options.skip_duplicates:
+        _record_fingerprint(output_dir, artifacts, feed_url, episode, fingerprint)
+    cancel.check()
+    if options.recompress_audio:
+        audio_path = await _in_executor(
+            executor,
+            partial(
+                _blocking_stage,
+                "recompress",
+                profile_dir,
+                stage_limits,
+                partial(audio_store.recompress, audio_path),
+            ),
+        )
+    if options.defer_summary:
+        # Summarized later in one LLM batch.
+        _finish_audio(audio_store, audio_path, output_dir, options)
+        return EpisodeResult(audio_path, artifacts.directory / TRANSCRIPT_FILENAME, None)
+
+    summary_path = await _summarize_and_post(
+        artifacts,
+        episode,
+        transcript,
+        audio_path,
+        options,
+        prompt_for_key=prompt_for_key,
+        post_to_telegram=post_to_telegram,
+        profile_dir=profile_dir,
+        stage_limits=stage_limits,
+        client=client,
+    )
+    _finish_audio(audio_store, audio_path, output_dir, options)
+    print(format_llm_stats(llm_stats()))
+    return EpisodeResult(audio_path, artifacts.directory / TRANSCRIPT_FILENAME, summary_path)
+
+
+async def _summarize_and_post(
+    artifacts: EpisodeArtifacts,
+    episode: Episode,
+    transcript: Transcript,
+    audio_path: Path | None,
+    options: PipelineOptions,
+    prompt_for_key: bool,
+    post_to_telegram: bool,
+    profile_dir: Path | None,
+    stage_limits: StageLimits,
+    client: httpx.AsyncClient,
+) -> Path:
+    summary_input: str | Transcript = transcript
+    if options.clean:
+        with stage_timer("clean"):
+            summary_input, report = clean_transcript(
+                transcript, language=options.language, drop_ads=options.drop_ads
+            )
+        print(format_cleaning_report(report))
+    chapters: list[Chapter] = []
+    if options.local_chapters and isinstance(summary_input, Transcript):
+        with stage_timer("segment"):
+            chapters = segment_topics(summary_input, language=options.language)
+        print(f"Local topic segmentation found {len(chapters)} chapter(s).")
     api_key = get_openai_api_key(prompt_if_missing=prompt_for_key)
-    summary = summarize_transcript(transcript, api_key=api_key, model=llm_model)
-    summary_path = output_dir / "summary.md"
-    summary_path.write_text(summary, encoding="utf-8")
-    post_summary(
-        bot_token=get_telegram_bot_token(),
-        chat_id=get_telegram_chat_id(),
-        summary=summary,
-        episode_title=episode.title,
+    async with _stage("summarize", profile_dir, stage_limits):
+        if len(chapters) > 1:
+            summary = await summarize_chapters_async(
+                chapters, api_key=api_key, model=options.llm_model
+            )
+        else:
+            summary = await summarize_transcript_async(
+                summary_input, api_key=api_key, model=options.llm_model
+            )
+    summary_path = atomic_write_text(artifacts.summary_path, summary)
+    if audio_path is not None:
+        update_latest_links(artifacts, audio_path)
+    if post_to_telegram:
+        async with _stage("telegram", profile_dir, stage_limits):
+            await post_summary_async(
+                client,
+                bot_token=get_telegram_bot_token(),
+                chat_id=get_telegram_chat_id(),
+                summary=summary,
+                episode_title=episode.title,
+            )
+
+    return summary_path
+
+
+async def _reuse_duplicate(
+    match: FingerprintMatch,
+    artifacts: EpisodeArtifacts,
+    feed_url: str,
+    episode: Episode,
+    fingerprint: Fingerprint,
+    audio_path: Path | None,
+    options: PipelineOptions,
+    prompt_for_key: bool,
+    post_to_telegram: bool,
+    client: httpx.AsyncClient,
+) -> Path | None:
+    """Copy the matched episode's transcript and summary instead of producing them again.
+
+    Returns the summary path, or None when the summary is deferred.
+    """
+    print(match.describe())
+    METRICS.inc(DUPLICATE_EPISODES, reason=match.reason)
+    output_dir = artifacts.output_dir
+    source = match.artifacts(output_dir)
+    # Same audio, same language: take the one the source episode was transcribed in.
+    options = replace(options, language=episode_language(source, match.feed_url, options.language))
+    artifacts.update_metadata(language=options.language)
+    transcript_path = _copy_artifact(
+        source.directory / TRANSCRIPT_FILENAME, artifacts.directory / TRANSCRIPT_FILENAME
     )
+    transcript = Transcript.read_ndjson(transcript_path)
+    _index_transcript(output_dir, artifacts, feed_url, episode, transcript)
+    _record_fingerprint(output_dir, artifacts, feed_url, episode, fingerprint)
+    if options.defer_summary:
+        return None
+    if not source.summary_path.exists():
+        # The earlier episode's summary is still pending (e.g. in an LLM batch).
+        return await _summarize_and_post(
+            artifacts,
+            episode,
+            transcript,
+            audio_path,
+            options,
+            prompt_for_key=prompt_for_key,
+            post_to_telegram=post_to_telegram,
+            profile_dir=None,
+            stage_limits={},
+            client=client,
+        )
+
+    summary_path = _copy_artifact(source.summary_path, artifacts.summary_path)
+    if audio_path is not None:
+        update_latest_links(artifacts, audio_path)
+    if post_to_telegram:
+        await send_text_async(
+            client,
+            bot_token=get_telegram_bot_token(),
+            chat_id=get_telegram_chat_id(),
+            text=f"{episode.title}\n{match.describe()}",
+        )
+    return summary_path
+
+
+async def _download_streaming(
+    episode: Episode,
+    artifacts: EpisodeArtifacts,
+    transcribe: Callable[..., Transcript],
+    profile_dir: Path | None,
+    stage_limits: StageLimits,
+    client: httpx.AsyncClient,
+    executor: Executor | None,
+) -> tuple[Path, Transcript | None]:
+    """Download while ffmpeg decodes the same bytes and the first windows are transcribed.
+
+    Returns no transcript when the stream could not be decoded; the caller then transcribes
+    the downloaded file as usual.
+    """
+    pcm = PcmBuffer(expected_seconds=episode.duration_seconds)
+    try:
+        decoder = StreamDecoder(pcm)
+    except OSError as error:
+        print(f"Cannot start streaming decoder ({error}); downloading first.")
+        async with _stage("download", profile_dir, stage_limits):
+            audio_path = await download_audio_async(
+                episode.audio_url, artifacts.directory, client, basename=AUDIO_BASENAME
+            )
+        return audio_path, None
+
+    transcription = _in_executor(
+        executor,
+        partial(
+            transcribe,
+            # Named after the final file, which only exists once the download finishes.
+            artifacts.directory / AUDIO_BASENAME,
+            pcm=pcm,
+            audio_url=episode.audio_url,
+        ),
+    )
+    try:
+        async with _stage("download", profile_dir, stage_limits):
+            audio_path = await download_audio_async(
+                episode.audio_url,
+                artifacts.directory,
+                client,
+                basename=AUDIO_BASENAME,
+                on_chunk=decoder.feed,
+            )
+        decoder.close()
+    except BaseException as error:
+        decoder.abort(error)
+        with suppress(Exception):
+            await transcription
+        raise
+
+    try:
+        transcript = await transcription
+    except StreamDecodeError as error:
+        print(f"Streaming decode failed ({error}); transcribing the downloaded file instead.")
+        return audio_path, None
+    finally:
+        decoder.join()
+    return audio_path, transcript
+
+
+def _finish_audio(
+    audio_store: AudioStore,
+    audio_path: Path,
+    output_dir: Path,
+    options: PipelineOptions,
+) -> None:
+    removed = prune_audio(output_dir, keep_per_feed=options.keep_audio)
+    if removed:
+        print(f"Retention removed {len(removed)} old audio file(s).")
+    audio_store.admit(audio_path)
+    print(format_stats(audio_store.stats()))
+
+
+def _transcribe(
+    audio_path: Path,
+    options: PipelineOptions,
+    model_pool: ModelPool | None,
+    profile_dir: Path | None,
+    stage_limits: StageLimits,
+    progress: Callable[[float, float], None],
+    speed_path: Path,
+    feed_duration: float | None = None,
+    pcm: PcmBuffer | None = None,
+    audio_url: str = "",
+    feed_url: str = "",
+    language_path: Path | None = None,
+    jingles_path: Path | None = None,
+) -> Transcript:
+    """Transcribe ``audio_path``, or with ``pcm`` the audio still being downloaded to it."""
+    journal_path = audio_path.parent / JOURNAL_FILENAME
+    resumed = (options.resumable or pcm is not None) and journal_path.exists()
+    model_name = options.transcription_model
+    if options.latency_budget_minutes > 0 and (pcm is None or feed_duration):
+        duration = (
+            estimate_duration(audio_path, feed_duration)
+            if pcm is None
+            else DurationEstimate(feed_duration or 0.0, "itunes:duration")
+        )
+        choice = choose_model(
+            duration,
+            budget_seconds=options.latency_budget_minutes * 60,
+            speeds=load_speeds(speed_path),
+            max_model=options.transcription_model,
+        )
+        print(choice.describe())
+        model_name = choice.model_name
+    isolated = options.isolate_transcription and pcm is None
+    if isolated or (model_pool is not None and model_pool.model_name != model_name):
+        model_pool = None
+    if options.language == AUTO_LANGUAGE:
+        options.language = _resolve_language(
+            options,
+            feed_url,
+            language_path or audio_path.parent / LANGUAGE_CACHE_FILENAME,
+            pcm if pcm is not None else audio_path,
+            # The worker process owns the real model; the parent only loads the tiny one.
+            DETECTION_MODEL if isolated else model_name,
+            model_pool,
+            profile_dir,
+            stage_limits,
+        )
+
+    transcript_path = audio_path.parent / TRANSCRIPT_FILENAME
+    if pcm is not None:
+        transcribe = partial(
+            transcribe_stream,
+            pcm,
+            audio_url,
+            journal_path,
+            model_name=model_name,
+            language=options.language,
+            window_seconds=options.window_seconds,
+            progress=progress,
+        )
+    elif isolated:
+        worker = shared_worker(
+            max_jobs=options.worker_max_jobs,
+            max_rss_mb=options.worker_max_rss_mb,
+            memory_limit_mb=options.worker_memory_limit_mb,
+        )
+        job = TranscriptionJob(
+            audio_path,
+            transcript_path,
+            model_name=model_name,
+            language=options.language,
+            journal_path=journal_path if options.resumable else None,
+            window_seconds=options.window_seconds,
+        )
+
+        def transcribe(model: Any = None) -> Transcript:
+            # The worker keeps its own model loaded and writes the transcript file itself.
+            return worker.transcribe(job, progress)
+
+    elif options.resumable:
+        transcribe = partial(
+            transcribe_resumable,
+            audio_path,
+            journal_path,
+            model_name=model_name,
+            language=options.language,
+            window_seconds=options.window_seconds,
+            progress=progress,
+        )
+    elif options.skip_jingles and jingles_path is not None:
+        transcribe = partial(
+            transcribe_without_jingles,
+            audio_path,
+            jingles_path,
+            model_name=model_name,
+            language=options.language,
+        )
+    else:
+        transcribe = partial(
+            transcribe_segments,
+            audio_path,
+            model_name=model_name,
+            language=options.language,
+        )
+
+    def timed_transcribe(model: Any = None) -> tuple[Transcript, float]:
+        started = time.perf_counter()
+        transcript = _blocking_stage(
+            "transcribe", profile_dir, stage_limits, partial(transcribe, model=model)
+        )
+        return transcript, time.perf_counter() - started
+
+    transcript, elapsed = (
+        model_pool.run(timed_transcribe)
+        if model_pool is not None
+        else run_transcription(timed_transcribe)
+    )
+    if not resumed and pcm is None:
+        # A resumed run only timed the remaining windows and a streamed one also waited on
+        # the network; either would skew the factor.
+        record_speed(speed_path, model_name, elapsed, transcript.duration)
+    if not isolated:
+        with atomic_target(transcript_path) as tmp_path:
+            transcript.write_ndjson(tmp_path)
+    journal_path.unlink(missing_ok=True)
+    return transcript
+
+
+def _resolve_language(
+    options: PipelineOptions,
+    feed_url: str,
+    language_path: Path,
+    audio: Path | PcmBuffer,
+    model_name: str,
+    model_pool: ModelPool | None,
+    profile_dir: Path | None,
+    stage_limits: StageLimits,
+) -> str:
+    if model_name.endswith(".en"):
+        return "en"
+    choice = cached_language(language_path, feed_url, options.language_stable_episodes)
+    if choice is None:
+
+        def detect(model: Any = None) -> LanguageChoice:
+            return _blocking_stage(
+                "language",
+                profile_dir,
+                stage_limits,
+                partial(
+                    detect_feed_language,
+                    language_path,
+                    feed_url,
+                    audio,
+                    model or load_model(model_name),
+                ),
+            )
+
+        choice = model_pool.run(detect) if model_pool is not None else run_transcription(detect)
+    print(choice.describe())
+    return choice.language
+
+
+def _index_transcript(
+    output_dir: Path,
+    artifacts: EpisodeArtifacts,
+    feed_url: str,
+    episode: Episode,
+    transcript: Transcript,
+) -> None:
+    try:
+        with stage_timer("index"):
+            index_transcript(
+                search_db_path(output_dir),
+                artifacts.directory,
+                feed_url=feed_url,
+                title=episode.title,
+                transcript=transcript,
+                published=episode.published,
+            )
+    except sqlite3.Error as error:
+        # The archive is a convenience; a locked or corrupt index must not lose the summary.
+        print(f"Could not update search index: {error}")
+
+
+def _find_duplicate(
+    output_dir: Path, artifacts: EpisodeArtifacts, fingerprint: Fingerprint
+) -> FingerprintMatch | None:
+    try:
+        with stage_timer("dedupe"):
+            match = find_duplicate(
+                fingerprint_db_path(output_dir), fingerprint, exclude=episode_directory(artifacts)
+            )
+    except sqlite3.Error as error:
+        print(f"Could not read fingerprint index: {error}")
+        return None
+    if match is None:
+        return None
+    if not (match.artifacts(output_dir).directory / TRANSCRIPT_FILENAME).exists():
+        print(f"Ignoring fingerprint match without a transcript: {match.directory}")
+        return None
+    return match
+
+
+def _record_fingerprint(
+    output_dir: Path,
+    artifacts: EpisodeArtifacts,
+    feed_url: str,
+    episode: Episode,
+    fingerprint: Fingerprint,
+) -> None:
+    try:
+        record_fingerprint(
+            fingerprint_db_path(output_dir), artifacts, feed_url, episode, fingerprint
+        )
+    except sqlite3.Error as error:
+        print(f"Could not update fingerprint index: {error}")
+
+
+def _copy_artifact(source: Path, target: Path) -> Path:
+    with atomic_target(target) as tmp_path:
+        shutil.copyfile(source, tmp_path)
+    return target
+
+
+def _progress_reporter(title: str, notify_telegram: bool) -> Callable[[float, float], None]:
+    next_quarter = 1
+
+    def report(done_seconds: float, total_seconds: float) -> None:
+        nonlocal next_quarter
+        message = format_progress(done_seconds, total_seconds)
+        print(message)
+        if not notify_telegram or not total_seconds:
+            return
+        fraction = done_seconds / total_seconds
+        if next_quarter < 4 and fraction >= next_quarter / 4:
+            while next_quarter < 4 and fraction >= next_quarter / 4:
+                next_quarter += 1
+            try:
+                send_text(
+                    bot_token=get_telegram_bot_token(),
+                    chat_id=get_telegram_chat_id(),
+                    text=f"{title}\n{message}",
+                )
+            except (ConnectionError, RuntimeError, ValueError) as error:
+                print(f"Progress notification failed: {error}")
+
+    return report
+
+
+def _blocking_stage(
+    name: str,
+    profile_dir: Path | None,
+    stage_limits: StageLimits,
+    func: Callable[[], T],
+) -> T:
+    with stage_limits.get(name) or nullcontext(), stage_timer(name):
+        with profile_stage(name, profile_dir):
+            return func()
+
+
+@asynccontextmanager
+async def _stage(
+    name: str,
+    profile_dir: Path | None,
+    stage_limits: StageLimits,
+) -> AsyncIterator[None]:
+    limit = stage_limits.get(name)
+    if limit is not None:
+        await _acquire(limit)
+    try:
+        with stage_timer(name), profile_stage(name, profile_dir):
+            yield
+    finally:
+        if limit is not None:
+            limit.release()
+
+
+async def _acquire(limit: threading.Semaphore) -> None:
+    """Wait for a permit without holding a thread; a cancelled wait takes none.
+
+    The limits are shared by episodes running in other threads' event loops, so they stay
+    thread semaphores and are polled rather than awaited.
+    """
+    while not limit.acquire(blocking=False):
+        await asyncio.sleep(LIMIT_POLL_SECONDS)
+
+
+def _run(main: Coroutine[Any, Any, T]) -> T:
+    """``asyncio.run`` that closes the OpenAI connection pools opened on its loop."""
+
+    async def closing() -> T:
+        try:
+            return await main
+        finally:
+            await close_loop_clients()
+
+    return asyncio.run(closing())
+
+
+def _in_executor(executor: Executor | None, func: Callable[[], T]) -> asyncio.Future[T]:
+    """``func`` on the executor, run in this task's context so its events name the episode."""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, contextvars.copy_context().run, func)
+
 
-    return audio_path, summary_path
+@asynccontextmanager
+async def _http_client(client: httpx.AsyncClient | None) -> AsyncIterator[httpx.AsyncClient]:
+    if client is not None:
+        yield client
+        return
+    async with httpx.AsyncClient(
+        follow_redirects=True, event_hooks=events.http_event_hooks()
+    ) as owned:
+        yield owned
@@ -0,0 +1,256 @@
+"""In-process metrics with Prometheus text exposition and JSON summaries."""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from pod2text import events
+
+STAGE_SECONDS = "pod2text_stage_duration_seconds"
+PIPELINE_RUNS = "pod2text_pipeline_runs_total"
+FEED_POLLS = "pod2text_feed_polls_total"
+TELEGRAM_RETRIES = "pod2text_telegram_retries_total"
+CACHE_LOOKUPS = "pod2text_cache_lookups_total"
+QUEUE_DEPTH = "pod2text_queue_depth"
+DUPLICATE_EPISODES = "pod2text_duplicate_episodes_total"
+JINGLE_SECONDS = "pod2text_jingle_seconds_skipped_total"
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    15.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+    1800.0,
+    3600.0,
+)
+
+HELP_TEXT: dict[str, str] = {
+    STAGE_SECONDS: "Wall time spent per pipeline stage.",
+    PIPELINE_RUNS: "Pipeline runs by outcome.",
+    FEED_POLLS: "Feed polls by HTTP status.",
+    TELEGRAM_RETRIES: "Telegram sendMessage retries.",
+    CACHE_LOOKUPS: "Cache lookups by cache name and result.",
+    QUEUE_DEPTH: "Pending jobs per queue.",
+    DUPLICATE_EPISODES: "Episodes that reused an earlier transcript, by match reason.",
+    JINGLE_SECONDS: "Seconds of recurring jingles and spots cut before transcription.",
+}
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+@dataclass(slots=True)
+class Histogram:
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+    minimum: float = math.inf
+    maximum: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value
+        self.count += 1
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": _series_list(self._counters),
+                "gauges": _series_list(self._gauges),
+                "histograms": [
+                    {
+                        "name": name,
+                        "labels": dict(key),
+                        "count": histogram.count,
+                        "sum": round(histogram.total, 6),
+                        "min": round(histogram.minimum, 6) if histogram.count else None,
+                        "max": round(histogram.maximum, 6) if histogram.count else None,
+                        "mean": round(histogram.total / histogram.count, 6)
+                        if histogram.count
+                        else None,
+                    }
+                    for name, series in sorted(self._histograms.items())
+                    for key, histogram in sorted(series.items())
+                ],
+            }
+
+    def write_json(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.snapshot(), indent=2, sort_keys=True), encoding="utf-8")
+        return path
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                _append_header(lines, name, "counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name, series in sorted(self._gauges.items()):
+                _append_header(lines, name, "gauge")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name, series in sorted(self._histograms.items()):
+                _append_header(lines, name, "histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+                        cumulative += count
+                        bucket_key = (*key, ("le", _format_value(bound)))
+                        lines.append(f"{name}_bucket{_format_labels(bucket_key)} {cumulative}")
+                    inf_key = (*key, ("le", "+Inf"))
+                    lines.append(f"{name}_bucket{_format_labels(inf_key)} {histogram.count}")
+                    lines.append(
+                        f"{name}_sum{_format_labels(key)} {_format_value(histogram.total)}"
+                    )
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    events.record("stage_start", stage=stage)
+    started = time.perf_counter()
+    ok = False
+    try:
+        with METRICS.time(STAGE_SECONDS, stage=stage):
+            yield
+        ok = True
+    finally:
+        seconds = round(time.perf_counter() - started, 6)
+        events.record("stage_end", stage=stage, seconds=seconds, ok=ok)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    METRICS.inc(CACHE_LOOKUPS, cache=cache, result="hit" if hit else "miss")
+    events.record("cache", cache=cache, hit=hit)
+
+
+def start_metrics_server(
+    port: int,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry = METRICS,
+) -> ThreadingHTTPServer:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="pod2text-metrics", daemon=True)
+    thread.start()
+    return server
+
+
+def _label_key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _series_list(metrics: dict[str, dict[LabelKey, float]]) -> list[dict[str, Any]]:
+    return [
+        {"name": name, "labels": dict(key), "value": value}
+        for name, series in sorted(metrics.items())
+        for key, value in sorted(series.items())
+    ]
+
+
+def _append_header(lines: list[str], name: str, metric_type: str) -> None:
+    help_text = HELP_TEXT.get(name)
+    if help_text:
+        lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    pairs = (f'{name}="{_escape_label(value)}"' for name, value in key)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,194 @@
+"""Pick the largest Whisper model that transcribes an episode within a latency budget."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from pod2text.artifacts import atomic_write_text
+
+MODEL_SPEED_FILENAME = "model_speed.json"
+# Speed classes, smallest first. "turbo" (large-v3-turbo) keeps the large encoder with a
+# much smaller decoder, so it ranks between medium and large.
+MODEL_ORDER = ("tiny", "base", "small", "medium", "turbo", "large")
+# Conservative CPU real-time factors (transcription seconds per audio second) used until
+# this machine has measured its own.
+DEFAULT_REAL_TIME_FACTORS = {
+    "tiny": 0.08,
+    "base": 0.15,
+    "small": 0.45,
+    "medium": 1.2,
+    "turbo": 0.6,
+    "large": 2.5,
+}
+SAFETY_FACTOR = 1.2
+EWMA_WEIGHT = 0.3
+FALLBACK_BITRATE_BPS = 128_000
+
+_SPEED_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class DurationEstimate:
+    seconds: float
+    source: str
+
+
+@dataclass(slots=True)
+class ModelSpeed:
+    real_time_factor: float
+    samples: int = 0
+
+
+@dataclass(slots=True)
+class ModelChoice:
+    model_name: str
+    estimated_seconds: float
+    budget_seconds: float
+    duration: DurationEstimate
+    real_time_factor: float
+    measured: bool
+
+    @property
+    def fits(self) -> bool:
+        return self.estimated_seconds <= self.budget_seconds
+
+    def describe(self) -> str:
+        speed = "measured" if self.measured else "default"
+        verdict = "within" if self.fits else "OVER"
+        return (
+            f"Chose Whisper '{self.model_name}' for {self.duration.seconds / 60:.1f} min of audio "
+            f"(duration from {self.duration.source}): ~{self.estimated_seconds / 60:.1f} min at "
+            f"{speed} RTF {self.real_time_factor:.2f}, {verdict} the "
+            f"{self.budget_seconds / 60:.0f} min budget."
+        )
+
+
+def estimate_duration(audio_path: Path, feed_duration: float | None = None) -> DurationEstimate:
+    probed = probe_duration(audio_path)
+    if probed is not None:
+        return DurationEstimate(probed, "ffprobe")
+    if feed_duration:
+        return DurationEstimate(feed_duration, "itunes:duration")
+    size = audio_path.stat().st_size
+    return DurationEstimate(size * 8 / FALLBACK_BITRATE_BPS, "file size")
+
+
+def probe_duration(audio_path: Path) -> float | None:
+    if shutil.which("ffprobe") is None:
+        return None
+    try:
+        completed = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(audio_path),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=True,
+        )
+        return float(completed.stdout.strip()) or None
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+def choose_model(
+    duration: DurationEstimate,
+    budget_seconds: float,
+    speeds: dict[str, ModelSpeed],
+    max_model: str = MODEL_ORDER[-1],
+) -> ModelChoice:
+    if budget_seconds <= 0:
+        raise ValueError("budget_seconds must be greater than zero.")
+    max_size = model_size(max_model)
+    if max_size not in MODEL_ORDER:
+        # A custom checkpoint has nothing smaller to trade down to; judge it like "large".
+        print(f"No speed class for Whisper model '{max_model}'; using it without choosing.")
+        choice = _choice(max_size, duration, budget_seconds, speeds)
+        choice.model_name = max_model
+        return choice
+
+    candidates = MODEL_ORDER[: MODEL_ORDER.index(max_size) + 1]
+    choices = [_choice(name, duration, budget_seconds, speeds) for name in candidates]
+    fitting = [choice for choice in choices if choice.fits]
+    # Nothing fits: the smallest model is the closest we can get to the deadline.
+    choice = fitting[-1] if fitting else choices[0]
+    if choice.model_name == max_size:
+        choice.model_name = max_model
+    return choice
+
+
+def model_size(model_name: str) -> str:
+    """Speed class of a Whisper model name: ``"small.en"`` -> ``"small"``.
+
+    ``"large-v1"`` to ``"large-v3"`` are ``"large"``; ``"large-v3-turbo"`` is ``"turbo"``.
+    """
+    name = model_name.split(".")[0]
+    return "turbo" if name.endswith("turbo") else name.split("-")[0]
+
+
+def load_speeds(path: Path) -> dict[str, ModelSpeed]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    speeds: dict[str, ModelSpeed] = {}
+    for name, values in raw.items():
+        try:
+            speeds[name] = ModelSpeed(float(values["real_time_factor"]), int(values["samples"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return speeds
+
+
+def record_speed(path: Path, model_name: str, elapsed_seconds: float, audio_seconds: float) -> None:
+    if audio_seconds <= 0 or elapsed_seconds <= 0:
+        return
+    observed = elapsed_seconds / audio_seconds
+    size = model_size(model_name)
+    with _SPEED_LOCK:
+        speeds = load_speeds(path)
+        current = speeds.get(size)
+        if current is None:
+            speeds[size] = ModelSpeed(observed, 1)
+        else:
+            current.real_time_factor += EWMA_WEIGHT * (observed - current.real_time_factor)
+            current.samples += 1
+        atomic_write_text(
+            path, json.dumps({name: asdict(speed) for name, speed in speeds.items()}, indent=2)
+        )
+
+
+def _choice(
+    model_name: str,
+    duration: DurationEstimate,
+    budget_seconds: float,
+    speeds: dict[str, ModelSpeed],
+) -> ModelChoice:
+    measured = speeds.get(model_name)
+    real_time_factor = (
+        measured.real_time_factor
+        if measured
+        else DEFAULT_REAL_TIME_FACTORS.get(model_name, DEFAULT_REAL_TIME_FACTORS["large"])
+    )
+    return ModelChoice(
+        model_name=model_name,
+        estimated_seconds=duration.seconds * real_time_factor * SAFETY_FACTOR,
+        budget_seconds=budget_seconds,
+        duration=duration,
+        real_time_factor=real_time_factor,
+        measured=measured is not None,
+    )
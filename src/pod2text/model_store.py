@@ -0,0 +1,106 @@
+"""Whisper weights on local disk: fetched once (e.g. at image build) and verified at startup."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+import whisper
+
+from pod2text.artifacts import atomic_target
+
+MODEL_DIR_ENV = "POD2TEXT_MODEL_DIR"
+HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass(slots=True)
+class ModelCheck:
+    name: str
+    path: Path
+    status: str
+
+    @property
+    def ok(self) -> bool:
+        return self.status in {"verified", "downloaded"}
+
+    def describe(self) -> str:
+        return f"Whisper '{self.name}': {self.status} ({self.path})"
+
+
+def model_dir() -> Path:
+    """``$POD2TEXT_MODEL_DIR``, else the cache directory Whisper itself downloads to."""
+    configured = os.environ.get(MODEL_DIR_ENV)
+    if configured:
+        return Path(configured)
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "whisper"
+
+
+def model_url(name: str) -> str:
+    try:
+        return whisper._MODELS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown Whisper model '{name}', expected one of {whisper.available_models()}."
+        ) from None
+
+
+def model_path(name: str, root: Path) -> Path:
+    return root / model_url(name).rsplit("/", 1)[-1]
+
+
+def expected_sha256(name: str) -> str:
+    # Whisper publishes each checkpoint under a directory named after its SHA-256.
+    return model_url(name).split("/")[-2]
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ensure_models(
+    names: list[str],
+    root: Path | None = None,
+    download: bool = True,
+    client: httpx.Client | None = None,
+) -> list[ModelCheck]:
+    """Verify each model's checksum; download missing or corrupt ones unless ``download`` is off."""
+    root = root or model_dir()
+    checks: list[ModelCheck] = []
+    for name in dict.fromkeys(names):
+        path = model_path(name, root)
+        if path.is_file() and file_sha256(path) == expected_sha256(name):
+            checks.append(ModelCheck(name, path, "verified"))
+        elif not download:
+            checks.append(ModelCheck(name, path, "corrupt" if path.exists() else "missing"))
+        else:
+            download_model(name, root, client)
+            checks.append(ModelCheck(name, path, "downloaded"))
+    return checks
+
+
+def download_model(name: str, root: Path, client: httpx.Client | None = None) -> Path:
+    target = model_path(name, root)
+    digest = hashlib.sha256()
+    print(f"Downloading Whisper '{name}' to {target}")
+    with atomic_target(target) as tmp_path:
+        http = client or httpx.Client(follow_redirects=True, timeout=120)
+        try:
+            with http.stream("GET", model_url(name)) as response, tmp_path.open("wb") as file:
+                response.raise_for_status()
+                for chunk in response.iter_bytes(HASH_CHUNK_BYTES):
+                    digest.update(chunk)
+                    file.write(chunk)
+        finally:
+            if client is None:
+                http.close()
+        if digest.hexdigest() != expected_sha256(name):
+            raise ValueError(f"Checksum mismatch for Whisper '{name}' from {model_url(name)}.")
+    return target
@@ -0,0 +1,37 @@
+"""Tunable pipeline options shared by the CLI, server and batch runner."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from pod2text.artifacts import DEFAULT_KEEP_AUDIO
+from pod2text.checkpoint import DEFAULT_WINDOW_SECONDS
+from pod2text.language import DEFAULT_STABLE_EPISODES
+from pod2text.transcribe_worker import DEFAULT_MAX_JOBS, DEFAULT_MAX_RSS_MB
+
+
+@dataclass(slots=True)
+class PipelineOptions:
+    transcription_model: str = "small"
+    llm_model: str = "gpt-4o-mini"
+    language: str = "de"
+    language_stable_episodes: int = DEFAULT_STABLE_EPISODES
+    profile: bool = False
+    keep_audio: int = DEFAULT_KEEP_AUDIO
+    audio_budget_mb: int = 0
+    recompress_audio: bool = False
+    resumable: bool = False
+    window_seconds: int = DEFAULT_WINDOW_SECONDS
+    progress_telegram: bool = False
+    clean: bool = True
+    drop_ads: bool = False
+    local_chapters: bool = False
+    defer_summary: bool = False
+    latency_budget_minutes: float = 0.0
+    isolate_transcription: bool = False
+    worker_max_jobs: int = DEFAULT_MAX_JOBS
+    worker_max_rss_mb: int = DEFAULT_MAX_RSS_MB
+    worker_memory_limit_mb: int = 0
+    stream_audio: bool = False
+    skip_duplicates: bool = False
+    skip_jingles: bool = False
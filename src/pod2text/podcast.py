@@ -1,13 +1,32 @@
-"""Feed resolution and latest episode discovery."""
+"""Feed resolution and latest episode discovery.
+
+Feeds are read as a stream: parsing stops once the caller has the entries it needs, which are
+usually the first few of a feed that can run to several megabytes of back catalogue.
+"""
 
 from __future__ import annotations
 
+import time
+from collections.abc import Container, Iterable, Iterator
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
+from itertools import islice
 from urllib.parse import urlparse
+from xml.etree import ElementTree
 
 import feedparser
+import httpx
 
+from pod2text import events
 from pod2text.catalog import CATALOG
+from pod2text.metrics import FEED_POLLS, METRICS
+
+FEED_CHUNK_BYTES = 16 * 1024
+ATOM = "{http://www.w3.org/2005/Atom}"
+RSS1 = "{http://purl.org/rss/1.0/}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+ITUNES = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+ENTRY_TAGS = {"item", ATOM + "entry", RSS1 + "item"}
 
 
 @dataclass(slots=True)
@@ -16,6 +35,7 @@ class Episode:
     title: str
     audio_url: str
     published: str | None = None
+    duration_seconds: float | None = None
 
 
 def resolve_feed_url(podcast: str) -> str:
@@ -30,35 +50,292 @@ def resolve_feed_url(podcast: str) -> str:
     )
 
 
+@dataclass(slots=True)
+class FeedValidators:
+    """``ETag`` and ``Last-Modified`` of the last fetched copy of a feed."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @classmethod
+    def from_headers(cls, headers: httpx.Headers) -> FeedValidators:
+        return cls(headers.get("etag"), headers.get("last-modified"))
+
+    def request_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
 def fetch_latest_episode(feed_url: str) -> Episode:
-    parsed = feedparser.parse(feed_url)
-    if parsed.bozo:
-        raise ValueError(f"Failed to parse feed: {feed_url}")
+    with closing(_feed_chunks(feed_url)) as chunks:
+        episode = next(_iter_entries(chunks, feed_url))
+    if episode is None:
+        raise ValueError("Latest episode has no downloadable audio enclosure.")
+    return episode
 
-    if not parsed.entries:
-        raise ValueError(f"No entries found in feed: {feed_url}")
 
-    first = parsed.entries[0]
-    audio_url = _extract_audio_url(first)
-    if not audio_url:
+def poll_latest_episode(
+    feed_url: str, validators: FeedValidators | None = None
+) -> tuple[Episode | None, FeedValidators]:
+    """Conditional GET of the feed: no episode when it answers 304 Not Modified.
+
+    The returned validators belong to the copy that was read and are sent with the next poll.
+    """
+    headers = validators.request_headers() if validators else {}
+    with _feed_response(feed_url, headers) as response:
+        if response.status_code == 304:
+            return None, validators or FeedValidators()
+        response.raise_for_status()
+        episode = next(_iter_entries(response.iter_bytes(FEED_CHUNK_BYTES), feed_url))
+        fresh = FeedValidators.from_headers(response.headers)
+    if episode is None:
         raise ValueError("Latest episode has no downloadable audio enclosure.")
+    return episode, fresh
+
+
+async def fetch_latest_episode_async(feed_url: str, client: httpx.AsyncClient) -> Episode:
+    reader = FeedReader(feed_url)
+    entries: list[Episode | None] = []
+    async with client.stream("GET", feed_url, timeout=60) as response:
+        METRICS.inc(FEED_POLLS, status=str(response.status_code))
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(FEED_CHUNK_BYTES):
+            entries = reader.feed(chunk)
+            if entries:
+                # Leaving the block closes the connection; the rest of the feed is never read.
+                break
+        else:
+            entries = reader.close()
+    episode = entries[0]
+    if episode is None:
+        raise ValueError("Latest episode has no downloadable audio enclosure.")
+    return episode
+
+
+def fetch_episodes(
+    feed_url: str, limit: int | None = None, stop_at: Container[str] = ()
+) -> list[Episode]:
+    """The newest ``limit`` episodes, stopping before the first identifier in ``stop_at``."""
+    with closing(_feed_chunks(feed_url)) as chunks:
+        return list(islice(iter_feed_episodes(chunks, feed_url, stop_at), limit))
+
+
+def iter_feed_episodes(
+    chunks: Iterable[bytes], source: str = "feed", stop_at: Container[str] = ()
+) -> Iterator[Episode]:
+    """Episodes in feed order, parsed only as far as the caller iterates.
+
+    Iteration ends at the first episode whose identifier is in ``stop_at`` (e.g. the last
+    processed one), so a known feed costs a few kilobytes of parsing instead of the whole file.
+    """
+    for episode in _iter_entries(chunks, source):
+        if episode is None:
+            continue
+        if episode.identifier in stop_at:
+            return
+        yield episode
+
+
+class FeedReader:
+    """Incremental RSS/Atom parser that turns each finished item into an ``Episode``.
+
+    Finished items are dropped from the tree, so memory stays at one item plus the bytes
+    read so far. A feed that is not well-formed XML is handed to feedparser, which is more
+    forgiving, once all of it has arrived.
+    """
+
+    def __init__(self, source: str = "feed") -> None:
+        self.source = source
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._stack: list[ElementTree.Element] = []
+        self._received: list[bytes] = []
+        self._entries = 0
+        self._malformed = False
+
+    def feed(self, chunk: bytes) -> list[Episode | None]:
+        """Entries completed by ``chunk``; ``None`` for items without an audio enclosure."""
+        self._received.append(chunk)
+        if self._malformed:
+            return []
+        try:
+            self._parser.feed(chunk)
+            return self._read_events()
+        except ElementTree.ParseError as error:
+            self._fall_back(error)
+            return []
+
+    def close(self) -> list[Episode | None]:
+        """The remaining entries once the whole feed has been fed."""
+        entries: list[Episode | None] = []
+        if not self._malformed:
+            try:
+                self._parser.close()
+                entries = self._read_events()
+            except ElementTree.ParseError as error:
+                self._fall_back(error)
+        if self._malformed:
+            entries = self._fallback_entries()
+        if not self._entries:
+            raise ValueError(f"No entries found in feed: {self.source}")
+        return entries
+
+    def _read_events(self) -> list[Episode | None]:
+        entries: list[Episode | None] = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._stack.append(element)
+                continue
+            self._stack.pop()
+            if element.tag not in ENTRY_TAGS:
+                continue
+            episode = _episode_from_element(element)
+            self._entries += 1
+            entries.append(episode)
+            if self._stack:
+                self._stack[-1].remove(element)
+        return entries
+
+    def _fall_back(self, error: ElementTree.ParseError) -> None:
+        print(f"Feed is not well-formed XML ({error}); parsing it with feedparser: {self.source}")
+        self._malformed = True
+        self._stack.clear()
+
+    def _fallback_entries(self) -> list[Episode | None]:
+        parsed = feedparser.parse(b"".join(self._received))
+        if not parsed.entries:
+            raise ValueError(f"Failed to parse feed: {self.source}")
+        # Entries before the malformed spot were already returned, in the same order.
+        entries = [_episode_from_entry(entry) for entry in parsed.entries[self._entries :]]
+        self._entries = max(self._entries, len(parsed.entries))
+        return entries
+
+
+def _feed_chunks(feed_url: str) -> Iterator[bytes]:
+    with _feed_response(feed_url) as response:
+        response.raise_for_status()
+        yield from response.iter_bytes(FEED_CHUNK_BYTES)
+
+
+@contextmanager
+def _feed_response(
+    feed_url: str, headers: dict[str, str] | None = None
+) -> Iterator[httpx.Response]:
+    started = time.perf_counter()
+    with httpx.stream(
+        "GET", feed_url, headers=headers, timeout=60, follow_redirects=True
+    ) as response:
+        METRICS.inc(FEED_POLLS, status=str(response.status_code))
+        try:
+            yield response
+        finally:
+            # Also reached when the caller stops reading early.
+            events.record(
+                "http",
+                method="GET",
+                host=response.url.host,
+                status=response.status_code,
+                seconds=round(time.perf_counter() - started, 6),
+                bytes=response.num_bytes_downloaded,
+            )
+
+
+def _iter_entries(chunks: Iterable[bytes], source: str) -> Iterator[Episode | None]:
+    reader = FeedReader(source)
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+    yield from reader.close()
+
+
+def _episode_from_element(item: ElementTree.Element) -> Episode | None:
+    audio_url = _element_audio_url(item)
+    if not audio_url:
+        return None
+
+    identifier = (
+        _child_text(item, "guid", ATOM + "id")
+        or _element_link(item)
+        or audio_url
+    )
+    return Episode(
+        identifier=identifier,
+        title=_child_text(item, "title", ATOM + "title", RSS1 + "title") or "latest_episode",
+        audio_url=audio_url,
+        published=_child_text(item, "pubDate", ATOM + "published", DC + "date") or None,
+        duration_seconds=parse_itunes_duration(_child_text(item, ITUNES + "duration")),
+    )
+
+
+def _element_audio_url(item: ElementTree.Element) -> str | None:
+    for child in item:
+        if child.tag == "enclosure":
+            url, media_type = child.get("url", ""), child.get("type", "")
+        elif child.tag == ATOM + "link" and child.get("rel") == "enclosure":
+            url, media_type = child.get("href", ""), child.get("type", "")
+        else:
+            continue
+        if media_type.startswith("audio") and url:
+            return url.strip()
+    return None
+
+
+def _element_link(item: ElementTree.Element) -> str:
+    for child in item:
+        if child.tag in {"link", RSS1 + "link"} and child.text:
+            return child.text.strip()
+        if child.tag == ATOM + "link" and child.get("rel", "alternate") == "alternate":
+            return child.get("href", "").strip()
+    return ""
+
+
+def _child_text(item: ElementTree.Element, *tags: str) -> str:
+    for tag in tags:
+        child = item.find(tag)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return ""
+
+
+def _episode_from_entry(entry: feedparser.FeedParserDict) -> Episode | None:
+    audio_url = _extract_audio_url(entry)
+    if not audio_url:
+        return None
 
     identifier = (
-        _read(first, "id")
-        or _read(first, "guid")
-        or _read(first, "link")
+        _read(entry, "id")
+        or _read(entry, "guid")
+        or _read(entry, "link")
         or audio_url
     )
-    published = _read(first, "published") or None
+    published = _read(entry, "published") or None
 
     return Episode(
         identifier=identifier,
-        title=_read(first, "title") or "latest_episode",
+        title=_read(entry, "title") or "latest_episode",
         audio_url=audio_url,
         published=published,
+        duration_seconds=parse_itunes_duration(_read(entry, "itunes_duration")),
     )
 
 
+def parse_itunes_duration(value: str) -> float | None:
+    """Parse ``itunes:duration`` values such as ``"3725"``, ``"62:05"`` or ``"1:02:05"``."""
+    parts = value.strip().split(":")
+    if not parts or len(parts) > 3:
+        return None
+    try:
+        numbers = [float(part) for part in parts]
+    except ValueError:
+        return None
+    seconds = 0.0
+    for number in numbers:
+        seconds = seconds * 60 + number
+    return seconds if seconds > 0 else None
+
+
 def _extract_audio_url(entry: feedparser.FeedParserDict) -> str | None:
     links = getattr(entry, "links", [])
     for link in links:
@@ -0,0 +1,85 @@
+"""Opt-in per-stage profiling with cProfile and folded-stack sampling."""
+
+from __future__ import annotations
+
+import cProfile
+import sys
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+
+PROFILE_DIRNAME = "profile"
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+# Held by the one stage that has cProfile running; Python 3.12 refuses a second profiler.
+_CPROFILE = threading.Lock()
+
+
+class StackSampler:
+    """Periodically samples one thread's Python stack into folded-stack counts."""
+
+    def __init__(self, thread_id: int, interval_seconds: float = SAMPLE_INTERVAL_SECONDS) -> None:
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pod2text-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_folded(self, path: Path) -> Path:
+        lines = [f"{stack} {count}" for stack, count in sorted(self.samples.items())]
+        path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+        return path
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_fold_stack(frame)] += 1
+
+
+@contextmanager
+def profile_stage(stage: str, profile_dir: Path | None) -> Iterator[None]:
+    if profile_dir is None:
+        yield
+        return
+
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    sampler = StackSampler(threading.get_ident())
+    # Overlapping stages (e.g. download and transcribe with --stream-audio) only get the
+    # stack samples; the first one keeps cProfile.
+    profiler = cProfile.Profile() if _CPROFILE.acquire(blocking=False) else None
+    sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _CPROFILE.release()
+            profiler.dump_stats(str(profile_dir / f"{stage}.prof"))
+        sampler.stop()
+        sampler.write_folded(profile_dir / f"{stage}.folded")
+        print(f"Profile for stage '{stage}' written to {profile_dir}")
+
+
+def _fold_stack(frame: FrameType) -> str:
+    names: list[str] = []
+    current: FrameType | None = frame
+    while current is not None:
+        code = current.f_code
+        module = current.f_globals.get("__name__", Path(code.co_filename).stem)
+        names.append(f"{module}:{code.co_name}")
+        current = current.f_back
+    names.reverse()
+    return ";".join(names)
@@ -0,0 +1,197 @@
+"""Split a CPU core budget between transcription workers, audio decoding and I/O stages.
+
+Every PyTorch instance defaults to one intra-op thread per core, so two transcription
+workers on an 8-core host run 16 busy threads and ffmpeg competes with both. A ``CpuPlan``
+gives each stage its own cores: transcription workers get disjoint core sets with a matching
+thread count, decoding (ffmpeg) and I/O (downloads, LLM and Telegram calls, SQLite) get
+a small reserve of their own.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+import torch
+
+DEFAULT_DECODE_CORES = 1
+DEFAULT_IO_CORES = 1
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+T = TypeVar("T")
+
+_ACTIVE: CpuPlan | None = None
+_SLOT_THREADS: dict[tuple[int, ...], ThreadPoolExecutor] = {}
+_SLOT_THREADS_LOCK = threading.Lock()
+
+
+@dataclass(slots=True, frozen=True)
+class CpuPlan:
+    transcribe: tuple[tuple[int, ...], ...]
+    decode: tuple[int, ...]
+    io: tuple[int, ...]
+
+    @property
+    def threads_per_worker(self) -> int:
+        return min(len(cores) for cores in self.transcribe)
+
+    def describe(self) -> str:
+        workers = " | ".join(_format_cores(cores) for cores in self.transcribe)
+        return (
+            f"CPU plan: {len(self.transcribe)} transcription worker(s) x "
+            f"{self.threads_per_worker} thread(s) on {workers}; "
+            f"decode on {_format_cores(self.decode)}; I/O on {_format_cores(self.io)}."
+        )
+
+
+def available_cores() -> tuple[int, ...]:
+    if hasattr(os, "sched_getaffinity"):
+        return tuple(sorted(os.sched_getaffinity(0)))
+    return tuple(range(os.cpu_count() or 1))
+
+
+# Taken before any pinning, which narrows what ``sched_getaffinity`` reports for this thread.
+PROCESS_CORES = available_cores()
+
+
+def plan_cpus(
+    budget: int,
+    transcribe_workers: int = 1,
+    decode_cores: int = DEFAULT_DECODE_CORES,
+    io_cores: int = DEFAULT_IO_CORES,
+    cores: Iterable[int] | None = None,
+) -> CpuPlan:
+    """Reserve I/O and decode cores first, then split the rest evenly between workers.
+
+    ``budget`` 0 uses every core this process may run on. When the budget cannot hold the
+    reserves plus one core per worker, decoding and I/O share the workers' cores.
+    """
+    if budget < 0 or decode_cores < 0 or io_cores < 0:
+        raise ValueError("budget, decode_cores and io_cores must not be negative.")
+    if transcribe_workers <= 0:
+        raise ValueError("transcribe_workers must be greater than zero.")
+    usable = tuple(cores) if cores is not None else PROCESS_CORES
+    usable = usable[: budget or len(usable)]
+    if len(usable) < transcribe_workers:
+        raise ValueError(
+            f"A budget of {len(usable)} core(s) cannot give {transcribe_workers} "
+            "transcription worker(s) one core each."
+        )
+
+    reserved = decode_cores + io_cores
+    if len(usable) - reserved >= transcribe_workers:
+        io, decode, rest = usable[:io_cores], usable[io_cores:reserved], usable[reserved:]
+    else:
+        io, decode, rest = (), (), usable
+    per_worker = len(rest) // transcribe_workers
+    transcribe = tuple(
+        rest[index * per_worker : (index + 1) * per_worker] for index in range(transcribe_workers)
+    )
+    # Cores that do not divide evenly help with decoding rather than unbalancing workers.
+    decode += rest[per_worker * transcribe_workers :]
+    return CpuPlan(transcribe=transcribe, decode=decode or io or usable, io=io or decode or usable)
+
+
+def activate(plan: CpuPlan | None) -> None:
+    """Apply ``plan`` to this process; ``None`` returns to one thread per available core.
+
+    Pins the calling thread (and the threads and processes it starts later) to the I/O
+    cores; transcription runs on pinned slot threads (``run_transcription``, ``ModelPool``)
+    and decoding pins itself with ``decoding``.
+    """
+    global _ACTIVE
+    _ACTIVE = plan
+    if plan is None:
+        _pin(PROCESS_CORES)
+        torch.set_num_threads(len(PROCESS_CORES))
+        for name in THREAD_ENV_VARS:
+            os.environ.pop(name, None)
+        return
+    set_thread_count(plan.threads_per_worker)
+    _pin(plan.io)
+    print(plan.describe())
+
+
+def active_plan() -> CpuPlan | None:
+    return _ACTIVE
+
+
+def set_thread_count(threads: int) -> None:
+    torch.set_num_threads(threads)
+    # Read by OpenMP/MKL in processes started from here on (e.g. transcription workers).
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+
+
+def apply_worker_slot(cores: tuple[int, ...]) -> None:
+    """Confine a transcription worker or slot thread to its cores, one torch thread per core."""
+    _pin(cores)
+    set_thread_count(len(cores))
+
+
+@contextmanager
+def pinned(cores: tuple[int, ...]) -> Iterator[None]:
+    """Run the calling thread on ``cores``; processes it starts meanwhile inherit them."""
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cores)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+def run_in_slot(cores: tuple[int, ...], func: Callable[[], T]) -> T:
+    """Run ``func`` on the long-lived thread that owns ``cores``; no cores run it right here.
+
+    Pinning only moves the calling thread: the OpenMP threads torch already started for it
+    keep their old cores. A slot thread is pinned before it runs anything, so every OpenMP
+    thread it starts stays on the slot's cores too.
+    """
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return func()
+    with _SLOT_THREADS_LOCK:
+        executor = _SLOT_THREADS.get(cores)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                1,
+                thread_name_prefix="transcribe-slot",
+                initializer=apply_worker_slot,
+                initargs=(cores,),
+            )
+            _SLOT_THREADS[cores] = executor
+    return executor.submit(contextvars.copy_context().run, func).result()
+
+
+def run_transcription(func: Callable[[], T]) -> T:
+    """Run ``func`` on the first worker's cores, for transcription without a ``ModelPool``."""
+    return run_in_slot(_ACTIVE.transcribe[0] if _ACTIVE is not None else (), func)
+
+
+@contextmanager
+def decoding() -> Iterator[None]:
+    with pinned(_ACTIVE.decode if _ACTIVE is not None else ()):
+        yield
+
+
+def ffmpeg_threads() -> str:
+    """Value for ffmpeg's ``-threads``: the decode cores, or ffmpeg's own choice (0)."""
+    return str(len(_ACTIVE.decode)) if _ACTIVE is not None else "0"
+
+
+def _pin(cores: tuple[int, ...]) -> None:
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+
+def _format_cores(cores: tuple[int, ...]) -> str:
+    if len(cores) > 1 and cores[-1] - cores[0] == len(cores) - 1:
+        return f"cores {cores[0]}-{cores[-1]}"
+    return ("core " if len(cores) == 1 else "cores ") + ",".join(str(core) for core in cores)
@@ -0,0 +1,253 @@
+"""Priority job queue for the server: interactive runs first, archive backfill last."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+from pod2text.metrics import METRICS, QUEUE_DEPTH
+
+JOB_QUEUE_SECONDS = "pod2text_job_queue_seconds"
+JOBS_TOTAL = "pod2text_jobs_total"
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    NEW_EPISODE = 1
+    BACKFILL = 2
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job at its next checkpoint after ``/cancel`` or preemption."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Job {reason}.")
+        self.reason = reason
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.reason = "cancelled"
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self.reason = reason
+        self._event.set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled(self.reason)
+
+    def guard(self, progress: Callable[[float, float], None]) -> Callable[[float, float], None]:
+        """Wrap a transcription progress callback so the job stops at the next window."""
+
+        def report(done_seconds: float, total_seconds: float) -> None:
+            progress(done_seconds, total_seconds)
+            self.check()
+
+        return report
+
+
+@dataclass(slots=True)
+class Job:
+    id: int
+    name: str
+    priority: Priority
+    run: Callable[[CancelToken], Any]
+    preemptible: bool = False
+    key: str | None = None
+    # Called once when ``/cancel`` drops the job, whether it was queued or running.
+    on_cancel: Callable[[], None] | None = None
+    state: str = "queued"
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    token: CancelToken = field(default_factory=CancelToken)
+
+
+class JobScheduler:
+    """Runs one job at a time, lowest ``Priority`` first, FIFO within a priority.
+
+    A new job of higher priority preempts a running ``preemptible`` job: the running job is
+    asked to stop at its next window boundary and goes back into the queue, where it resumes
+    from its transcription journal once the higher-priority work is done.
+    """
+
+    def __init__(self) -> None:
+        self._queue: list[tuple[int, int, Job]] = []
+        self._ids = itertools.count(1)
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._running: Job | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="pod2text-jobs", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            if self._running is not None:
+                self._running.token.cancel("stopped")
+            self._condition.notify_all()
+
+    def submit(
+        self,
+        name: str,
+        run: Callable[[CancelToken], Any],
+        priority: Priority,
+        preemptible: bool = False,
+        key: str | None = None,
+        on_cancel: Callable[[], None] | None = None,
+    ) -> Job:
+        with self._condition:
+            if key is not None:
+                for job in self._active():
+                    if job.key == key:
+                        return job
+            job = Job(
+                next(self._ids),
+                name,
+                priority,
+                run,
+                preemptible=preemptible,
+                key=key,
+                on_cancel=on_cancel,
+            )
+            self._push(job)
+            self._publish_depth()
+            running = self._running
+            if running is not None and running.preemptible and priority < running.priority:
+                print(f"Preempting job #{running.id} ({running.name}) for #{job.id} ({name}).")
+                running.token.cancel("preempted")
+            self._condition.notify_all()
+        print(f"Queued job #{job.id} ({name}) with {priority.name.lower()} priority.")
+        return job
+
+    def cancel(self, job_id: int | None = None) -> Job | None:
+        """Cancel a queued job, or ask a running one to stop; ``None`` means the running job."""
+        with self._condition:
+            job = next(
+                (
+                    job
+                    for job in self._active()
+                    if job.id == job_id or (job_id is None and job is self._running)
+                ),
+                None,
+            )
+            if job is None:
+                return None
+            if job is self._running:
+                job.token.cancel("cancelled")
+                return job
+            job.state = "cancelled"
+            self._publish_depth()
+        METRICS.inc(JOBS_TOTAL, status="cancelled")
+        _notify_cancelled(job)
+        return job
+
+    def jobs(self) -> list[Job]:
+        with self._condition:
+            return self._active()
+
+    def run_next(self, timeout: float | None = None) -> Job | None:
+        """Run the next queued job on the calling thread; ``None`` if the queue stayed empty."""
+        with self._condition:
+            job = self._pop()
+            if job is None and timeout != 0:
+                self._condition.wait(timeout)
+                job = self._pop()
+            if job is None:
+                return None
+            job.state = "running"
+            self._publish_depth()
+            job.started_at = time.monotonic()
+            self._running = job
+
+        waited = job.started_at - job.enqueued_at
+        METRICS.observe(JOB_QUEUE_SECONDS, waited, priority=job.priority.name.lower())
+        print(f"Starting job #{job.id} ({job.name}) after {waited:.1f}s in queue.")
+        try:
+            job.run(job.token)
+        except JobCancelled as cancelled:
+            state = "preempted" if cancelled.reason == "preempted" else "cancelled"
+            # A stopping server leaves the job to be picked up again after a restart.
+            if cancelled.reason == "cancelled":
+                _notify_cancelled(job)
+        except Exception as error:  # noqa: BLE001
+            print(f"Job #{job.id} ({job.name}) failed: {error}")
+            state = "failed"
+        else:
+            state = "done"
+
+        with self._condition:
+            self._running = None
+            if state == "preempted" and not self._stopped:
+                job.state = "queued"
+                job.token = CancelToken()
+                job.enqueued_at = time.monotonic()
+                self._push(job)
+                self._publish_depth()
+            else:
+                job.state = state
+        METRICS.inc(JOBS_TOTAL, status=state)
+        elapsed = time.monotonic() - job.started_at
+        print(f"Job #{job.id} ({job.name}) {state} after {elapsed:.1f}s.")
+        return job
+
+    def _loop(self) -> None:
+        while not self._stopped:
+            self.run_next(timeout=1.0)
+
+    def _push(self, job: Job) -> None:
+        heapq.heappush(self._queue, (job.priority, next(self._order), job))
+
+    def _pop(self) -> Job | None:
+        while self._queue:
+            _, _, job = heapq.heappop(self._queue)
+            if job.state == "queued":
+                return job
+        return None
+
+    def _publish_depth(self) -> None:
+        queued = sum(job.state == "queued" for _, _, job in self._queue)
+        METRICS.set_gauge(QUEUE_DEPTH, queued, queue="scheduler")
+
+    def _active(self) -> list[Job]:
+        queued = [job for _, _, job in sorted(self._queue) if job.state == "queued"]
+        return ([self._running] if self._running is not None else []) + queued
+
+
+def _notify_cancelled(job: Job) -> None:
+    if job.on_cancel is None:
+        return
+    try:
+        job.on_cancel()
+    except Exception as error:  # noqa: BLE001
+        print(f"Job #{job.id} ({job.name}) cancel hook failed: {error}")
+
+
+def format_queue(jobs: list[Job]) -> str:
+    if not jobs:
+        return "Queue is empty."
+    now = time.monotonic()
+    lines = []
+    for job in jobs:
+        since = job.started_at if job.state == "running" else job.enqueued_at
+        lines.append(
+            f"#{job.id} {job.state} {job.name} "
+            f"({job.priority.name.lower()}, {(now - (since or now)) / 60:.0f} min)"
+        )
+    return "\n".join(lines)
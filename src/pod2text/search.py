@@ -0,0 +1,192 @@
+"""SQLite FTS5 full-text index over timestamped episode transcripts."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from pod2text.artifacts import FEEDS_DIRNAME, METADATA_FILENAME
+from pod2text.transcript import TRANSCRIPT_FILENAME, Transcript, format_timestamp
+
+SEARCH_DB_FILENAME = "search.sqlite"
+BLOCK_SECONDS = 30.0
+DEFAULT_LIMIT = 10
+SNIPPET_TOKENS = 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    directory TEXT NOT NULL UNIQUE,
+    feed_url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    published TEXT
+);
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY,
+    episode_id INTEGER NOT NULL REFERENCES episodes (id),
+    start REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS passages_episode ON passages (episode_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(
+    text,
+    content = 'passages',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS passages_insert AFTER INSERT ON passages BEGIN
+    INSERT INTO passages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS passages_delete AFTER DELETE ON passages BEGIN
+    INSERT INTO passages_fts (passages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+_TERM = re.compile(r"[\w-]+\*?", re.UNICODE)
+
+
+@dataclass(slots=True)
+class SearchHit:
+    title: str
+    feed_url: str
+    start: float
+    snippet: str
+    directory: str
+
+
+def search_db_path(output_dir: Path) -> Path:
+    return output_dir / SEARCH_DB_FILENAME
+
+
+def index_transcript(
+    db_path: Path,
+    directory: Path,
+    feed_url: str,
+    title: str,
+    transcript: Transcript,
+    published: str | None = None,
+) -> int:
+    """Replace the episode's passages in the index; returns the number of passages."""
+    passages = list(_passages(transcript))
+    with _connect(db_path) as connection:
+        row = connection.execute(
+            """
+            INSERT INTO episodes (directory, feed_url, title, published) VALUES (?, ?, ?, ?)
+            ON CONFLICT(directory) DO UPDATE SET
+                feed_url = excluded.feed_url,
+                title = excluded.title,
+                published = excluded.published
+            RETURNING id
+            """,
+            (str(directory.resolve()), feed_url, title, published),
+        ).fetchone()
+        episode_id = row[0]
+        connection.execute("DELETE FROM passages WHERE episode_id = ?", (episode_id,))
+        connection.executemany(
+            "INSERT INTO passages (episode_id, start, text) VALUES (?, ?, ?)",
+            [(episode_id, start, text) for start, text in passages],
+        )
+    return len(passages)
+
+
+def reindex(output_dir: Path) -> int:
+    db_path = search_db_path(output_dir)
+    count = 0
+    for transcript_path in sorted((output_dir / FEEDS_DIRNAME).glob(f"*/*/{TRANSCRIPT_FILENAME}")):
+        directory = transcript_path.parent
+        try:
+            metadata = json.loads((directory / METADATA_FILENAME).read_text(encoding="utf-8"))
+            transcript = Transcript.read_ndjson(transcript_path)
+        except (OSError, ValueError) as error:
+            print(f"Skipping {directory}: {error}")
+            continue
+        index_transcript(
+            db_path,
+            directory,
+            feed_url=str(metadata.get("feed_url", "")),
+            title=str(metadata.get("title", directory.name)),
+            transcript=transcript,
+            published=metadata.get("published"),
+        )
+        count += 1
+    return count
+
+
+def search(db_path: Path, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchHit]:
+    match = fts_query(query)
+    if not match:
+        raise ValueError("Search query has no searchable terms.")
+    if not db_path.exists():
+        return []
+
+    with closing(sqlite3.connect(db_path)) as connection:
+        rows = connection.execute(
+            f"""
+            SELECT episodes.title, episodes.feed_url, passages.start,
+                   snippet(passages_fts, 0, '*', '*', '…', {SNIPPET_TOKENS}), episodes.directory
+            FROM passages_fts
+            JOIN passages ON passages.id = passages_fts.rowid
+            JOIN episodes ON episodes.id = passages.episode_id
+            WHERE passages_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (match, limit),
+        ).fetchall()
+    return [
+        SearchHit(
+            title=title,
+            feed_url=feed_url,
+            start=float(start),
+            snippet=snippet,
+            directory=directory,
+        )
+        for title, feed_url, start, snippet, directory in rows
+    ]
+
+
+def fts_query(query: str) -> str:
+    """Turn free text into an FTS5 AND query of quoted terms; ``term*`` keeps prefix search."""
+    terms: list[str] = []
+    for term in _TERM.findall(query):
+        prefix = term.endswith("*")
+        word = term.rstrip("*").strip("-")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def format_hits(hits: list[SearchHit]) -> str:
+    if not hits:
+        return "No matching episodes."
+    return "\n\n".join(
+        f"{hit.title} [{format_timestamp(hit.start)}]\n{hit.snippet}" for hit in hits
+    )
+
+
+@contextmanager
+def _connect(db_path: Path) -> Iterator[sqlite3.Connection]:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    with closing(sqlite3.connect(db_path, timeout=30)) as connection:
+        # Workers index onto the shared output volume, where WAL's shared-memory index does
+        # not work across hosts; a write only blocks searches for one episode's rows.
+        connection.execute("PRAGMA journal_mode=DELETE")
+        connection.executescript(SCHEMA)
+        with connection:
+            yield connection
+
+
+def _passages(transcript: Transcript) -> Iterator[tuple[float, str]]:
+    index = 0
+    while index < len(transcript):
+        start = transcript.starts[index]
+        stop = index + 1
+        while stop < len(transcript) and transcript.starts[stop] < start + BLOCK_SECONDS:
+            stop += 1
+        yield start, transcript.text_slice(index, stop)
+        index = stop
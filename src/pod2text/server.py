@@ -3,29 +3,59 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
 import time
+from functools import partial
 from pathlib import Path
 from typing import Any
 
+from pod2text.artifacts import episode_artifacts
 from pod2text.env import get_telegram_bot_token, get_telegram_chat_id
-from pod2text.main import run_pipeline
-from pod2text.podcast import fetch_latest_episode, resolve_feed_url
-from pod2text.telegram import poll_go_commands, send_text
+from pod2text.main import process_episode, run_pipeline, summarize_episode
+from pod2text.metrics import stage_timer, start_metrics_server
+from pod2text.options import PipelineOptions
+from pod2text.podcast import (
+    FeedValidators,
+    fetch_episodes,
+    fetch_latest_episode,
+    poll_latest_episode,
+    resolve_feed_url,
+)
+from pod2text.resources import activate, plan_cpus
+from pod2text.scheduler import CancelToken, JobScheduler, Priority, format_queue
+from pod2text.search import format_hits, search, search_db_path
+from pod2text.telegram import poll_commands, send_text
+from pod2text.work_queue import (
+    QueuedJob,
+    WorkQueue,
+    episode_job_key,
+    episode_payload,
+    format_counts,
+    payload_episode,
+)
 
 STATE_EPISODES_KEY = "episodes"
 STATE_TELEGRAM_OFFSET_KEY = "telegram_update_offset"
+STATE_FEED_VALIDATORS_KEY = "feed_validators"
+SEARCH_REPLY_LIMIT = 5
+
+# The job thread records processed episodes while the polling loop stores the Telegram offset.
+_STATE_LOCK = threading.Lock()
 
 
 def run_server(
     podcast: str,
     output_dir: Path,
-    transcription_model: str = "small",
-    llm_model: str = "gpt-4o-mini",
-    language: str = "de",
+    options: PipelineOptions | None = None,
     interval_minutes: int = 30,
     telegram_poll_seconds: int = 5,
     state_file: Path = Path(".pod2text_state.json"),
     notify_startup: bool = True,
+    metrics_port: int = 0,
+    backfill_episodes: int = 0,
+    work_queue: Path | None = None,
+    cpu_budget: int = 0,
 ) -> None:
     if interval_minutes <= 0:
         raise ValueError("interval_minutes must be greater than zero.")
@@ -34,6 +64,11 @@ def run_server(
 
     print(f"Starting pod2text server for '{podcast}' with {interval_minutes}-minute polling.")
     print(f"State file: {state_file}")
+    if cpu_budget > 0:
+        activate(plan_cpus(cpu_budget))
+    if metrics_port > 0:
+        start_metrics_server(metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{metrics_port}/metrics")
     bot_token = get_telegram_bot_token()
     chat_id = get_telegram_chat_id()
 
@@ -44,38 +79,87 @@ def run_server(
             bot_token=bot_token,
             chat_id=chat_id,
         )
+    # scripts/deploy_docker.sh waits for this line to time container start-up.
+    print("pod2text is ready.")
+    options = options or PipelineOptions()
+
+    shared_queue = WorkQueue(work_queue) if work_queue is not None else None
+    if shared_queue is not None:
+        print(f"Transcription is left to `pod2text worker` processes on {work_queue}.")
+    scheduler = JobScheduler()
+    scheduler.start()
+    try:
+        if backfill_episodes > 0:
+            queued = queue_backfill(
+                podcast=podcast,
+                output_dir=output_dir,
+                scheduler=scheduler,
+                count=backfill_episodes,
+                options=options,
+                work_queue=shared_queue,
+            )
+            print(f"Queued {queued} older episode(s) for backfill.")
+        _poll_forever(
+            podcast=podcast,
+            output_dir=output_dir,
+            options=options,
+            interval_minutes=interval_minutes,
+            telegram_poll_seconds=telegram_poll_seconds,
+            state_file=state_file,
+            bot_token=bot_token,
+            chat_id=chat_id,
+            scheduler=scheduler,
+            work_queue=shared_queue,
+        )
+    finally:
+        scheduler.stop()
 
+
+def _poll_forever(
+    podcast: str,
+    output_dir: Path,
+    options: PipelineOptions,
+    interval_minutes: int,
+    telegram_poll_seconds: int,
+    state_file: Path,
+    bot_token: str,
+    chat_id: str,
+    scheduler: JobScheduler,
+    work_queue: WorkQueue | None = None,
+) -> None:
     next_episode_check_at = 0.0
     while True:
         try:
             go_triggered, update_offset = check_go_command_and_run(
                 podcast=podcast,
                 output_dir=output_dir,
-                transcription_model=transcription_model,
-                llm_model=llm_model,
-                language=language,
+                options=options,
                 state_file=state_file,
                 bot_token=bot_token,
                 chat_id=chat_id,
                 timeout_seconds=telegram_poll_seconds,
+                scheduler=scheduler,
+                work_queue=work_queue,
             )
             if go_triggered:
-                print("Pipeline completed after /go command.")
+                print("Queued pipeline run after /go command.")
 
             now = time.time()
             if now >= next_episode_check_at:
                 did_run = process_once(
                     podcast=podcast,
                     output_dir=output_dir,
-                    transcription_model=transcription_model,
-                    llm_model=llm_model,
-                    language=language,
+                    options=options,
                     state_file=state_file,
+                    scheduler=scheduler,
+                    work_queue=work_queue,
                 )
                 next_episode_check_at = now + interval_minutes * 60
                 if did_run:
-                    print("Pipeline completed for new episode.")
+                    print("Queued pipeline run for new episode.")
 
+            if work_queue is not None:
+                deliver_finished(work_queue, scheduler, output_dir)
             if update_offset is not None:
                 _save_telegram_update_offset(state_file, update_offset)
 
@@ -88,67 +172,269 @@ def run_server(
 def check_go_command_and_run(
     podcast: str,
     output_dir: Path,
-    transcription_model: str,
-    llm_model: str,
-    language: str,
+    options: PipelineOptions,
     state_file: Path,
     bot_token: str,
     chat_id: str,
     timeout_seconds: int,
+    scheduler: JobScheduler | None = None,
+    work_queue: WorkQueue | None = None,
 ) -> tuple[bool, int | None]:
+    """Answer pending bot commands; ``/go`` runs the pipeline, or queues it with a scheduler."""
     offset = _load_telegram_update_offset(state_file)
-    should_run, next_offset = poll_go_commands(
+    commands, next_offset = poll_commands(
         bot_token=bot_token,
         chat_id=chat_id,
         offset=offset,
         timeout_seconds=timeout_seconds,
     )
-    if not should_run:
-        return False, next_offset
-
-    print("Received /go command from Telegram. Running pipeline now.")
-    run_pipeline(
-        podcast=podcast,
-        output_dir=output_dir,
-        transcription_model=transcription_model,
-        llm_model=llm_model,
-        language=language,
-        prompt_for_key=False,
-    )
-    return True, next_offset
+    triggered = False
+    for command in commands:
+        # Commands are answered in the order they were sent, so "/go, /queue" lists the run.
+        if command.name == "go" and not triggered:
+            _answer_go(
+                podcast,
+                output_dir,
+                options,
+                bot_token=bot_token,
+                chat_id=chat_id,
+                scheduler=scheduler,
+                work_queue=work_queue,
+            )
+            triggered = True
+        elif command.name == "search":
+            _answer_search(output_dir, command.argument, bot_token=bot_token, chat_id=chat_id)
+        elif command.name == "queue" and scheduler is not None:
+            reply = format_queue(scheduler.jobs())
+            if work_queue is not None:
+                reply += "\n" + format_counts(work_queue.counts())
+            send_text(bot_token=bot_token, chat_id=chat_id, text=reply)
+        elif command.name == "cancel" and scheduler is not None:
+            _answer_cancel(scheduler, command.argument, bot_token=bot_token, chat_id=chat_id)
+    return triggered, next_offset
 
 
 def process_once(
     podcast: str,
     output_dir: Path,
-    transcription_model: str,
-    llm_model: str,
-    language: str,
+    options: PipelineOptions,
     state_file: Path,
+    scheduler: JobScheduler | None = None,
+    work_queue: WorkQueue | None = None,
 ) -> bool:
     feed_url = resolve_feed_url(podcast)
-    latest = fetch_latest_episode(feed_url)
-
     state = _load_state(state_file)
-    episodes = _get_episodes_map(state)
-    last_id = episodes.get(feed_url)
+    last_id = _get_episodes_map(state).get(feed_url)
+    # Validators are stored with the episode they describe, so a feed whose newest episode
+    # was never processed is fetched in full again.
+    validators = _get_feed_validators(state, feed_url) if last_id else None
+    with stage_timer("feed_poll"):
+        latest, fresh = poll_latest_episode(feed_url, validators)
+    if latest is None:
+        print("Feed not modified since the last poll.")
+        return False
     if last_id == latest.identifier:
         print(f"No new episode yet: {latest.title}")
+        if fresh != validators:
+            _remember_episode(state_file, feed_url, latest.identifier, fresh)
         return False
 
     print(f"New episode detected: {latest.title}")
-    run_pipeline(
+    if work_queue is not None:
+        work_queue.enqueue(
+            episode_job_key(feed_url, latest),
+            episode_payload(feed_url, latest, options),
+            Priority.NEW_EPISODE,
+        )
+        # The shared queue now owns the episode, retries included.
+        _remember_episode(state_file, feed_url, latest.identifier, fresh)
+        return True
+
+    # Only this episode is processed; refetching the feed could pick up a newer one.
+    run = partial(
+        process_episode, feed_url, latest, output_dir, options=options, prompt_for_key=False
+    )
+    remember = partial(_remember_episode, state_file, feed_url, latest.identifier, fresh)
+
+    def run_and_remember(token: CancelToken | None = None) -> None:
+        run(cancel=token)
+        remember()
+
+    if scheduler is None:
+        run_and_remember()
+    else:
+        scheduler.submit(
+            f"new: {latest.title}",
+            run_and_remember,
+            Priority.NEW_EPISODE,
+            key=f"episode:{latest.identifier}",
+            # A /cancel'led episode stays skipped instead of being queued again next poll.
+            on_cancel=remember,
+        )
+    return True
+
+
+def queue_backfill(
+    podcast: str,
+    output_dir: Path,
+    scheduler: JobScheduler,
+    count: int,
+    options: PipelineOptions,
+    work_queue: WorkQueue | None = None,
+) -> int:
+    """Queue the ``count`` episodes before the newest one that have no summary yet."""
+    feed_url = resolve_feed_url(podcast)
+    queued = 0
+    for episode in fetch_episodes(feed_url, limit=count + 1)[1:]:
+        if episode_artifacts(output_dir, feed_url, episode).summary_path.exists():
+            continue
+        queued += 1
+        if work_queue is not None:
+            work_queue.enqueue(
+                episode_job_key(feed_url, episode),
+                episode_payload(feed_url, episode, options),
+                Priority.BACKFILL,
+            )
+            continue
+        run = partial(
+            process_episode,
+            feed_url,
+            episode,
+            output_dir,
+            options=options,
+            prompt_for_key=False,
+        )
+        scheduler.submit(
+            f"backfill: {episode.title}",
+            lambda token, run=run: run(cancel=token),
+            Priority.BACKFILL,
+            # Only a resumable run can be paused cheaply: it restarts from its journal.
+            preemptible=options.resumable,
+            key=f"episode:{episode.identifier}",
+        )
+    return queued
+
+
+def deliver_finished(work_queue: WorkQueue, scheduler: JobScheduler, output_dir: Path) -> int:
+    """Summarize and post episodes that remote workers finished transcribing."""
+    submitted = 0
+    for job in work_queue.finished():
+        _, episode, _ = payload_episode(job.payload)
+        scheduler.submit(
+            f"deliver: {episode.title}",
+            partial(_deliver, work_queue, job, output_dir),
+            Priority(min(job.priority, Priority.BACKFILL)),
+            key=f"deliver:{job.id}",
+        )
+        submitted += 1
+    return submitted
+
+
+def _deliver(work_queue: WorkQueue, job: QueuedJob, output_dir: Path, token: CancelToken) -> None:
+    feed_url, episode, options = payload_episode(job.payload)
+    try:
+        token.check()
+        summary_path = summarize_episode(
+            feed_url, episode, output_dir, options=options, prompt_for_key=False
+        )
+    except Exception as error:
+        # Recorded rather than retried every poll; `/go` or the next backfill re-queues it.
+        work_queue.mark_delivered(job.id, error=f"{type(error).__name__}: {error}")
+        raise
+    work_queue.mark_delivered(job.id)
+    print(f"Delivered shared job #{job.id}: {summary_path}")
+
+
+def _answer_go(
+    podcast: str,
+    output_dir: Path,
+    options: PipelineOptions,
+    bot_token: str,
+    chat_id: str,
+    scheduler: JobScheduler | None,
+    work_queue: WorkQueue | None,
+) -> None:
+    if work_queue is not None:
+        feed_url = resolve_feed_url(podcast)
+        latest = fetch_latest_episode(feed_url)
+        job_id = work_queue.enqueue(
+            episode_job_key(feed_url, latest),
+            episode_payload(feed_url, latest, options),
+            Priority.INTERACTIVE,
+        )
+        send_text(
+            bot_token=bot_token,
+            chat_id=chat_id,
+            text=f"Queued /go for {latest.title} as shared job #{job_id}.",
+        )
+        return
+
+    run = partial(
+        run_pipeline,
         podcast=podcast,
         output_dir=output_dir,
-        transcription_model=transcription_model,
-        llm_model=llm_model,
-        language=language,
+        options=options,
         prompt_for_key=False,
     )
-    episodes[feed_url] = latest.identifier
-    state[STATE_EPISODES_KEY] = episodes
-    _save_state(state_file, state)
-    return True
+    if scheduler is None:
+        print("Received /go command from Telegram. Running pipeline now.")
+        run()
+        return
+
+    print("Received /go command from Telegram.")
+    job = scheduler.submit("/go", lambda token: run(cancel=token), Priority.INTERACTIVE, key="go")
+    jobs = scheduler.jobs()
+    ahead = jobs.index(job) if job in jobs else 0
+    send_text(
+        bot_token=bot_token,
+        chat_id=chat_id,
+        text=f"Queued /go as job #{job.id} ({ahead} job(s) ahead).",
+    )
+
+
+def _answer_search(output_dir: Path, query: str, bot_token: str, chat_id: str) -> None:
+    if not query:
+        reply = "Usage: /search <terms>"
+    else:
+        try:
+            hits = search(search_db_path(output_dir), query, limit=SEARCH_REPLY_LIMIT)
+        except (ValueError, sqlite3.Error) as error:
+            reply = f"Search failed: {error}"
+        else:
+            reply = f"Search: {query}\n\n{format_hits(hits)}"
+    send_text(bot_token=bot_token, chat_id=chat_id, text=reply)
+
+
+def _answer_cancel(scheduler: JobScheduler, argument: str, bot_token: str, chat_id: str) -> None:
+    job_id = argument.lstrip("#")
+    if job_id and not job_id.isdigit():
+        reply = "Usage: /cancel [job number]"
+    else:
+        job = scheduler.cancel(int(job_id) if job_id else None)
+        if job is None:
+            reply = "No such job." if job_id else "Nothing is running."
+        elif job.state == "running":
+            reply = f"Stopping job #{job.id} ({job.name}) at the next checkpoint."
+        else:
+            reply = f"Removed job #{job.id} ({job.name}) from the queue."
+    send_text(bot_token=bot_token, chat_id=chat_id, text=reply)
+
+
+def _remember_episode(
+    state_file: Path, feed_url: str, identifier: str, validators: FeedValidators | None = None
+) -> None:
+    with _STATE_LOCK:
+        state = _load_state(state_file)
+        episodes = _get_episodes_map(state)
+        episodes[feed_url] = identifier
+        state[STATE_EPISODES_KEY] = episodes
+        if validators is not None:
+            stored = state.setdefault(STATE_FEED_VALIDATORS_KEY, {})
+            stored[feed_url] = {
+                "etag": validators.etag,
+                "last_modified": validators.last_modified,
+            }
+        _save_state(state_file, state)
 
 
 def _load_state(state_file: Path) -> dict[str, Any]:
@@ -185,6 +471,14 @@ def _get_episodes_map(state: dict[str, Any]) -> dict[str, str]:
     return result
 
 
+def _get_feed_validators(state: dict[str, Any], feed_url: str) -> FeedValidators | None:
+    raw = state.get(STATE_FEED_VALIDATORS_KEY, {})
+    entry = raw.get(feed_url) if isinstance(raw, dict) else None
+    if not isinstance(entry, dict):
+        return None
+    return FeedValidators(entry.get("etag"), entry.get("last_modified"))
+
+
 def _load_telegram_update_offset(state_file: Path) -> int | None:
     state = _load_state(state_file)
     raw = state.get(STATE_TELEGRAM_OFFSET_KEY)
@@ -194,9 +488,10 @@ def _load_telegram_update_offset(state_file: Path) -> int | None:
 
 
 def _save_telegram_update_offset(state_file: Path, offset: int) -> None:
-    state = _load_state(state_file)
-    state[STATE_TELEGRAM_OFFSET_KEY] = offset
-    _save_state(state_file, state)
+    with _STATE_LOCK:
+        state = _load_state(state_file)
+        state[STATE_TELEGRAM_OFFSET_KEY] = offset
+        _save_state(state_file, state)
 
 
 def _send_startup_ready_message(
@@ -209,7 +504,7 @@ def _send_startup_ready_message(
         "pod2text is ready and setup.\n"
         f"Watching podcast: {podcast}\n"
         f"Polling interval: {interval_minutes} minutes\n"
-        "Send /go to trigger an immediate run."
+        "Send /go to trigger an immediate run, /queue to list jobs and /cancel to stop one."
     )
     send_text(
         bot_token=bot_token,
@@ -0,0 +1,194 @@
+"""Decode audio with ffmpeg while it is still downloading."""
+
+from __future__ import annotations
+
+import queue
+import subprocess
+import tempfile
+import threading
+
+import numpy as np
+
+from pod2text.resources import decoding, ffmpeg_threads
+
+SAMPLE_RATE = 16_000
+READ_BYTES = 1 << 16
+STDERR_TAIL_CHARS = 500
+
+
+def ffmpeg_command() -> tuple[str, ...]:
+    # Same output format as ``whisper.load_audio``, read from stdin instead of a file.
+    return (
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-threads",
+        ffmpeg_threads(),
+        "-i",
+        "pipe:0",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-",
+    )
+
+
+class StreamDecodeError(RuntimeError):
+    """Decoding from the pipe failed, e.g. for an MP4 whose index sits at the end of the file."""
+
+
+class PcmBuffer:
+    """16 kHz mono float32 samples that grow while the decoder is still producing them."""
+
+    def __init__(self, expected_seconds: float | None = None) -> None:
+        self.expected_seconds = expected_seconds
+        self._samples = np.zeros(SAMPLE_RATE * 60, dtype=np.float32)
+        self._length = 0
+        self._odd_byte = b""
+        self._finished = False
+        self._error: BaseException | None = None
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_array(cls, audio: np.ndarray) -> PcmBuffer:
+        buffer = cls()
+        buffer._samples = audio
+        buffer._length = len(audio)
+        buffer._finished = True
+        return buffer
+
+    @property
+    def seconds(self) -> float:
+        return self._length / SAMPLE_RATE
+
+    @property
+    def total_seconds(self) -> float:
+        """Best known length: exact once finished, else the feed's duration if it is larger."""
+        if self._finished:
+            return self.seconds
+        return max(self.seconds, self.expected_seconds or 0.0)
+
+    def append_pcm16(self, data: bytes) -> None:
+        data = self._odd_byte + data
+        usable = len(data) - len(data) % 2
+        self._odd_byte = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+        with self._condition:
+            needed = self._length + len(samples)
+            if needed > len(self._samples):
+                # Doubling keeps appends amortized O(1); slices handed out earlier stay valid
+                # because they point into the old array, which is never written again.
+                grown = np.empty(max(needed, len(self._samples) * 2), dtype=np.float32)
+                grown[: self._length] = self._samples[: self._length]
+                self._samples = grown
+            self._samples[self._length : needed] = samples
+            self._length = needed
+            self._condition.notify_all()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        with self._condition:
+            if self._finished:
+                return
+            self._finished = True
+            self._error = error
+            self._condition.notify_all()
+
+    def wait_for(self, seconds: float) -> tuple[float, bool]:
+        """Block until ``seconds`` of audio exist or decoding ended; returns (available, done)."""
+        target = int(seconds * SAMPLE_RATE)
+        with self._condition:
+            while not self._finished and self._length < target:
+                self._condition.wait()
+            if self._error is not None:
+                raise StreamDecodeError(str(self._error)) from self._error
+            return self.seconds, self._finished
+
+    def window(self, start: float, end: float) -> np.ndarray:
+        with self._condition:
+            stop = min(int(end * SAMPLE_RATE), self._length)
+            return self._samples[int(start * SAMPLE_RATE) : stop]
+
+
+class StreamDecoder:
+    """Feeds downloaded chunks into ``ffmpeg`` and appends its PCM output to a ``PcmBuffer``.
+
+    ``feed`` never blocks the caller (the download loop); a writer thread absorbs pipe
+    backpressure and a reader thread collects the decoded samples.
+    """
+
+    def __init__(self, pcm: PcmBuffer, command: tuple[str, ...] | list[str] | None = None):
+        self.pcm = pcm
+        self._chunks: queue.Queue[bytes | None] = queue.Queue()
+        # A file, not a pipe: nothing reads stderr until stdout ends, and a full pipe would
+        # stall the decoder.
+        self._stderr = tempfile.TemporaryFile()
+        with decoding():
+            self._process = subprocess.Popen(
+                list(command or ffmpeg_command()),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self._stderr,
+            )
+        self._aborted = False
+        self._writer = threading.Thread(target=self._write, name="decode-writer", daemon=True)
+        self._reader = threading.Thread(target=self._read, name="decode-reader", daemon=True)
+        self._writer.start()
+        self._reader.start()
+
+    def feed(self, chunk: bytes) -> None:
+        # Once the decoder has given up there is no point in buffering the rest.
+        if self._reader.is_alive():
+            self._chunks.put(chunk)
+
+    def close(self) -> None:
+        """Signal the end of the download; decoding finishes in the background."""
+        self._chunks.put(None)
+
+    def abort(self, error: BaseException) -> None:
+        self._aborted = True
+        self.pcm.finish(error)
+        self._chunks.put(None)
+        self._process.kill()
+
+    def join(self, timeout: float | None = None) -> None:
+        self._writer.join(timeout)
+        self._reader.join(timeout)
+
+    def _write(self) -> None:
+        stdin = self._process.stdin
+        assert stdin is not None
+        try:
+            while (chunk := self._chunks.get()) is not None:
+                stdin.write(chunk)
+        except (BrokenPipeError, ValueError):
+            # The decoder exited early; the reader reports why.
+            pass
+        finally:
+            try:
+                stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def _read(self) -> None:
+        stdout = self._process.stdout
+        assert stdout is not None
+        while data := stdout.read1(READ_BYTES):
+            self.pcm.append_pcm16(data)
+        code = self._process.wait()
+        with self._stderr:
+            self._stderr.seek(0)
+            stderr = self._stderr.read().decode("utf-8", errors="replace")
+        if code != 0 and not self._aborted:
+            self.pcm.finish(
+                StreamDecodeError(f"decoder exited with {code}: {stderr[-STDERR_TAIL_CHARS:]}")
+            )
+        else:
+            self.pcm.finish()
+        # Release a writer that is still waiting for chunks.
+        self._chunks.put(None)
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from openai import OpenAI
+import asyncio
+from typing import Any
+
+from pod2text.llm import get_llm_client
+from pod2text.topics import Chapter
+from pod2text.transcript import Transcript, format_timestamp
 
 SUMMARY_SYSTEM_PROMPT = """
 You summarize podcast transcripts into a clear, detailed-but-concise structure.
@@ -50,27 +55,155 @@ Style rules:
 - Use Markdown formatting to make it Telegram-friendly (short bullets, good spacing, occasional **bold** emphasis).
 """.strip()
 
+TIMESTAMP_INSTRUCTIONS = (
+    "Each transcript line starts with a [mm:ss] timestamp. Begin every chapter heading with "
+    "the timestamp where the chapter starts, e.g. `### Chapter 1 (03:15): <short title>`."
+)
+TIMESTAMP_BLOCK_SECONDS = 30.0
+
+CHAPTER_SYSTEM_PROMPT = """
+You summarize one chapter of a podcast transcript.
+
+Return EXACTLY this format, in the transcript's language:
+
+Title: <short descriptive title, max 6 words>
+- 3-5 bullets, each 1-2 sentences with a complete idea.
+
+Include key facts, arguments, examples, names, numbers and dates. Avoid filler phrases like
+"the hosts discuss" and overly generic bullets.
+""".strip()
+
+OVERVIEW_SYSTEM_PROMPT = """
+You receive chapter summaries of one podcast episode, in order.
+
+Return valid Markdown with EXACTLY this structure, in the summaries' language:
+
+## TL;DR
+- 3-5 bullets, each 1-2 sentences with concrete details (who/what/why).
 
-def summarize_transcript(transcript: str, api_key: str, model: str = "gpt-4o-mini") -> str:
-    if not transcript.strip():
+## Key Takeaways
+- 4-7 bullets with practical, memorable insights, phrased as lessons or "what this means".
+- Use **bold** emphasis sparingly to highlight key concepts or names.
+""".strip()
+DEFAULT_CHAPTER_CONCURRENCY = 4
+TAKEAWAYS_HEADING = "## Key Takeaways"
+
+
+def summarize_transcript(
+    transcript: str | Transcript,
+    api_key: str,
+    model: str = "gpt-4o-mini",
+) -> str:
+    if not _transcript_text(transcript).strip():
         raise ValueError("Cannot summarize empty transcript.")
 
-    client = OpenAI(api_key=api_key)
-    response = client.responses.create(
+    response = get_llm_client(api_key).create_response(**summary_request(transcript, model))
+    return _summary_text(response.output_text)
+
+
+async def summarize_transcript_async(
+    transcript: str | Transcript,
+    api_key: str,
+    model: str = "gpt-4o-mini",
+) -> str:
+    if not _transcript_text(transcript).strip():
+        raise ValueError("Cannot summarize empty transcript.")
+
+    response = await get_llm_client(api_key).create_response_async(
+        **summary_request(transcript, model)
+    )
+    return _summary_text(response.output_text)
+
+
+async def summarize_chapters_async(
+    chapters: list[Chapter],
+    api_key: str,
+    model: str = "gpt-4o-mini",
+    concurrency: int = DEFAULT_CHAPTER_CONCURRENCY,
+) -> str:
+    if not any(chapter.text.strip() for chapter in chapters):
+        raise ValueError("Cannot summarize empty transcript.")
+    if concurrency <= 0:
+        raise ValueError("concurrency must be greater than zero.")
+
+    client = get_llm_client(api_key)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def summarize_chapter(chapter: Chapter) -> str:
+        async with limit:
+            response = await client.create_response_async(
+                model=model,
+                input=[
+                    {"role": "system", "content": CHAPTER_SYSTEM_PROMPT},
+                    {"role": "user", "content": chapter.text},
+                ],
+                temperature=0.2,
+            )
+        return _summary_text(response.output_text)
+
+    chapter_summaries = await asyncio.gather(*(summarize_chapter(chapter) for chapter in chapters))
+    sections = [
+        _chapter_section(number, chapter, text)
+        for number, (chapter, text) in enumerate(
+            zip(chapters, chapter_summaries, strict=True), start=1
+        )
+    ]
+    response = await client.create_response_async(
         model=model,
         input=[
-            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": (
-                    "Summarize this podcast transcript into chapters.\n\n"
-                    f"Transcript:\n{transcript}"
-                ),
-            },
+            {"role": "system", "content": OVERVIEW_SYSTEM_PROMPT},
+            {"role": "user", "content": "\n\n".join(sections)},
         ],
         temperature=0.2,
     )
-    summary = response.output_text.strip()
+    overview = _summary_text(response.output_text)
+
+    tldr, _, takeaways = overview.partition(TAKEAWAYS_HEADING)
+    parts = ["# Episode Summary", tldr.strip(), "## Chapters", *sections]
+    if takeaways.strip():
+        parts.append(f"{TAKEAWAYS_HEADING}\n{takeaways.strip()}")
+    return "\n\n".join(part for part in parts if part)
+
+
+def summary_request(transcript: str | Transcript, model: str) -> dict[str, Any]:
+    return {"model": model, "input": _summary_input(transcript), "temperature": 0.2}
+
+
+def _chapter_section(number: int, chapter: Chapter, summary: str) -> str:
+    title = f"Chapter {number}"
+    bullets: list[str] = []
+    for line in summary.splitlines():
+        stripped = line.strip().lstrip("#").strip()
+        if stripped.lower().startswith("title:"):
+            title = stripped[len("title:") :].strip() or title
+        elif stripped:
+            bullets.append(stripped if stripped.startswith(("-", "*")) else f"- {stripped}")
+    heading = f"### Chapter {number} ({format_timestamp(chapter.start)}): {title}"
+    return "\n".join([heading, *bullets])
+
+
+def _summary_input(transcript: str | Transcript) -> list[dict[str, str]]:
+    instructions = "Summarize this podcast transcript into chapters."
+    if isinstance(transcript, Transcript):
+        body = transcript.timestamped_text(TIMESTAMP_BLOCK_SECONDS)
+        instructions = f"{instructions}\n{TIMESTAMP_INSTRUCTIONS}"
+    else:
+        body = transcript
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": f"{instructions}\n\nTranscript:\n{body}",
+        },
+    ]
+
+
+def _transcript_text(transcript: str | Transcript) -> str:
+    return transcript.text if isinstance(transcript, Transcript) else transcript
+
+
+def _summary_text(output_text: str) -> str:
+    summary = output_text.strip()
     if not summary:
         raise ValueError("LLM returned an empty summary.")
     return summary
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
 import time
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 
+import httpx
 import requests
 
+from pod2text import events
+from pod2text.metrics import METRICS, TELEGRAM_RETRIES
+
 SEND_RETRY_ATTEMPTS = 3
 SEND_RETRY_COOLDOWN_SECONDS = 2
 
@@ -51,18 +57,22 @@ def post_summary(
     episode_title: str | None = None,
     sent_at: datetime | None = None,
 ) -> None:
-    timestamp = sent_at or datetime.now()
-    title = episode_title.strip() if episode_title else "Unknown episode"
-    header = (
-        f"Date: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        f"Episode: {title}\n\n"
-    )
-    message = f"{header}{summary.strip()}"
-    chunks = _chunk_text(message, max_len=3900)
-    for chunk in chunks:
+    for chunk in _summary_chunks(summary, episode_title, sent_at):
         send_text(bot_token=bot_token, chat_id=chat_id, text=chunk)
 
 
+async def post_summary_async(
+    client: httpx.AsyncClient,
+    bot_token: str,
+    chat_id: str,
+    summary: str,
+    episode_title: str | None = None,
+    sent_at: datetime | None = None,
+) -> None:
+    for chunk in _summary_chunks(summary, episode_title, sent_at):
+        await send_text_async(client, bot_token=bot_token, chat_id=chat_id, text=chunk)
+
+
 def send_text(bot_token: str, chat_id: str, text: str) -> None:
     payload = {
         "chat_id": chat_id,
@@ -83,18 +93,70 @@ def send_text(bot_token: str, chat_id: str, text: str) -> None:
             last_error = error
             if attempt == SEND_RETRY_ATTEMPTS:
                 break
+            METRICS.inc(TELEGRAM_RETRIES, method="sendMessage")
+            events.record("retry", target="telegram", attempt=attempt, error=str(error))
             time.sleep(SEND_RETRY_COOLDOWN_SECONDS * attempt)
 
     if last_error is not None:
         raise last_error
 
 
+async def send_text_async(
+    client: httpx.AsyncClient,
+    bot_token: str,
+    chat_id: str,
+    text: str,
+) -> None:
+    payload = {
+        "chat_id": chat_id,
+        "text": text,
+        "disable_web_page_preview": True,
+    }
+    last_error: Exception | None = None
+
+    for attempt in range(1, SEND_RETRY_ATTEMPTS + 1):
+        try:
+            await _telegram_call_async(client, bot_token, "sendMessage", payload)
+            return
+        except (ConnectionError, RuntimeError) as error:
+            last_error = error
+            if attempt == SEND_RETRY_ATTEMPTS:
+                break
+            METRICS.inc(TELEGRAM_RETRIES, method="sendMessage")
+            events.record("retry", target="telegram", attempt=attempt, error=str(error))
+            await asyncio.sleep(SEND_RETRY_COOLDOWN_SECONDS * attempt)
+
+    if last_error is not None:
+        raise last_error
+
+
+@dataclass(slots=True)
+class BotCommand:
+    name: str
+    argument: str = ""
+
+
 def poll_go_commands(
     bot_token: str,
     chat_id: str,
     offset: int | None = None,
     timeout_seconds: int = 5,
 ) -> tuple[bool, int | None]:
+    commands, next_offset = poll_commands(
+        bot_token=bot_token,
+        chat_id=chat_id,
+        offset=offset,
+        timeout_seconds=timeout_seconds,
+    )
+    return any(command.name == "go" for command in commands), next_offset
+
+
+def poll_commands(
+    bot_token: str,
+    chat_id: str,
+    offset: int | None = None,
+    timeout_seconds: int = 5,
+) -> tuple[list[BotCommand], int | None]:
     payload: dict[str, Any] = {
         "timeout": timeout_seconds,
         "allowed_updates": ["message"],
@@ -109,9 +171,9 @@ def poll_go_commands(
         timeout_seconds=timeout_seconds + 10,
     )
     if not isinstance(updates, list):
-        return False, offset
+        return [], offset
 
-    should_run = False
+    commands: list[BotCommand] = []
     next_offset = offset
 
     for update in updates:
@@ -127,11 +189,23 @@ def poll_go_commands(
         if update_chat_id != chat_id:
             continue
 
-        text = str(message.get("text", "")).strip().lower()
-        if text.startswith("/go"):
-            should_run = True
+        command = parse_command(str(message.get("text", "")))
+        if command is not None:
+            commands.append(command)
+
+    return commands, next_offset
 
-    return should_run, next_offset
+
+def parse_command(text: str) -> BotCommand | None:
+    text = text.strip()
+    if not text.startswith("/"):
+        return None
+    head, _, argument = text[1:].partition(" ")
+    # Group chats address commands as /search@pod2text_bot.
+    name = head.split("@", 1)[0].lower()
+    if not name:
+        return None
+    return BotCommand(name=name, argument=argument.strip())
 
 
 def _telegram_call(
@@ -151,6 +225,32 @@ def _telegram_call(
         raise RuntimeError(f"Telegram {method} request failed: {type(error).__name__}") from error
 
     response.raise_for_status()
+    return _telegram_result(method, response)
+
+
+async def _telegram_call_async(
+    client: httpx.AsyncClient,
+    bot_token: str,
+    method: str,
+    payload: dict[str, Any],
+    timeout_seconds: int = 30,
+) -> Any:
+    url = f"https://api.telegram.org/bot{bot_token}/{method}"
+    try:
+        response = await client.post(url, json=payload, timeout=timeout_seconds)
+    except httpx.ConnectError as error:
+        raise ConnectionError(
+            f"Telegram {method} network error: unable to reach api.telegram.org"
+        ) from error
+    except httpx.TransportError as error:
+        raise RuntimeError(f"Telegram {method} request failed: {type(error).__name__}") from error
+
+    if response.is_error:
+        raise ValueError(f"Telegram {method} failed with HTTP {response.status_code}")
+    return _telegram_result(method, response)
+
+
+def _telegram_result(method: str, response: requests.Response | httpx.Response) -> Any:
     try:
         data = response.json()
     except ValueError as error:
@@ -162,6 +262,21 @@ def _telegram_call(
     return data.get("result")
 
 
+def _summary_chunks(
+    summary: str,
+    episode_title: str | None,
+    sent_at: datetime | None,
+) -> list[str]:
+    timestamp = sent_at or datetime.now()
+    title = episode_title.strip() if episode_title else "Unknown episode"
+    header = (
+        f"Date: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"Episode: {title}\n\n"
+    )
+    message = f"{header}{summary.strip()}"
+    return _chunk_text(message, max_len=3900)
+
+
 def _chat_name(chat: dict[str, Any]) -> str:
     for key in ("title", "username", "first_name"):
         value = str(chat.get(key, "")).strip()
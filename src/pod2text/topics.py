@@ -0,0 +1,166 @@
+"""Local TextTiling-style topic segmentation over TF-IDF vectors of transcript blocks."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from pod2text.transcript import Transcript
+
+DEFAULT_BLOCK_SECONDS = 60.0
+DEFAULT_MIN_CHAPTER_SECONDS = 240.0
+DEFAULT_MAX_CHAPTERS = 12
+COHESION_WINDOW_BLOCKS = 3
+
+STOPWORDS: dict[str, frozenset[str]] = {
+    "de": frozenset(
+        """
+        aber alle als also auch auf aus bei bin bis das dass dem den denn der des die dies diese
+        dieser doch dort durch ein eine einem einen einer eines etwas für gibt hab habe haben hat
+        hier ich ihm ihn ihr immer ist jetzt kann kein keine man mal mehr mein mich mir mit muss
+        nach nicht noch nur oder schon sehr sich sie sind so über uns und unter viel vom von vor
+        war waren warum was weil welche wenn wer werden wie wieder wir wird wo wurde zu zum zur
+        """.split()
+    ),
+    "en": frozenset(
+        """
+        about after all also and are because been but can could did does for from had has have
+        her here him his how into its just like more not now one our out really right she some
+        than that the their them then there these they this was were what when where which who
+        will with would you your
+        """.split()
+    ),
+}
+
+_WORD = re.compile(r"\w{3,}")
+
+
+@dataclass(slots=True)
+class Chapter:
+    start: float
+    end: float
+    text: str
+
+
+def segment_topics(
+    transcript: Transcript,
+    language: str = "de",
+    block_seconds: float = DEFAULT_BLOCK_SECONDS,
+    min_chapter_seconds: float = DEFAULT_MIN_CHAPTER_SECONDS,
+    max_chapters: int = DEFAULT_MAX_CHAPTERS,
+) -> list[Chapter]:
+    if block_seconds <= 0 or max_chapters <= 0:
+        raise ValueError("block_seconds and max_chapters must be greater than zero.")
+    if not len(transcript):
+        return []
+
+    block_starts = _block_starts(transcript, block_seconds)
+    boundaries = _topic_boundaries(
+        [
+            transcript.text_slice(first, stop)
+            for first, stop in zip(block_starts, [*block_starts[1:], len(transcript)], strict=True)
+        ],
+        stopwords=STOPWORDS.get(language.split("-")[0].lower(), frozenset()),
+        min_gap_blocks=max(int(min_chapter_seconds // block_seconds), 1),
+        max_chapters=max_chapters,
+    )
+
+    chapters: list[Chapter] = []
+    edges = [0, *boundaries, len(block_starts)]
+    for first, last in zip(edges, edges[1:], strict=False):
+        start_index = block_starts[first]
+        stop_index = block_starts[last] if last < len(block_starts) else len(transcript)
+        chapters.append(
+            Chapter(
+                start=transcript.starts[start_index],
+                end=transcript.ends[stop_index - 1],
+                text=transcript.text_slice(start_index, stop_index),
+            )
+        )
+    return chapters
+
+
+def _block_starts(transcript: Transcript, block_seconds: float) -> list[int]:
+    starts = np.frombuffer(transcript.starts, dtype=np.float64)
+    block_ids = np.floor((starts - starts[0]) / block_seconds).astype(np.int64)
+    return np.flatnonzero(np.diff(block_ids, prepend=-1)).tolist()
+
+
+def _topic_boundaries(
+    blocks: list[str],
+    stopwords: frozenset[str],
+    min_gap_blocks: int,
+    max_chapters: int,
+) -> list[int]:
+    """Return block indices where a new chapter starts, in ascending order."""
+    if len(blocks) < 2 * min_gap_blocks:
+        return []
+
+    vectors = _tfidf(blocks, stopwords)
+    # Cohesion across gap i (between block i - 1 and i): cosine of the summed windows each side.
+    cumulative = np.vstack([np.zeros(vectors.shape[1]), np.cumsum(vectors, axis=0)])
+    gaps = np.arange(1, len(blocks))
+    lower = np.maximum(gaps - COHESION_WINDOW_BLOCKS, 0)
+    upper = np.minimum(gaps + COHESION_WINDOW_BLOCKS, len(blocks))
+    left = cumulative[gaps] - cumulative[lower]
+    right = cumulative[upper] - cumulative[gaps]
+    norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    similarity = np.divide(
+        np.einsum("ij,ij->i", left, right), norms, out=np.zeros(len(gaps)), where=norms > 0
+    )
+
+    depth = _depth_scores(similarity)
+    padded = np.pad(similarity, 1, constant_values=np.inf)
+    valleys = (similarity <= padded[:-2]) & (similarity <= padded[2:]) & (depth > 0)
+    if not valleys.any():
+        return []
+    # TextTiling's liberal cutoff, computed over valleys only so flat stretches don't drag it down.
+    cutoff = depth[valleys].mean() - depth[valleys].std() / 2
+    chosen: list[int] = []
+    for gap_index in np.argsort(-depth, kind="stable"):
+        if len(chosen) + 1 >= max_chapters or depth[gap_index] < cutoff:
+            break
+        if not valleys[gap_index]:
+            continue
+        boundary = int(gaps[gap_index])
+        if boundary < min_gap_blocks or len(blocks) - boundary < min_gap_blocks:
+            continue
+        if all(abs(boundary - other) >= min_gap_blocks for other in chosen):
+            chosen.append(boundary)
+    return sorted(chosen)
+
+
+def _tfidf(blocks: list[str], stopwords: frozenset[str]) -> np.ndarray:
+    vocabulary: dict[str, int] = {}
+    rows: list[int] = []
+    columns: list[int] = []
+    for row, block in enumerate(blocks):
+        for word in _WORD.findall(block.lower()):
+            if word in stopwords:
+                continue
+            rows.append(row)
+            columns.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    counts = np.zeros((len(blocks), max(len(vocabulary), 1)))
+    np.add.at(counts, (np.asarray(rows, dtype=np.int64), np.asarray(columns, dtype=np.int64)), 1.0)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(blocks)) / (1 + document_frequency)) + 1.0
+    weighted = np.log1p(counts) * idf
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    return np.divide(weighted, norms, out=np.zeros_like(weighted), where=norms > 0)
+
+
+def _depth_scores(similarity: np.ndarray) -> np.ndarray:
+    # Depth of each valley: climb uphill on both sides to the nearest peak.
+    depth = np.zeros_like(similarity)
+    for index, value in enumerate(similarity):
+        left = index
+        while left > 0 and similarity[left - 1] >= similarity[left]:
+            left -= 1
+        right = index
+        while right + 1 < len(similarity) and similarity[right + 1] >= similarity[right]:
+            right += 1
+        depth[index] = (similarity[left] - value) + (similarity[right] - value)
+    return depth
@@ -2,19 +2,108 @@
 
 from __future__ import annotations
 
+import queue
+import threading
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
+from typing import TypeVar
 
+import numpy as np
 import whisper
 
+from pod2text.metrics import record_cache_lookup
+from pod2text.model_store import model_dir
+from pod2text.resources import decoding, run_in_slot
+from pod2text.transcript import Transcript
+
+_MODEL_CACHE: dict[str, whisper.Whisper] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+T = TypeVar("T")
+
+
+class ModelPool:
+    """Fixed set of loaded Whisper models; ``run`` blocks until one is free.
+
+    With ``cpu_slots`` (one core set per model), each model is only used from its own
+    long-lived thread pinned to that model's cores, so concurrent transcriptions, and the
+    OpenMP threads torch starts for them, never share a core.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        size: int = 1,
+        cpu_slots: tuple[tuple[int, ...], ...] | None = None,
+    ) -> None:
+        if size <= 0:
+            raise ValueError("Model pool size must be greater than zero.")
+        if cpu_slots is not None and len(cpu_slots) != size:
+            raise ValueError("cpu_slots needs one core set per pooled model.")
+        self.model_name = model_name
+        self.size = size
+        slots = cpu_slots or ((),) * size
+        self._models: queue.Queue[tuple[whisper.Whisper, tuple[int, ...]]] = queue.Queue()
+        self._models.put((load_model(model_name), slots[0]))
+        for slot in slots[1:]:
+            model = whisper.load_model(model_name, download_root=str(model_dir()))
+            self._models.put((model, slot))
+
+    def run(self, func: Callable[[whisper.Whisper], T]) -> T:
+        """Call ``func`` with a free model on that model's slot thread and return its result."""
+        model, cores = self._models.get()
+        try:
+            return run_in_slot(cores, partial(func, model))
+        finally:
+            self._models.put((model, cores))
+
+
+def load_model(model_name: str) -> whisper.Whisper:
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(model_name)
+        record_cache_lookup("whisper_model", model is not None)
+        if model is None:
+            model = whisper.load_model(model_name, download_root=str(model_dir()))
+            _MODEL_CACHE[model_name] = model
+        return model
+
 
 def transcribe_audio(
     audio_path: Path,
     model_name: str = "small",
     language: str = "de",
+    model: whisper.Whisper | None = None,
 ) -> str:
-    model = whisper.load_model(model_name)
-    result = model.transcribe(str(audio_path), language=language)
-    text = result.get("text", "").strip()
-    if not text:
+    return transcribe_segments(
+        audio_path, model_name=model_name, language=language, model=model
+    ).text
+
+
+def transcribe_segments(
+    audio_path: Path,
+    model_name: str = "small",
+    language: str = "de",
+    model: whisper.Whisper | None = None,
+) -> Transcript:
+    with decoding():
+        audio = whisper.load_audio(str(audio_path))
+    return transcribe_samples(audio, model_name=model_name, language=language, model=model)
+
+
+def transcribe_samples(
+    audio: np.ndarray,
+    model_name: str = "small",
+    language: str = "de",
+    model: whisper.Whisper | None = None,
+) -> Transcript:
+    """Transcribe 16 kHz mono samples, as returned by ``whisper.load_audio``."""
+    model = model or load_model(model_name)
+    result = model.transcribe(audio, language=language)
+    transcript = Transcript.from_segments(result.get("segments") or [])
+    if not transcript.text:
+        text = result.get("text", "").strip()
+        if text:
+            transcript = Transcript.from_segments([{"start": 0.0, "end": 0.0, "text": text}])
+    if not transcript.text:
         raise ValueError("Transcription returned no text.")
-    return text
+    return transcript
@@ -0,0 +1,262 @@
+"""Transcription in a recycled child process so Whisper memory never piles up in the server."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+
+from pod2text.artifacts import atomic_target
+from pod2text.metrics import METRICS
+from pod2text.resources import active_plan, apply_worker_slot
+from pod2text.transcript import Transcript
+
+DEFAULT_MAX_JOBS = 20
+DEFAULT_MAX_RSS_MB = 4096
+WORKER_RECYCLES = "pod2text_worker_recycles_total"
+WORKER_RSS_BYTES = "pod2text_worker_rss_bytes"
+STOP_TIMEOUT_SECONDS = 30
+
+ProgressCallback = Callable[[float, float], None]
+
+
+@dataclass(slots=True, frozen=True)
+class TranscriptionJob:
+    audio_path: Path
+    output_path: Path
+    model_name: str = "small"
+    language: str = "de"
+    journal_path: Path | None = None
+    window_seconds: int = 0
+
+
+JobRunner = Callable[[TranscriptionJob, ProgressCallback], Transcript]
+
+
+class TranscriptionWorker:
+    """One child process, reused across jobs until it hits ``max_jobs`` or ``max_rss_mb``.
+
+    Jobs and results cross the process boundary as paths: the child reads the audio file and
+    writes ``job.output_path``, so no audio or transcript arrays are pickled.
+    """
+
+    def __init__(
+        self,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        max_rss_mb: int = DEFAULT_MAX_RSS_MB,
+        memory_limit_mb: int = 0,
+        runner: JobRunner | None = None,
+    ) -> None:
+        if max_jobs <= 0 or max_rss_mb < 0 or memory_limit_mb < 0:
+            raise ValueError("max_jobs must be positive; memory limits must not be negative.")
+        self.max_jobs = max_jobs
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self.runner = runner or run_transcription_job
+        self.jobs_done = 0
+        self.recycles = 0
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._connection: Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    def transcribe(
+        self, job: TranscriptionJob, progress: ProgressCallback | None = None
+    ) -> Transcript:
+        with self._lock:
+            connection = self._ensure_started()
+            connection.send(job)
+            while True:
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    exit_code = self._stop(kill=True)
+                    raise RuntimeError(
+                        f"Transcription worker died (exit code {exit_code}); "
+                        "a fresh worker will take the next job."
+                    ) from None
+                if message[0] == "progress":
+                    if progress is not None:
+                        try:
+                            progress(message[1], message[2])
+                        except BaseException:
+                            # The caller gave up mid-job (e.g. cancellation); the child is
+                            # still busy, so replace it rather than wait for the job.
+                            self._stop(kill=True)
+                            raise
+                    continue
+                break
+
+            kind, detail, rss_bytes = message
+            self.jobs_done += 1
+            METRICS.set_gauge(WORKER_RSS_BYTES, rss_bytes)
+            self._recycle_if_needed(rss_bytes, failed=kind != "done")
+            if kind != "done":
+                raise RuntimeError(f"Transcription worker failed: {detail}")
+        return Transcript.read_ndjson(job.output_path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def _ensure_started(self) -> Connection:
+        if self._process is not None and self._process.is_alive() and self._connection:
+            return self._connection
+        self._stop(kill=True)
+        # Spawn, not fork: the child must not inherit the server's threads and sockets.
+        context = multiprocessing.get_context("spawn")
+        parent_end, child_end = context.Pipe()
+        plan = active_plan()
+        process = context.Process(
+            target=_worker_main,
+            args=(
+                child_end,
+                self.memory_limit_bytes,
+                self.runner,
+                plan.transcribe[0] if plan is not None else (),
+            ),
+            name="pod2text-transcriber",
+            daemon=True,
+        )
+        process.start()
+        child_end.close()
+        self._process = process
+        self._connection = parent_end
+        self.jobs_done = 0
+        print(f"Started transcription worker (pid {process.pid}).")
+        return parent_end
+
+    def _recycle_if_needed(self, rss_bytes: int, failed: bool) -> None:
+        reason = None
+        if self.jobs_done >= self.max_jobs:
+            reason = f"{self.jobs_done} jobs done"
+        elif self.max_rss_bytes and rss_bytes > self.max_rss_bytes:
+            reason = f"RSS {rss_bytes / 1e6:.0f} MB over limit"
+        elif failed and self._process is not None and not self._process.is_alive():
+            reason = "worker exited after a failure"
+        if reason is None:
+            return
+        print(f"Recycling transcription worker (pid {self.pid}): {reason}.")
+        METRICS.inc(WORKER_RECYCLES)
+        self.recycles += 1
+        self._stop()
+
+    def _stop(self, kill: bool = False) -> int | None:
+        process, connection = self._process, self._connection
+        self._process = None
+        self._connection = None
+        if connection is not None:
+            if not kill:
+                try:
+                    connection.send(None)
+                except (OSError, ValueError):
+                    pass
+            connection.close()
+        if process is None:
+            return None
+        if kill:
+            process.kill()
+        process.join(timeout=STOP_TIMEOUT_SECONDS)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        return process.exitcode
+
+
+def run_transcription_job(job: TranscriptionJob, progress: ProgressCallback) -> Transcript:
+    if job.journal_path is not None and job.window_seconds > 0:
+        from pod2text.checkpoint import transcribe_resumable
+
+        return transcribe_resumable(
+            job.audio_path,
+            job.journal_path,
+            model_name=job.model_name,
+            language=job.language,
+            window_seconds=job.window_seconds,
+            progress=progress,
+        )
+    from pod2text.transcribe import transcribe_segments
+
+    return transcribe_segments(job.audio_path, model_name=job.model_name, language=job.language)
+
+
+_WORKERS: dict[tuple[int, int, int], TranscriptionWorker] = {}
+_WORKERS_LOCK = threading.Lock()
+
+
+def shared_worker(
+    max_jobs: int = DEFAULT_MAX_JOBS,
+    max_rss_mb: int = DEFAULT_MAX_RSS_MB,
+    memory_limit_mb: int = 0,
+) -> TranscriptionWorker:
+    key = (max_jobs, max_rss_mb, memory_limit_mb)
+    with _WORKERS_LOCK:
+        worker = _WORKERS.get(key)
+        if worker is None:
+            worker = TranscriptionWorker(max_jobs, max_rss_mb, memory_limit_mb)
+            _WORKERS[key] = worker
+        return worker
+
+
+def _worker_main(
+    connection: Connection,
+    memory_limit_bytes: int,
+    runner: JobRunner,
+    cores: tuple[int, ...] = (),
+) -> None:
+    if memory_limit_bytes:
+        _limit_memory(memory_limit_bytes)
+    if cores:
+        apply_worker_slot(cores)
+
+    def report(done_seconds: float, total_seconds: float) -> None:
+        connection.send(("progress", done_seconds, total_seconds))
+
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        try:
+            transcript = runner(job, report)
+            with atomic_target(job.output_path) as tmp_path:
+                transcript.write_ndjson(tmp_path)
+        except MemoryError:
+            # The heap may be in any state now; report and let the parent start a new worker.
+            connection.send(("error", "MemoryError: worker memory limit reached", _rss_bytes()))
+            return
+        except Exception as error:  # noqa: BLE001
+            connection.send(("error", f"{type(error).__name__}: {error}", _rss_bytes()))
+        else:
+            connection.send(("done", str(job.output_path), _rss_bytes()))
+
+
+def _limit_memory(limit_bytes: int) -> None:
+    import resource
+
+    # RLIMIT_AS bounds the address space, so allocations past it raise MemoryError in the
+    # worker instead of waking the kernel OOM killer for the whole container.
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit_bytes = min(limit_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # ru_maxrss is the peak in KiB on Linux; better than nothing elsewhere.
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) * 1024
@@ -0,0 +1,191 @@
+"""Compact timestamped transcript backed by parallel arrays over one text buffer."""
+
+from __future__ import annotations
+
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+TRANSCRIPT_FILENAME = "transcript.ndjson"
+FORMAT_NAME = "pod2text-transcript"
+FORMAT_VERSION = 1
+SEPARATOR = " "
+
+
+@dataclass(slots=True, frozen=True)
+class Segment:
+    start: float
+    end: float
+    tokens: int
+    text: str
+
+
+class Transcript:
+    """Segments stored as ``starts``/``ends``/``tokens``/``offsets`` arrays plus ``text``.
+
+    Segment ``i`` covers ``text[offsets[i]:offsets[i + 1] - len(SEPARATOR)]`` (the last
+    one runs to the end of ``text``). Start times are non-decreasing, so time and text
+    lookups are binary searches.
+    """
+
+    __slots__ = ("text", "starts", "ends", "tokens", "offsets")
+
+    def __init__(
+        self,
+        text: str = "",
+        starts: array | None = None,
+        ends: array | None = None,
+        tokens: array | None = None,
+        offsets: array | None = None,
+    ) -> None:
+        self.text = text
+        self.starts = starts if starts is not None else array("d")
+        self.ends = ends if ends is not None else array("d")
+        self.tokens = tokens if tokens is not None else array("I")
+        self.offsets = offsets if offsets is not None else array("Q")
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Mapping[str, Any] | Segment]) -> Transcript:
+        transcript = cls()
+        parts: list[str] = []
+        length = 0
+        last_start = 0.0
+        for raw in segments:
+            segment = raw if isinstance(raw, Segment) else _segment_from_mapping(raw)
+            text = segment.text.strip()
+            if not text:
+                continue
+            if parts:
+                length += len(SEPARATOR)
+            start = max(segment.start, last_start)
+            transcript.starts.append(start)
+            transcript.ends.append(max(segment.end, start))
+            transcript.tokens.append(segment.tokens)
+            transcript.offsets.append(length)
+            parts.append(text)
+            length += len(text)
+            last_start = start
+        transcript.text = SEPARATOR.join(parts)
+        return transcript
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Segment]:
+        for index in range(len(self)):
+            yield self.segment(index)
+
+    @property
+    def duration(self) -> float:
+        return self.ends[-1] if len(self) else 0.0
+
+    @property
+    def token_count(self) -> int:
+        return sum(self.tokens)
+
+    def segment(self, index: int) -> Segment:
+        return Segment(
+            start=self.starts[index],
+            end=self.ends[index],
+            tokens=self.tokens[index],
+            text=self.text[self.offsets[index] : self._segment_end(index)],
+        )
+
+    def index_at_time(self, seconds: float) -> int:
+        if not len(self):
+            raise ValueError("Transcript has no segments.")
+        return max(bisect_right(self.starts, seconds) - 1, 0)
+
+    def index_at_offset(self, offset: int) -> int:
+        if not len(self):
+            raise ValueError("Transcript has no segments.")
+        return max(bisect_right(self.offsets, offset) - 1, 0)
+
+    def text_at_time(self, seconds: float) -> str:
+        return self.segment(self.index_at_time(seconds)).text
+
+    def time_at_offset(self, offset: int) -> float:
+        return self.starts[self.index_at_offset(offset)]
+
+    def text_between(self, start_seconds: float, end_seconds: float) -> str:
+        if not len(self) or end_seconds <= start_seconds:
+            return ""
+        first = self.index_at_time(start_seconds)
+        last = max(bisect_left(self.starts, end_seconds) - 1, first)
+        return self.text[self.offsets[first] : self._segment_end(last)]
+
+    def text_slice(self, first: int, stop: int) -> str:
+        if first >= stop:
+            return ""
+        return self.text[self.offsets[first] : self._segment_end(stop - 1)]
+
+    def timestamped_text(self, interval_seconds: float = 30.0) -> str:
+        lines: list[str] = []
+        index = 0
+        while index < len(self):
+            block_start = self.starts[index]
+            last = index
+            while last + 1 < len(self) and self.starts[last + 1] < block_start + interval_seconds:
+                last += 1
+            text = self.text[self.offsets[index] : self._segment_end(last)]
+            lines.append(f"[{format_timestamp(block_start)}] {text}")
+            index = last + 1
+        return "\n".join(lines)
+
+    def write_ndjson(self, path: Path) -> Path:
+        header = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "segments": len(self),
+            "duration": round(self.duration, 3),
+        }
+        lines = [json.dumps(header, ensure_ascii=False)]
+        for segment in self:
+            lines.append(
+                json.dumps(
+                    [round(segment.start, 3), round(segment.end, 3), segment.tokens, segment.text],
+                    ensure_ascii=False,
+                )
+            )
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    @classmethod
+    def read_ndjson(cls, path: Path) -> Transcript:
+        with path.open(encoding="utf-8") as file:
+            header = json.loads(file.readline() or "{}")
+            if header.get("format") != FORMAT_NAME:
+                raise ValueError(f"Not a pod2text transcript file: {path}")
+            segments = (
+                Segment(start=start, end=end, tokens=tokens, text=text)
+                for start, end, tokens, text in (json.loads(line) for line in file if line.strip())
+            )
+            return cls.from_segments(segments)
+
+    def _segment_end(self, index: int) -> int:
+        if index + 1 < len(self):
+            return self.offsets[index + 1] - len(SEPARATOR)
+        return len(self.text)
+
+
+def format_timestamp(seconds: float) -> str:
+    total = int(seconds)
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def _segment_from_mapping(raw: Mapping[str, Any]) -> Segment:
+    tokens = raw.get("tokens", 0)
+    return Segment(
+        start=float(raw.get("start", 0.0)),
+        end=float(raw.get("end", 0.0)),
+        tokens=len(tokens) if isinstance(tokens, list | tuple) else int(tokens),
+        text=str(raw.get("text", "")),
+    )
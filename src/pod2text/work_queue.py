@@ -0,0 +1,360 @@
+"""Shared SQLite job queue with leases, so transcription can run on several hosts."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from pod2text.main import process_episode
+from pod2text.metrics import METRICS, QUEUE_DEPTH
+from pod2text.options import PipelineOptions
+from pod2text.podcast import Episode
+from pod2text.scheduler import CancelToken, JobCancelled
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_POLL_SECONDS = 10.0
+DEFAULT_MAX_ATTEMPTS = 3
+WORK_QUEUE_JOBS = "pod2text_work_queue_jobs_total"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, priority, id);
+"""
+
+
+@dataclass(slots=True)
+class QueuedJob:
+    id: int
+    key: str
+    payload: dict[str, Any]
+    priority: int
+    state: str
+    attempts: int
+    worker: str | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+
+class WorkQueue:
+    """Jobs move ``queued`` -> ``leased`` -> ``done`` -> ``delivered`` (or ``failed``).
+
+    A worker holds a job only while it keeps renewing the lease; a lease that runs out (the
+    host died or lost the volume) puts the job back in the queue for the next ``claim``.
+    Every call opens its own connection, so one ``WorkQueue`` is safe to share across threads.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+
+    def enqueue(self, key: str, payload: dict[str, Any], priority: int) -> int:
+        """Queue work under ``key``; a finished or failed job with that key is queued again."""
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                """
+                INSERT INTO jobs (key, payload, priority, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    payload = excluded.payload,
+                    priority = excluded.priority,
+                    state = 'queued',
+                    attempts = 0,
+                    error = NULL,
+                    updated_at = excluded.updated_at
+                WHERE state IN ('delivered', 'failed')
+                """,
+                (key, json.dumps(payload, ensure_ascii=False), int(priority), now),
+            )
+            # A job that is still pending keeps its place but can be promoted (e.g. by /go).
+            row = connection.execute(
+                "UPDATE jobs SET priority = MIN(priority, ?) WHERE key = ? RETURNING id",
+                (int(priority), key),
+            ).fetchone()
+        return int(row[0])
+
+    def claim(
+        self,
+        worker: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> QueuedJob | None:
+        now = time.time()
+        with self._connect() as connection:
+            self._reclaim_expired(connection, now, max_attempts)
+            row = connection.execute(
+                """
+                UPDATE jobs
+                SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1,
+                    updated_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs WHERE state = 'queued' ORDER BY priority, id LIMIT 1
+                )
+                RETURNING id, key, payload, priority, state, attempts, worker, result, error
+                """,
+                (worker, now + lease_seconds, now),
+            ).fetchone()
+        if row is None:
+            return None
+        METRICS.inc(WORK_QUEUE_JOBS, status="claimed")
+        return _job(row)
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend the lease; ``False`` means it was reclaimed and may belong to someone else."""
+        return self._update_leased(
+            job_id, worker, "lease_expires = ?", (time.time() + lease_seconds,)
+        )
+
+    def complete(self, job_id: int, worker: str, result: dict[str, Any]) -> bool:
+        completed = self._update_leased(
+            job_id,
+            worker,
+            "state = 'done', lease_expires = NULL, result = ?",
+            (json.dumps(result, ensure_ascii=False),),
+        )
+        METRICS.inc(WORK_QUEUE_JOBS, status="done" if completed else "lease_lost")
+        return completed
+
+    def fail(
+        self, job_id: int, worker: str, error: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> bool:
+        failed = self._update_leased(
+            job_id,
+            worker,
+            "state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "worker = NULL, lease_expires = NULL, error = ?",
+            (max_attempts, error),
+        )
+        METRICS.inc(WORK_QUEUE_JOBS, status="failed")
+        return failed
+
+    def finished(self) -> list[QueuedJob]:
+        """Jobs whose artifacts are written and that still need summarizing and posting."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                """
+                SELECT id, key, payload, priority, state, attempts, worker, result, error
+                FROM jobs WHERE state = 'done' ORDER BY priority, id
+                """
+            ).fetchall()
+        return [_job(row) for row in rows]
+
+    def mark_delivered(self, job_id: int, error: str | None = None) -> None:
+        """Close a finished job; with ``error`` it is recorded as failed instead of retried."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+                ("failed" if error else "delivered", error, time.time(), job_id),
+            )
+
+    def counts(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> dict[str, int]:
+        with self._connect() as connection:
+            self._reclaim_expired(connection, time.time(), max_attempts)
+            rows = connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {state: count for state, count in rows}
+        METRICS.set_gauge(QUEUE_DEPTH, counts.get("queued", 0), queue="shared")
+        return counts
+
+    def _update_leased(
+        self, job_id: int, worker: str, assignments: str, values: tuple[Any, ...]
+    ) -> bool:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                f"""
+                UPDATE jobs SET {assignments}, updated_at = ?
+                WHERE id = ? AND worker = ? AND state = 'leased'
+                """,
+                (*values, time.time(), job_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def _reclaim_expired(
+        self, connection: sqlite3.Connection, now: float, max_attempts: int
+    ) -> None:
+        # A job that keeps killing its worker (OOM, segfault) must not circle the queue forever.
+        abandoned = connection.execute(
+            """
+            UPDATE jobs SET state = 'failed', worker = NULL, lease_expires = NULL,
+                error = 'lease expired', updated_at = ?
+            WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?
+            """,
+            (now, now, max_attempts),
+        ).rowcount
+        reclaimed = connection.execute(
+            """
+            UPDATE jobs SET state = 'queued', worker = NULL, lease_expires = NULL, updated_at = ?
+            WHERE state = 'leased' AND lease_expires < ?
+            """,
+            (now, now),
+        ).rowcount
+        if abandoned:
+            print(f"Gave up on {abandoned} job(s) whose lease expired on every attempt.")
+            METRICS.inc(WORK_QUEUE_JOBS, amount=abandoned, status="failed")
+        if reclaimed:
+            print(f"Reclaimed {reclaimed} job(s) with expired leases.")
+            METRICS.inc(WORK_QUEUE_JOBS, amount=reclaimed, status="reclaimed")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Rollback journal rather than WAL: WAL needs shared memory, which network
+        # file systems do not provide across hosts.
+        connection = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        with closing(connection):
+            connection.executescript(SCHEMA)
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+
+def episode_job_key(feed_url: str, episode: Episode) -> str:
+    return f"{feed_url}#{episode.identifier}"
+
+
+def episode_payload(feed_url: str, episode: Episode, options: PipelineOptions) -> dict[str, Any]:
+    return {"feed_url": feed_url, "episode": asdict(episode), "options": asdict(options)}
+
+
+def payload_episode(payload: dict[str, Any]) -> tuple[str, Episode, PipelineOptions]:
+    known = {field.name for field in fields(PipelineOptions)}
+    # Ignore options a newer scheduler knows about but this worker does not.
+    options = {name: value for name, value in payload["options"].items() if name in known}
+    return payload["feed_url"], Episode(**payload["episode"]), PipelineOptions(**options)
+
+
+def run_worker(
+    queue: WorkQueue,
+    output_dir: Path,
+    worker: str,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    once: bool = False,
+) -> int:
+    """Claim and transcribe jobs until interrupted; returns the number of jobs completed."""
+    if lease_seconds <= 0 or poll_seconds <= 0:
+        raise ValueError("lease_seconds and poll_seconds must be greater than zero.")
+    print(f"Worker {worker} polling {queue.db_path} every {poll_seconds:.0f}s.")
+    completed = 0
+    while True:
+        job = queue.claim(worker, lease_seconds, max_attempts)
+        if job is None:
+            if once:
+                return completed
+            time.sleep(poll_seconds)
+            continue
+        if _run_job(queue, job, output_dir, worker, lease_seconds, max_attempts):
+            completed += 1
+        if once:
+            return completed
+
+
+def _run_job(
+    queue: WorkQueue,
+    job: QueuedJob,
+    output_dir: Path,
+    worker: str,
+    lease_seconds: float,
+    max_attempts: int,
+) -> bool:
+    feed_url, episode, options = payload_episode(job.payload)
+    # Download, transcribe and index here; the scheduling host summarizes and posts.
+    options.defer_summary = True
+    print(f"Claimed job #{job.id} (attempt {job.attempts}): {episode.title}")
+    token = CancelToken()
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_keep_lease,
+        args=(queue, job.id, worker, lease_seconds, token, stop),
+        name=f"lease-{job.id}",
+        daemon=True,
+    )
+    heartbeat.start()
+    try:
+        processed = process_episode(
+            feed_url,
+            episode,
+            output_dir,
+            options=options,
+            prompt_for_key=False,
+            post_to_telegram=False,
+            cancel=token,
+        )
+    except JobCancelled:
+        print(f"Job #{job.id} abandoned: {token.reason}.")
+        return False
+    except Exception as error:  # noqa: BLE001
+        print(f"Job #{job.id} failed: {error}")
+        queue.fail(job.id, worker, f"{type(error).__name__}: {error}", max_attempts)
+        return False
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    if not queue.complete(job.id, worker, {"transcript_path": str(processed.transcript_path)}):
+        print(f"Job #{job.id} finished after its lease expired; another worker may redo it.")
+        return False
+    print(f"Job #{job.id} done: {processed.transcript_path}")
+    return True
+
+
+def _keep_lease(
+    queue: WorkQueue,
+    job_id: int,
+    worker: str,
+    lease_seconds: float,
+    token: CancelToken,
+    stop: threading.Event,
+) -> None:
+    while not stop.wait(lease_seconds / 3):
+        try:
+            renewed = queue.heartbeat(job_id, worker, lease_seconds)
+        except sqlite3.Error as error:
+            # A busy or briefly unreachable volume: the lease has slack for two more tries.
+            print(f"Lease heartbeat for job #{job_id} failed: {error}")
+            continue
+        if not renewed:
+            token.cancel("lease lost")
+            return
+
+
+def _job(row: tuple[Any, ...]) -> QueuedJob:
+    job_id, key, payload, priority, state, attempts, worker, result, error = row
+    return QueuedJob(
+        id=job_id,
+        key=key,
+        payload=json.loads(payload),
+        priority=priority,
+        state=state,
+        attempts=attempts,
+        worker=worker,
+        result=json.loads(result) if result else None,
+        error=error,
+    )
+
+
+def format_counts(counts: dict[str, int]) -> str:
+    order = ("queued", "leased", "done", "delivered", "failed")
+    parts = [f"{counts.get(state, 0)} {state}" for state in order if counts.get(state)]
+    return "Shared queue: " + (", ".join(parts) if parts else "empty") + "."
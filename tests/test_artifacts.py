@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pod2text.artifacts import (
+    atomic_target,
+    episode_artifacts,
+    prune_audio,
+    update_latest_links,
+)
+from pod2text.podcast import Episode
+
+
+def _episode(identifier: str) -> Episode:
+    return Episode(
+        identifier=identifier,
+        title=f"Episode {identifier}",
+        audio_url=f"https://cdn.example.com/{identifier}.mp3",
+    )
+
+
+def test_episode_artifacts_are_stable_per_feed_and_episode(tmp_path: Path) -> None:
+    first = episode_artifacts(tmp_path, "https://feed.example.com", _episode("ep-1"))
+    again = episode_artifacts(tmp_path, "https://feed.example.com", _episode("ep-1"))
+    other = episode_artifacts(tmp_path, "https://feed.example.com", _episode("ep-2"))
+
+    assert first.directory == again.directory
+    assert first.directory != other.directory
+    assert first.feed_key == other.feed_key
+    metadata = json.loads(first.metadata_path.read_text(encoding="utf-8"))
+    assert metadata["identifier"] == "ep-1"
+
+
+def test_update_latest_links_keeps_legacy_paths_working(tmp_path: Path) -> None:
+    (tmp_path / "latest_episode.m4a").write_bytes(b"old")
+    artifacts = episode_artifacts(tmp_path, "https://feed.example.com", _episode("ep-1"))
+    audio = artifacts.directory / "audio.mp3"
+    audio.write_bytes(b"new")
+    artifacts.summary_path.write_text("# Summary", encoding="utf-8")
+
+    update_latest_links(artifacts, audio)
+
+    assert (tmp_path / "latest").resolve() == artifacts.directory.resolve()
+    assert (tmp_path / "summary.md").read_text(encoding="utf-8") == "# Summary"
+    assert (tmp_path / "latest_episode.mp3").read_bytes() == b"new"
+    assert not (tmp_path / "latest_episode.m4a").exists()
+
+
+def test_prune_audio_keeps_newest_and_latest(tmp_path: Path) -> None:
+    feed = "https://feed.example.com"
+    directories = []
+    for index in range(4):
+        artifacts = episode_artifacts(tmp_path, feed, _episode(f"ep-{index}"))
+        metadata = json.loads(artifacts.metadata_path.read_text(encoding="utf-8"))
+        metadata["created_at"] = f"2026-01-0{index + 1}T00:00:00+00:00"
+        artifacts.metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+        (artifacts.directory / "audio.mp3").write_bytes(b"x")
+        directories.append(artifacts)
+    update_latest_links(directories[0], directories[0].directory / "audio.mp3")
+
+    removed = prune_audio(tmp_path, keep_per_feed=2)
+
+    assert sorted(removed) == [directories[1].directory / "audio.mp3"]
+    assert directories[0].find_audio() is not None
+    assert directories[3].find_audio() is not None
+
+
+def test_atomic_target_leaves_original_on_failure(tmp_path: Path) -> None:
+    target = tmp_path / "summary.md"
+    target.write_text("original", encoding="utf-8")
+
+    with pytest.raises(RuntimeError), atomic_target(target) as tmp_file:
+        tmp_file.write_text("partial", encoding="utf-8")
+        raise RuntimeError("boom")
+
+    assert target.read_text(encoding="utf-8") == "original"
+    assert list(tmp_path.iterdir()) == [target]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from pod2text.artifacts import episode_artifacts
+from pod2text.audio_store import AudioStore
+from pod2text.podcast import Episode
+
+
+def _store_audio(output_dir: Path, identifier: str, size: int, mtime: int) -> Path:
+    episode = Episode(identifier=identifier, title=identifier, audio_url="https://x/a.mp3")
+    artifacts = episode_artifacts(output_dir, "https://feed.example.com", episode)
+    audio = artifacts.directory / "audio.mp3"
+    audio.write_bytes(b"x" * size)
+    os.utime(audio, (mtime, mtime))
+    return audio
+
+
+def test_lookup_records_hits_and_misses(tmp_path: Path) -> None:
+    store = AudioStore(tmp_path)
+    episode = Episode(identifier="ep-1", title="Episode", audio_url="https://x/a.mp3")
+    artifacts = episode_artifacts(tmp_path, "https://feed.example.com", episode)
+
+    assert store.lookup(artifacts) is None
+    (artifacts.directory / "audio.mp3").write_bytes(b"audio")
+    assert store.lookup(artifacts) == artifacts.directory / "audio.mp3"
+
+    stats = store.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_evict_removes_least_recently_used_until_under_budget(tmp_path: Path) -> None:
+    oldest = _store_audio(tmp_path, "ep-1", size=100, mtime=1_000)
+    middle = _store_audio(tmp_path, "ep-2", size=100, mtime=2_000)
+    newest = _store_audio(tmp_path, "ep-3", size=100, mtime=3_000)
+    store = AudioStore(tmp_path, budget_bytes=150)
+
+    removed = store.evict(protect={oldest})
+
+    assert removed == [middle, newest]
+    assert oldest.exists()
+    stats = store.stats()
+    assert stats.evictions == 2
+    assert stats.stored_bytes == 100
+
+
+def test_recompress_replaces_original_with_opus(tmp_path: Path, monkeypatch) -> None:
+    audio = _store_audio(tmp_path, "ep-1", size=1_000, mtime=1_000)
+
+    def fake_run(command: list[str], check: bool) -> None:
+        assert check is True
+        assert "libopus" in command
+        Path(command[-1]).write_bytes(b"o" * 100)
+
+    monkeypatch.setattr("pod2text.audio_store.shutil.which", lambda _: "/usr/bin/ffmpeg")
+    monkeypatch.setattr("pod2text.audio_store.subprocess.run", fake_run)
+
+    store = AudioStore(tmp_path)
+    compressed = store.recompress(audio)
+
+    assert compressed == audio.with_suffix(".opus")
+    assert compressed.stat().st_size == 100
+    assert not audio.exists()
+    assert store.stats().recompression_saved_bytes == 900
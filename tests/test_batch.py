@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from pod2text.artifacts import episode_artifacts
+from pod2text.batch import collect_batch_items, read_opml, run_batch
+from pod2text.llm_batch import LocalBatchBackend
+from pod2text.main import EpisodeResult
+from pod2text.options import PipelineOptions
+from pod2text.podcast import Episode
+from pod2text.transcript import Transcript
+
+
+def test_read_opml_collects_unique_feed_urls(tmp_path: Path) -> None:
+    opml = tmp_path / "feeds.opml"
+    opml.write_text(
+        """<?xml version="1.0"?>
+<opml version="2.0"><body>
+  <outline text="News">
+    <outline text="A" type="rss" xmlUrl="https://a.example.com/feed.xml"/>
+    <outline text="B" type="rss" xmlUrl="https://b.example.com/feed.xml"/>
+    <outline text="A again" type="rss" xmlUrl="https://a.example.com/feed.xml"/>
+  </outline>
+</body></opml>""",
+        encoding="utf-8",
+    )
+
+    assert read_opml(opml) == [
+        "https://a.example.com/feed.xml",
+        "https://b.example.com/feed.xml",
+    ]
+
+
+def test_collect_batch_items_handles_feeds_and_direct_episodes(monkeypatch) -> None:
+    def fake_fetch_episodes(feed_url: str, limit: int | None = None) -> list[Episode]:
+        assert limit == 2
+        return [
+            Episode(identifier=f"{feed_url}#{index}", title=str(index), audio_url="x")
+            for index in range(limit)
+        ]
+
+    monkeypatch.setattr("pod2text.batch.fetch_episodes", fake_fetch_episodes)
+
+    items = collect_batch_items(
+        ["https://feed.example.com/rss", "https://cdn.example.com/Folge%2042.mp3"],
+        episodes_per_feed=2,
+    )
+
+    assert [item.episode.title for item in items] == ["0", "1", "Folge 42"]
+    assert items[2].episode.audio_url == "https://cdn.example.com/Folge%2042.mp3"
+
+
+def test_run_batch_shares_model_pool_and_reports_failures(monkeypatch, tmp_path: Path) -> None:
+    pools: list[object] = []
+
+    class FakePool:
+        def __init__(self, model_name: str, size: int, cpu_slots: object = None) -> None:
+            assert (model_name, size, cpu_slots) == ("tiny", 2, None)
+            pools.append(self)
+
+    seen_pools: list[object] = []
+
+    def fake_process_episode(**kwargs: object) -> EpisodeResult:
+        seen_pools.append(kwargs["model_pool"])
+        episode = kwargs["episode"]
+        assert isinstance(episode, Episode)
+        if episode.identifier == "bad":
+            raise ValueError("broken audio")
+        audio = tmp_path / f"{episode.title}.mp3"
+        audio.write_bytes(b"x" * 10)
+        return EpisodeResult(audio, tmp_path / "transcript.ndjson", tmp_path / "summary.md")
+
+    monkeypatch.setattr("pod2text.batch.ModelPool", FakePool)
+    monkeypatch.setattr("pod2text.batch.process_episode", fake_process_episode)
+
+    items = collect_batch_items(
+        ["https://cdn.example.com/good.mp3", "https://cdn.example.com/other.mp3"]
+    )
+    items[1].episode.identifier = "bad"
+    report = run_batch(
+        items,
+        output_dir=tmp_path,
+        options=PipelineOptions(transcription_model="tiny"),
+        transcribe_workers=2,
+    )
+
+    assert len(pools) == 1
+    assert seen_pools == [pools[0], pools[0]]
+    assert (report.succeeded, report.failed) == (1, 1)
+    assert report.audio_bytes == 10
+    assert report.items[1].error == "ValueError: broken audio"
+
+
+def test_run_batch_summarizes_through_llm_batch(monkeypatch, tmp_path: Path) -> None:
+    class FakePool:
+        def __init__(self, model_name: str, size: int, cpu_slots: object = None) -> None:
+            pass
+
+    def fake_process_episode(**kwargs: Any) -> EpisodeResult:
+        assert kwargs["options"].defer_summary
+        assert kwargs["post_to_telegram"] is False
+        artifacts = episode_artifacts(tmp_path, kwargs["feed_url"], kwargs["episode"])
+        audio = artifacts.directory / "audio.mp3"
+        audio.write_bytes(b"x")
+        transcript = artifacts.directory / "transcript.ndjson"
+        segments = [{"start": 0.0, "end": 1.0, "text": kwargs["episode"].title}]
+        Transcript.from_segments(segments).write_ndjson(transcript)
+        return EpisodeResult(audio, transcript, None)
+
+    posted: list[tuple[str | None, str]] = []
+    monkeypatch.setattr("pod2text.batch.ModelPool", FakePool)
+    monkeypatch.setattr("pod2text.batch.process_episode", fake_process_episode)
+    monkeypatch.setattr("pod2text.batch.get_telegram_bot_token", lambda: "token")
+    monkeypatch.setattr("pod2text.batch.get_telegram_chat_id", lambda: "chat")
+    monkeypatch.setattr(
+        "pod2text.batch.post_summary",
+        lambda **kwargs: posted.append((kwargs["episode_title"], kwargs["summary"])),
+    )
+
+    items = collect_batch_items(
+        ["https://cdn.example.com/alpha.mp3", "https://cdn.example.com/beta.mp3"]
+    )
+    report = run_batch(
+        items, output_dir=tmp_path, llm_batch=LocalBatchBackend(tmp_path / "llm"), poll_seconds=0
+    )
+
+    assert (report.succeeded, report.failed) == (2, 0)
+    assert [title for title, _ in posted] == ["alpha", "beta"]
+    summary_path = Path(report.items[0].summary_path or "")
+    assert summary_path.name == "summary.md"
+    assert "alpha" in summary_path.read_text(encoding="utf-8")
+
+
+def test_run_batch_reports_llm_batch_backend_failures_per_item(monkeypatch, tmp_path: Path) -> None:
+    class FakePool:
+        def __init__(self, model_name: str, size: int, cpu_slots: object = None) -> None:
+            pass
+
+    def fake_process_episode(**kwargs: Any) -> EpisodeResult:
+        artifacts = episode_artifacts(tmp_path, kwargs["feed_url"], kwargs["episode"])
+        transcript = artifacts.directory / "transcript.ndjson"
+        segments = [{"start": 0.0, "end": 1.0, "text": kwargs["episode"].title}]
+        Transcript.from_segments(segments).write_ndjson(transcript)
+        return EpisodeResult(artifacts.directory / "audio.mp3", transcript, None)
+
+    class BrokenBackend(LocalBatchBackend):
+        def submit(self, input_path: Path) -> str:
+            raise RuntimeError("batch API unavailable")
+
+    monkeypatch.setattr("pod2text.batch.ModelPool", FakePool)
+    monkeypatch.setattr("pod2text.batch.process_episode", fake_process_episode)
+
+    items = collect_batch_items(["https://cdn.example.com/alpha.mp3"])
+    report = run_batch(
+        items, output_dir=tmp_path, llm_batch=BrokenBackend(tmp_path / "llm"), poll_seconds=0
+    )
+
+    assert (report.succeeded, report.failed) == (0, 1)
+    assert report.items[0].error == "LLM batch: RuntimeError: batch API unavailable"
+    assert report.items[0].transcript_path is not None
+    assert report.items[0].summary_path is None
+
+
+def test_run_batch_cleans_each_llm_batch_item_in_its_own_language(
+    monkeypatch, tmp_path: Path
+) -> None:
+    class FakePool:
+        def __init__(self, model_name: str, size: int, cpu_slots: object = None) -> None:
+            pass
+
+    def fake_process_episode(**kwargs: Any) -> EpisodeResult:
+        artifacts = episode_artifacts(tmp_path, kwargs["feed_url"], kwargs["episode"])
+        if kwargs["episode"].title == "alpha":
+            artifacts.update_metadata(language="en")
+        transcript = artifacts.directory / "transcript.ndjson"
+        segments = [{"start": 0.0, "end": 1.0, "text": kwargs["episode"].title}]
+        Transcript.from_segments(segments).write_ndjson(transcript)
+        return EpisodeResult(artifacts.directory / "audio.mp3", transcript, None)
+
+    cleaned: list[str] = []
+
+    def fake_clean(transcript: Transcript, language: str, drop_ads: bool) -> tuple[str, None]:
+        cleaned.append(language)
+        return transcript.text, None
+
+    monkeypatch.setattr("pod2text.batch.ModelPool", FakePool)
+    monkeypatch.setattr("pod2text.batch.process_episode", fake_process_episode)
+    monkeypatch.setattr("pod2text.llm_batch.clean_transcript", fake_clean)
+
+    items = collect_batch_items(
+        ["https://cdn.example.com/alpha.mp3", "https://cdn.example.com/beta.mp3"]
+    )
+    run_batch(
+        items,
+        output_dir=tmp_path,
+        options=PipelineOptions(language="auto"),
+        post_to_telegram=False,
+        llm_batch=LocalBatchBackend(tmp_path / "llm"),
+        poll_seconds=0,
+    )
+
+    # beta has no recorded language and its feed none cached: the fallback applies.
+    assert cleaned == ["en", "de"]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from pod2text.checkpoint import SAMPLE_RATE, read_journal, transcribe_windows
+
+HEADER = {"format": "pod2text-journal", "audio": "audio.mp3", "window_seconds": 10}
+
+
+class FakeModel:
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.calls: list[tuple[int, str | None]] = []
+        self.fail_after = fail_after
+
+    def transcribe(self, audio: np.ndarray, language: str, initial_prompt: str | None) -> Any:
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise RuntimeError("killed")
+        self.calls.append((len(audio), initial_prompt))
+        half = len(audio) / SAMPLE_RATE / 2
+        call = len(self.calls)
+        return {
+            "segments": [
+                {"start": 0.0, "end": half, "tokens": [1, 2], "text": f" w{call}a"},
+                {"start": half, "end": half * 2, "tokens": [3], "text": f" w{call}b"},
+            ]
+        }
+
+
+def _audio(seconds: int) -> np.ndarray:
+    return np.zeros(seconds * SAMPLE_RATE, dtype=np.float32)
+
+
+def test_transcribe_windows_resumes_from_journal(tmp_path: Path) -> None:
+    journal = tmp_path / "journal.ndjson"
+    progress: list[float] = []
+
+    def report(done: float, total: float) -> None:
+        progress.append(done)
+
+    with pytest.raises(RuntimeError):
+        transcribe_windows(_audio(30), journal, FakeModel(fail_after=1), "de", 10, HEADER, report)
+    offset, segments = read_journal(journal, HEADER)
+    # The second half of window one sits on the edge and is carried over.
+    assert offset == 5.0
+    assert [segment.text for segment in segments] == ["w1a"]
+
+    model = FakeModel()
+    transcript = transcribe_windows(_audio(30), journal, model, "de", 10, HEADER, report)
+
+    assert model.calls[0] == (10 * SAMPLE_RATE, "w1a")
+    assert transcript.starts[0] == 0.0
+    assert transcript.duration == 30.0
+    assert progress == [5.0, 10.0, 15.0, 20.0, 30.0]
+
+
+def test_read_journal_drops_torn_line_and_rejects_other_runs(tmp_path: Path) -> None:
+    journal = tmp_path / "journal.ndjson"
+    record = {"offset": 10.0, "segments": [[0.0, 10.0, 3, "hallo"]]}
+    journal.write_text(
+        json.dumps(HEADER) + "\n" + json.dumps(record) + "\n" + '{"offset": 2',
+        encoding="utf-8",
+    )
+
+    offset, segments = read_journal(journal, HEADER)
+
+    assert offset == 10.0
+    assert segments[0].text == "hallo"
+    assert journal.read_text(encoding="utf-8").count("\n") == 2
+    assert read_journal(journal, {**HEADER, "window_seconds": 60}) == (0.0, [])
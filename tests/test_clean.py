@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pod2text.clean import clean_transcript
+from pod2text.transcript import Transcript
+
+
+def _segment(start: float, text: str, tokens: int = 10) -> dict[str, object]:
+    return {"start": start, "end": start + 1.0, "tokens": list(range(tokens)), "text": text}
+
+
+def test_clean_transcript_removes_fillers_and_repetitions() -> None:
+    transcript = Transcript.from_segments(
+        [
+            _segment(0.0, "Äh, also, wir wir wir reden heute, ähm, über die die Wahl.", 20),
+            _segment(1.0, "[Musik]"),
+            _segment(2.0, "Das ist gut, ne, oder? Das ist gut, ne, oder?"),
+            _segment(3.0, "Untertitel im Auftrag des ZDF, 2021"),
+            _segment(4.0, "Danke."),
+            _segment(5.0, "Danke."),
+        ]
+    )
+
+    cleaned, report = clean_transcript(transcript, language="de")
+
+    assert [segment.text for segment in cleaned] == [
+        "wir reden heute, über die die Wahl.",
+        "Das ist gut, oder?",
+        "Danke.",
+    ]
+    assert cleaned.starts.tolist() == [0.0, 2.0, 4.0]
+    assert report.segments_dropped == 3
+    assert report.tokens_before == 70
+    assert 0 < report.tokens_after < report.tokens_before
+
+
+def test_clean_transcript_drops_ads_only_when_asked() -> None:
+    text = "Diese Folge wird präsentiert von Acme. Mit dem Code POD gibt es Rabatt."
+
+    kept, _ = clean_transcript(text, language="de")
+    dropped, report = clean_transcript(text, language="de", drop_ads=True)
+
+    assert kept == text
+    assert dropped == ""
+    assert report.tokens_removed == report.tokens_before
+
+
+def test_clean_transcript_uses_language_specific_fillers() -> None:
+    cleaned, report = clean_transcript("Er sagt, hm, dass er kommt.", language="de")
+
+    assert cleaned == "Er sagt, dass er kommt."
+    assert report.fillers_removed == 1
+
+
+def test_clean_transcript_keeps_words_when_the_language_has_no_filler_list() -> None:
+    sentence = "Er kommt um acht Uhr, ah, und er geht um neun."
+
+    for language in ("auto", "nl"):
+        cleaned, report = clean_transcript(sentence, language=language)
+        assert cleaned == sentence
+        assert report.fillers_removed == 0
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from pod2text.events import (
+    EVENTS_FILENAME,
+    EventJournal,
+    close_journal,
+    compare_windows,
+    episode_scope,
+    format_comparison,
+    format_journal,
+    in_window,
+    open_journal,
+    parse_window,
+    read_events,
+)
+from pod2text.metrics import stage_timer
+
+
+@pytest.fixture
+def journal(tmp_path: Path) -> Iterator[Path]:
+    open_journal(tmp_path)
+    yield tmp_path / EVENTS_FILENAME
+    close_journal()
+
+
+def _stage_end(ts: str, stage: str, seconds: float, episode: str = "ep") -> dict[str, object]:
+    return {"ts": ts, "event": "stage_end", "episode": episode, "stage": stage, "seconds": seconds}
+
+
+def test_journal_rotates_by_size_and_reads_back_in_order(tmp_path: Path) -> None:
+    path = tmp_path / EVENTS_FILENAME
+    journal = EventJournal(path, max_bytes=400, backups=2)
+
+    for index in range(20):
+        journal.write("cache", cache="audio", hit=index % 2 == 0, index=index)
+
+    assert sorted(file.name for file in tmp_path.iterdir()) == [
+        EVENTS_FILENAME,
+        f"{EVENTS_FILENAME}.1",
+        f"{EVENTS_FILENAME}.2",
+    ]
+    assert all(file.stat().st_size <= 400 for file in tmp_path.iterdir())
+    indexes = [event["index"] for event in read_events(path)]
+    assert indexes == list(range(20 - len(indexes), 20))
+
+
+def test_stage_events_carry_the_episode_into_executor_threads(journal: Path) -> None:
+    def blocking() -> None:
+        with stage_timer("transcribe"):
+            pass
+
+    async def run() -> None:
+        with episode_scope("episode-1"), ThreadPoolExecutor(1) as executor:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(executor, contextvars.copy_context().run, blocking)
+        with pytest.raises(RuntimeError), stage_timer("summarize"):
+            raise RuntimeError("boom")
+
+    asyncio.run(run())
+
+    lines = [json.loads(line) for line in journal.read_text(encoding="utf-8").splitlines()]
+    assert [(event["event"], event["stage"], event.get("episode")) for event in lines] == [
+        ("stage_start", "transcribe", "episode-1"),
+        ("stage_end", "transcribe", "episode-1"),
+        ("stage_start", "summarize", None),
+        ("stage_end", "summarize", None),
+    ]
+    assert [lines[1]["ok"], lines[3]["ok"]] == [True, False]
+
+
+def test_report_and_window_comparison_flag_slower_stages() -> None:
+    recorded = [
+        _stage_end(f"2026-10-0{day}T12:00:00.000+00:00", "transcribe", seconds, f"ep{day}")
+        for day, seconds in [(1, 100.0), (2, 110.0), (3, 105.0), (6, 180.0), (7, 170.0)]
+    ]
+    recorded += [
+        _stage_end("2026-10-02T12:01:00.000+00:00", "summarize", 20.0),
+        _stage_end("2026-10-07T12:01:00.000+00:00", "summarize", 21.0),
+        {
+            "ts": "2026-10-07T12:02:00.000+00:00",
+            "event": "episode_end",
+            "episode": "ep7",
+            "title": "Slow one",
+            "status": "ok",
+            "seconds": 191.0,
+        },
+    ]
+
+    report = format_journal(recorded)
+    changes = compare_windows(
+        in_window(recorded, *parse_window("2026-10-01..2026-10-05")),
+        in_window(recorded, *parse_window("2026-10-05..")),
+    )
+
+    assert "transcribe          5" in report
+    assert "Slow one" in report
+    assert [(change.stage, change.regressed) for change in changes] == [
+        ("summarize", False),
+        ("transcribe", True),
+    ]
+    assert changes[1].change == pytest.approx(170.0 / 105.0 - 1)
+    assert "regression" in format_comparison(changes)
+    with pytest.raises(ValueError):
+        parse_window("2026-10-01")
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+
+from pod2text.artifacts import episode_artifacts
+from pod2text.fingerprint import (
+    Fingerprint,
+    audio_bits,
+    find_duplicate,
+    fingerprint_db_path,
+    record_fingerprint,
+)
+from pod2text.podcast import Episode
+
+SAMPLE_RATE = 16000
+
+
+def _speech_like(seed: int, seconds: int = 60) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    envelope = np.repeat(rng.random(seconds * 10) ** 3, SAMPLE_RATE // 10)
+    return (rng.standard_normal(seconds * SAMPLE_RATE) * envelope * 0.3).astype(np.float32)
+
+
+def _record(tmp_path: Path, identifier: str, fingerprint: Fingerprint) -> str:
+    episode = Episode(identifier, identifier, f"https://cdn.example.com/{identifier}.mp3")
+    artifacts = episode_artifacts(tmp_path, "https://feed.example.com/rss", episode)
+    record_fingerprint(fingerprint_db_path(tmp_path), artifacts, "feed", episode, fingerprint)
+    return artifacts.directory.relative_to(tmp_path).as_posix()
+
+
+def test_audio_bits_survive_gain_and_noise_but_not_other_audio() -> None:
+    samples = _speech_like(0)
+    noise = np.random.default_rng(1).standard_normal(len(samples)).astype(np.float32)
+
+    bits, count = audio_bits(samples)
+    reencoded, _ = audio_bits(samples * 0.7 + noise * 0.003)
+    other, _ = audio_bits(_speech_like(2))
+
+    assert count == 599
+    assert (bits ^ reencoded).bit_count() / count < 0.02
+    assert (bits ^ other).bit_count() / count > 0.3
+
+
+def test_find_duplicate_matches_etag_or_audio_with_length_or_duration(tmp_path: Path) -> None:
+    db_path = fingerprint_db_path(tmp_path)
+    bits, count = audio_bits(_speech_like(0))
+    original = _record(
+        tmp_path,
+        "original",
+        Fingerprint('"abc"', 48_000_000, 1800.0, bits, count),
+    )
+    rng = random.Random(0)
+    with closing(sqlite3.connect(db_path)) as connection, connection:
+        connection.executemany(
+            "INSERT INTO fingerprints VALUES (?, 'feed', ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    f"feeds/other/{index}",
+                    str(index),
+                    str(index),
+                    f'"{index}"',
+                    rng.randrange(10**6, 10**8),
+                    rng.uniform(300, 3600),
+                    format(rng.getrandbits(count), "x"),
+                    count,
+                )
+                for index in range(5000)
+            ],
+        )
+
+    etag = find_duplicate(db_path, Fingerprint(etag='"abc"', length=48_000_000))
+    assert etag is not None and (etag.directory, etag.reason) == (original, "etag")
+
+    # Re-encoded elsewhere: other ETag and size, same audio and (nearly) the same duration.
+    reencoded = Fingerprint('"xyz"', 30_000_000, 1801.5, bits ^ 0b1011, count)
+    audio = find_duplicate(db_path, reencoded)
+    assert audio is not None and audio.directory == original and audio.reason == "audio"
+    assert 0 < audio.bit_error < 0.01
+
+    # Only the opening matches (a show's intro): different length and duration.
+    assert find_duplicate(db_path, Fingerprint(None, 20_000_000, 900.0, bits, count)) is None
+    assert find_duplicate(db_path, reencoded, exclude=original) is None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pod2text.jingles import (
+    JINGLE_REPORT_FILENAME,
+    JingleSpan,
+    cut_spans,
+    load_library,
+    restore_times,
+    strip_jingles,
+    transcribe_without_jingles,
+)
+from pod2text.transcript import Transcript
+
+SAMPLE_RATE = 16000
+
+
+def _speech_like(seconds: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    envelope = np.repeat(rng.random(int(seconds * 10)) ** 3, SAMPLE_RATE // 10)
+    return (rng.standard_normal(len(envelope)) * envelope * 0.3).astype(np.float32)
+
+
+def _jingle() -> np.ndarray:
+    time = np.arange(int(0.4 * SAMPLE_RATE)) / SAMPLE_RATE
+    notes = [
+        sum(np.sin(2 * np.pi * pitch * harmonic * time) / harmonic for harmonic in range(1, 6))
+        * np.exp(-3 * time)
+        for pitch in [262, 330, 392, 523, 440, 349, 294, 392] * 2
+    ]
+    return (0.2 * np.concatenate(notes)).astype(np.float32)
+
+
+def _episode(seed: int, jingle_at: float) -> np.ndarray:
+    jingle = _jingle()
+    noise = np.random.default_rng(seed + 100).standard_normal(len(jingle)) * 0.002
+    return np.concatenate(
+        [
+            _speech_like(jingle_at, seed),
+            (jingle * 0.8 + noise).astype(np.float32),
+            _speech_like(40.0, seed + 50),
+        ]
+    )
+
+
+def test_recurring_jingle_is_learned_and_cut_from_later_episodes(tmp_path: Path) -> None:
+    library = tmp_path / "jingles.npz"
+
+    _, _, first = strip_jingles(_episode(0, 10.0), library)
+    _, _, second = strip_jingles(_episode(1, 21.3331), library)
+    episode = _episode(2, 5.12345)
+    kept, pieces, third = strip_jingles(episode, library)
+
+    assert (first.learned, len(first.spans)) == (0, 0)
+    assert second.learned == 1
+    assert second.spans[0].start == pytest.approx(21.33, abs=0.5)
+    assert (third.learned, len(third.spans)) == (0, 1)
+    assert third.spans[0].start == pytest.approx(5.12, abs=0.5)
+    assert third.spans[0].end == pytest.approx(5.12 + 6.4, abs=0.8)
+    assert 5.0 < third.seconds_saved < 6.4
+    assert len(kept) == len(episode) - round(third.seconds_saved * SAMPLE_RATE)
+    assert pieces[0] == (0.0, 0.0)
+    assert load_library(library).seen == [3]
+
+
+def test_restore_times_maps_cut_audio_back_to_the_original() -> None:
+    samples = np.zeros(30 * SAMPLE_RATE, dtype=np.float32)
+    kept, pieces = cut_spans(samples, [JingleSpan(0.0, 5.0, 0), JingleSpan(12.0, 15.0, 1)])
+    transcript = Transcript.from_segments(
+        [
+            {"start": 0.0, "end": 6.0, "text": "after the intro"},
+            {"start": 7.5, "end": 9.0, "text": "after the spot"},
+        ]
+    )
+
+    restored = restore_times(transcript, pieces)
+
+    assert len(kept) == 22 * SAMPLE_RATE
+    assert pieces == [(0.0, 5.0), (7.0, 8.0)]
+    assert [(segment.start, segment.end) for segment in restored] == [(5.0, 11.0), (15.5, 17.0)]
+
+
+def test_transcribe_without_jingles_reports_the_cut(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    library = tmp_path / "jingles.npz"
+    for seed, jingle_at in [(0, 10.0), (1, 21.3331)]:
+        strip_jingles(_episode(seed, jingle_at), library)
+    transcribed: list[float] = []
+
+    def fake_transcribe(audio: np.ndarray, **_: object) -> Transcript:
+        transcribed.append(len(audio) / SAMPLE_RATE)
+        return Transcript.from_segments([{"start": 6.0, "end": 8.0, "text": "after the jingle"}])
+
+    monkeypatch.setattr("pod2text.jingles.whisper.load_audio", lambda _: _episode(2, 5.0))
+    monkeypatch.setattr("pod2text.jingles.transcribe_samples", fake_transcribe)
+
+    transcript = transcribe_without_jingles(tmp_path / "audio.mp3", library)
+
+    report = json.loads((tmp_path / JINGLE_REPORT_FILENAME).read_text(encoding="utf-8"))
+    assert len(report["spans"]) == 1
+    assert transcribed == [
+        pytest.approx(report["audio_seconds"] - report["seconds_saved"], abs=0.01)
+    ]
+    assert transcript.segment(0).start == pytest.approx(6.0 + report["seconds_saved"], abs=0.01)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+
+from pod2text.language import (
+    SAMPLE_RATE,
+    cached_language,
+    detect_feed_language,
+    feed_language,
+    load_languages,
+    probe_window,
+    record_language,
+)
+from pod2text.stream import PcmBuffer
+
+FEED = "https://feed.example.com"
+
+
+class FakeModel:
+    dims = SimpleNamespace(n_mels=80)
+    device = "cpu"
+
+    def __init__(self, probabilities: dict[str, float]) -> None:
+        self.probabilities = probabilities
+        self.calls = 0
+
+    def detect_language(self, mel: Any) -> tuple[None, dict[str, float]]:
+        assert mel.shape[-1] == 3000
+        self.calls += 1
+        return None, self.probabilities
+
+
+def _episode_audio() -> np.ndarray:
+    """40 s of a level music bed, then 60 s of bursts with pauses like speech."""
+    rng = np.random.default_rng(0)
+    t = np.arange(40 * SAMPLE_RATE) / SAMPLE_RATE
+    music = 0.3 * np.sin(2 * np.pi * 220 * t)
+    speech = 0.3 * rng.standard_normal(60 * SAMPLE_RATE)
+    gaps = (np.arange(len(speech)) // (SAMPLE_RATE // 10)) % 3 == 2
+    speech[gaps] *= 0.01
+    return np.concatenate([music, speech]).astype(np.float32)
+
+
+def test_probe_window_skips_music_intro() -> None:
+    start, window = probe_window(_episode_audio())
+
+    assert start >= 40.0
+    assert len(window) == 30 * SAMPLE_RATE
+    short = np.zeros(10 * SAMPLE_RATE, dtype=np.float32)
+    assert probe_window(short)[0] == 0.0
+
+
+def test_feed_becomes_stable_after_agreeing_detections(tmp_path: Path) -> None:
+    path = tmp_path / "feed_languages.json"
+    for _ in range(3):
+        record_language(path, FEED, "de", 0.9)
+
+    choice = cached_language(path, FEED, stable_after=3)
+    assert choice is not None and choice.language == "de"
+    assert cached_language(path, FEED, stable_after=4) is None
+
+    record_language(path, FEED, "en", 0.8)
+    assert load_languages(path)[FEED].stable_episodes == 1
+    assert cached_language(path, FEED, stable_after=3) is None
+    assert feed_language(path, FEED) == "en"
+    assert feed_language(path, "https://other.example.com") == "de"
+
+
+def test_detect_feed_language_records_confident_probe_only(tmp_path: Path) -> None:
+    path = tmp_path / "feed_languages.json"
+    audio = PcmBuffer.from_array(_episode_audio())
+
+    confident = detect_feed_language(path, FEED, audio, FakeModel({"en": 0.85, "de": 0.1}))
+    unsure = detect_feed_language(path, FEED, audio, FakeModel({"fr": 0.4, "en": 0.35}))
+
+    assert (confident.language, confident.source) == ("en", "probe")
+    assert confident.probe_start is not None and confident.probe_start >= 40.0
+    # A shaky probe falls back to the feed's history and does not count towards stability.
+    assert unsure.language == "en"
+    assert "probe said 'fr'" in unsure.describe()
+    assert load_languages(path)[FEED].stable_episodes == 1
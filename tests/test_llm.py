@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+import openai
+import pytest
+
+from pod2text.llm import LLMClient, parse_reset_duration
+
+
+class FakeRawResponse:
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = httpx.Headers(headers)
+
+    def parse(self) -> Any:
+        class Usage:
+            input_tokens = 120
+            output_tokens = 30
+
+        class Response:
+            output_text = "ok"
+            usage = Usage()
+
+        return Response()
+
+
+class FakeOpenAI:
+    def __init__(self, outcomes: list[Any]) -> None:
+        self.outcomes = outcomes
+        self.calls = 0
+        self.responses = self
+        self.with_raw_response = self
+
+    def create(self, **_: object) -> Any:
+        outcome = self.outcomes[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class FakeAsyncOpenAI(FakeOpenAI):
+    async def create(self, **request: object) -> Any:
+        await asyncio.sleep(0)
+        return super().create(**request)
+
+
+def _rate_limit_error(headers: dict[str, str]) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("slow down", response=response, body=None)
+
+
+def test_parse_reset_duration_handles_openai_formats() -> None:
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("1.5s") == 1.5
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("2") == 2.0
+
+
+def test_create_response_retries_rate_limits_with_retry_after(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr("pod2text.llm.time.sleep", sleeps.append)
+    fake = FakeOpenAI(
+        [
+            _rate_limit_error({"retry-after-ms": "250"}),
+            FakeRawResponse({"x-ratelimit-remaining-requests": "9"}),
+        ]
+    )
+    client = LLMClient("sk-test", client=fake)
+
+    response = client.create_response(model="m", input=[{"role": "user", "content": "hi"}])
+
+    assert response.output_text == "ok"
+    assert sleeps == [0.25]
+    stats = client.stats()
+    assert (stats.requests, stats.retries, stats.rate_limited) == (2, 1, 1)
+    assert (stats.input_tokens, stats.output_tokens) == (120, 30)
+    assert client.requests.remaining == 9
+
+
+def test_create_response_waits_for_exhausted_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [100.0]
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr("pod2text.llm.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("pod2text.llm.time.sleep", fake_sleep)
+    headers = {
+        "x-ratelimit-limit-requests": "10",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+    }
+    fake = FakeOpenAI([FakeRawResponse(headers), FakeRawResponse(headers)])
+    client = LLMClient("sk-test", client=fake)
+
+    client.create_response(model="m", input="first")
+    client.create_response(model="m", input="second")
+
+    assert sleeps == [2.0]
+    assert client.stats().throttled == 1
+    assert fake.calls == 2
+
+
+def test_create_response_gives_up_after_max_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("pod2text.llm.time.sleep", lambda _: None)
+    fake = FakeOpenAI([_rate_limit_error({}) for _ in range(3)])
+    client = LLMClient("sk-test", max_retries=2, client=fake)
+
+    with pytest.raises(openai.RateLimitError):
+        client.create_response(model="m", input="x")
+
+    assert fake.calls == 3
+    assert client.stats().failures == 1
+
+
+def test_create_response_async_retries_on_the_loop_with_one_client_per_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def blocking_sleep(_: float) -> None:
+        raise AssertionError("async calls must not block the event loop")
+
+    monkeypatch.setattr("pod2text.llm.time.sleep", blocking_sleep)
+    created: list[FakeAsyncOpenAI] = []
+
+    def fake_async_openai(**_: object) -> FakeAsyncOpenAI:
+        fake = FakeAsyncOpenAI(
+            [
+                _rate_limit_error({"retry-after-ms": "10"}),
+                *(FakeRawResponse({}) for _ in range(3)),
+            ]
+        )
+        created.append(fake)
+        return fake
+
+    monkeypatch.setattr("pod2text.llm.AsyncOpenAI", fake_async_openai)
+    client = LLMClient("sk-test", client=FakeOpenAI([]))
+
+    async def run(count: int) -> list[Any]:
+        return await asyncio.gather(
+            *(client.create_response_async(model="m", input="x") for _ in range(count))
+        )
+
+    first = asyncio.run(run(3))
+    second = asyncio.run(run(1))
+
+    assert [response.output_text for response in first + second] == ["ok"] * 4
+    assert len(created) == 2
+    assert [fake.calls for fake in created] == [4, 2]
+    assert client.stats().retries == 2
+
+
+def test_aclose_closes_the_client_of_the_running_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    closed: list[FakeAsyncOpenAI] = []
+
+    class ClosingAsyncOpenAI(FakeAsyncOpenAI):
+        async def close(self) -> None:
+            closed.append(self)
+
+    monkeypatch.setattr(
+        "pod2text.llm.AsyncOpenAI", lambda **_: ClosingAsyncOpenAI([FakeRawResponse({})])
+    )
+    client = LLMClient("sk-test", client=FakeOpenAI([]))
+
+    async def run() -> None:
+        await client.create_response_async(model="m", input="x")
+        await client.aclose()
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert len(closed) == 1
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from pod2text.llm_batch import (
+    LocalBatchBackend,
+    SummaryJob,
+    parse_batch_output,
+    run_summary_batch,
+)
+from pod2text.transcript import Transcript
+
+
+def _job(tmp_path: Path, name: str, text: str) -> SummaryJob:
+    path = tmp_path / f"{name}.ndjson"
+    Transcript.from_segments([{"start": 0.0, "end": 3.0, "text": text}]).write_ndjson(path)
+    return SummaryJob(custom_id=name, title=name.title(), transcript_path=path)
+
+
+def test_run_summary_batch_with_local_backend(tmp_path: Path) -> None:
+    requests: list[dict[str, Any]] = []
+
+    def respond(body: dict[str, Any]) -> str:
+        requests.append(body)
+        if "kaputt" in body["input"][-1]["content"]:
+            raise ValueError("model refused")
+        return "# Episode Summary\n- ok"
+
+    jobs = [_job(tmp_path, "one", "Äh, hallo Welt"), _job(tmp_path, "two", "kaputt")]
+    backend = LocalBatchBackend(tmp_path / "backend", respond=respond)
+
+    results = run_summary_batch(jobs, backend, tmp_path / "work", model="gpt-test", poll_seconds=0)
+
+    assert results["one"].summary == "# Episode Summary\n- ok"
+    assert results["two"].summary is None
+    assert "model refused" in str(results["two"].error)
+    assert requests[0]["model"] == "gpt-test"
+    assert "[00:00] hallo Welt" in requests[0]["input"][-1]["content"]
+    manifest = json.loads(next((tmp_path / "work").glob("*.json")).read_text(encoding="utf-8"))
+    assert manifest["status"] == "completed"
+    assert [job["custom_id"] for job in manifest["jobs"]] == ["one", "two"]
+
+
+def test_run_summary_batch_resumes_submitted_batch(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("pod2text.llm_batch.time.sleep", lambda _: None)
+    jobs = [_job(tmp_path, "one", "hallo")]
+
+    class PendingBackend(LocalBatchBackend):
+        submitted = 0
+        polls = 0
+
+        def submit(self, input_path: Path) -> str:
+            PendingBackend.submitted += 1
+            return super().submit(input_path)
+
+        def status(self, batch_id: str) -> str:
+            PendingBackend.polls += 1
+            if PendingBackend.polls == 1:
+                raise KeyboardInterrupt
+            return super().status(batch_id)
+
+    backend = PendingBackend(tmp_path / "backend")
+    try:
+        run_summary_batch(jobs, backend, tmp_path / "work")
+    except KeyboardInterrupt:
+        pass
+    results = run_summary_batch(jobs, backend, tmp_path / "work")
+
+    assert PendingBackend.submitted == 1
+    assert results["one"].summary is not None
+
+
+def test_parse_batch_output_reads_responses_api_bodies() -> None:
+    lines = [
+        json.dumps(
+            {
+                "custom_id": "a",
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "output": [
+                            {"type": "reasoning"},
+                            {"type": "message", "content": [{"type": "output_text", "text": "Hi"}]},
+                        ]
+                    },
+                },
+                "error": None,
+            }
+        ),
+        json.dumps({"custom_id": "b", "response": None, "error": {"code": "expired"}}),
+    ]
+
+    results = parse_batch_output(lines)
+
+    assert results["a"].summary == "Hi"
+    assert results["b"].error == '{"code": "expired"}'
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+import httpx
+import pytest
+
+from pod2text.language import LanguageChoice, record_language
+from pod2text.main import (
+    EpisodeResult,
+    _run,
+    _stage,
+    process_episode_async,
+    run_pipeline_async,
+    summarize_episode_async,
+)
+from pod2text.metrics import METRICS
+from pod2text.options import PipelineOptions
+from pod2text.podcast import Episode
+from pod2text.transcript import Transcript
+
+FEED_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Show</title>
+  <item>
+    <title>Episode 1</title>
+    <guid>ep-1</guid>
+    <enclosure url="https://cdn.example.com/ep1.mp3" type="audio/mpeg" length="5"/>
+  </item>
+</channel></rss>"""
+
+
+def _transport(sent_messages: list[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "feed.example.com":
+            return httpx.Response(200, content=FEED_XML.encode("utf-8"))
+        if request.url.host == "cdn.example.com":
+            return httpx.Response(200, content=b"audio")
+        if request.url.host == "api.telegram.org":
+            sent_messages.append(json.loads(request.content)["text"])
+            return httpx.Response(200, json={"ok": True, "result": {}})
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def pipeline_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("pod2text.main.get_openai_api_key", lambda prompt_if_missing: "sk-test")
+    monkeypatch.setattr("pod2text.main.get_telegram_bot_token", lambda: "token")
+    monkeypatch.setattr("pod2text.main.get_telegram_chat_id", lambda: "chat-id")
+
+
+def test_run_pipeline_async_runs_all_stages(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, pipeline_env: None
+) -> None:
+    transcribed: list[Path] = []
+
+    def fake_transcribe(audio_path: Path, **_: object) -> Transcript:
+        transcribed.append(audio_path)
+        return Transcript.from_segments([{"start": 0.0, "end": 2.0, "text": "hallo welt"}])
+
+    async def fake_summarize(transcript: Transcript, api_key: str, model: str) -> str:
+        assert (transcript.text, api_key) == ("hallo welt", "sk-test")
+        return "# Episode Summary"
+
+    monkeypatch.setattr("pod2text.main.transcribe_segments", fake_transcribe)
+    monkeypatch.setattr("pod2text.main.summarize_transcript_async", fake_summarize)
+    sent: list[str] = []
+
+    async def run() -> tuple[Path, Path]:
+        async with httpx.AsyncClient(transport=_transport(sent)) as client:
+            return await run_pipeline_async(
+                podcast="https://feed.example.com/rss",
+                output_dir=tmp_path,
+                http_client=client,
+            )
+
+    audio_path, summary_path = asyncio.run(run())
+
+    assert audio_path.read_bytes() == b"audio"
+    assert transcribed == [audio_path]
+    assert summary_path.read_text(encoding="utf-8") == "# Episode Summary"
+    stored = Transcript.read_ndjson(summary_path.parent / "transcript.ndjson")
+    assert stored.text == "hallo welt"
+    assert (tmp_path / "summary.md").read_text(encoding="utf-8") == "# Episode Summary"
+    assert len(sent) == 1
+    assert "Episode: Episode 1" in sent[0]
+
+
+def test_run_pipeline_async_runs_episodes_concurrently(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, pipeline_env: None
+) -> None:
+    in_flight = 0
+    peak = 0
+
+    async def slow_summarize(transcript: str, api_key: str, model: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return "# Episode Summary"
+
+    monkeypatch.setattr(
+        "pod2text.main.transcribe_segments",
+        lambda *_, **__: Transcript.from_segments([{"start": 0.0, "end": 1.0, "text": "text"}]),
+    )
+    monkeypatch.setattr("pod2text.main.summarize_transcript_async", slow_summarize)
+
+    async def run() -> None:
+        async with httpx.AsyncClient(transport=_transport([])) as client:
+            await asyncio.gather(
+                *(
+                    run_pipeline_async(
+                        podcast="https://feed.example.com/rss",
+                        output_dir=tmp_path / str(index),
+                        http_client=client,
+                    )
+                    for index in range(3)
+                )
+            )
+
+    asyncio.run(run())
+
+    assert peak == 3
+
+
+def test_auto_language_is_detected_until_the_feed_is_stable(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, pipeline_env: None
+) -> None:
+    languages: list[object] = []
+    probes: list[Path] = []
+
+    def fake_transcribe(audio_path: Path, **kwargs: object) -> Transcript:
+        languages.append(kwargs["language"])
+        return Transcript.from_segments([{"start": 0.0, "end": 2.0, "text": "hello world"}])
+
+    def fake_detect(path: Path, feed_url: str, audio: Path, model: object) -> LanguageChoice:
+        probes.append(audio)
+        record_language(path, feed_url, "en", 0.9)
+        return LanguageChoice("en", 0.9, "probe", 0.0)
+
+    async def fake_summarize(transcript: Transcript, api_key: str, model: str) -> str:
+        return "# Summary"
+
+    monkeypatch.setattr("pod2text.main.transcribe_segments", fake_transcribe)
+    monkeypatch.setattr("pod2text.main.detect_feed_language", fake_detect)
+    monkeypatch.setattr("pod2text.main.load_model", lambda name: name)
+    monkeypatch.setattr("pod2text.main.summarize_transcript_async", fake_summarize)
+
+    async def run() -> None:
+        async with httpx.AsyncClient(transport=_transport([])) as client:
+            for _ in range(3):
+                await run_pipeline_async(
+                    podcast="https://feed.example.com/rss",
+                    output_dir=tmp_path,
+                    http_client=client,
+                    options=PipelineOptions(language="auto", language_stable_episodes=2),
+                )
+
+    asyncio.run(run())
+
+    assert languages == ["en", "en", "en"]
+    assert len(probes) == 2
+    stages = {entry["labels"].get("stage") for entry in METRICS.snapshot()["histograms"]}
+    assert "language" in stages
+
+
+def test_deferred_summary_uses_the_language_recorded_for_the_episode(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, pipeline_env: None
+) -> None:
+    feed_url = "https://feed.example.com/rss"
+    episode = Episode("ep-1", "Episode 1", "https://cdn.example.com/ep1.mp3")
+    cleaned: list[str] = []
+
+    def fake_detect(path: Path, feed_url: str, audio: Path, model: object) -> LanguageChoice:
+        record_language(path, feed_url, "en", 0.9)
+        return LanguageChoice("en", 0.9, "probe", 0.0)
+
+    def fake_clean(transcript: Transcript, language: str, drop_ads: bool) -> tuple[str, object]:
+        cleaned.append(language)
+        return transcript.text, None
+
+    async def fake_summarize(transcript: str, api_key: str, model: str) -> str:
+        return "# Summary"
+
+    monkeypatch.setattr(
+        "pod2text.main.transcribe_segments",
+        lambda audio_path, **_: Transcript.from_segments([{"start": 0, "end": 1, "text": "hi"}]),
+    )
+    monkeypatch.setattr("pod2text.main.detect_feed_language", fake_detect)
+    monkeypatch.setattr("pod2text.main.load_model", lambda name: name)
+    monkeypatch.setattr("pod2text.main.clean_transcript", fake_clean)
+    monkeypatch.setattr("pod2text.main.format_cleaning_report", lambda report: "")
+    monkeypatch.setattr("pod2text.main.summarize_transcript_async", fake_summarize)
+    options = PipelineOptions(language="auto", clean=True)
+
+    async def run() -> None:
+        async with httpx.AsyncClient(transport=_transport([])) as client:
+            await process_episode_async(
+                feed_url,
+                episode,
+                tmp_path,
+                options=replace(options, defer_summary=True),
+                http_client=client,
+            )
+            # Another episode of the feed came out in a different language meanwhile.
+            record_language(tmp_path / "feed_languages.json", feed_url, "de", 0.9)
+            await summarize_episode_async(
+                feed_url, episode, tmp_path, options=options, http_client=client
+            )
+
+    asyncio.run(run())
+
+    assert cleaned == ["en"]
+
+
+def test_republished_episode_reuses_transcript_and_summary(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, pipeline_env: None
+) -> None:
+    transcribed: list[Path] = []
+    sent: list[str] = []
+
+    def fake_transcribe(audio_path: Path, **_: object) -> Transcript:
+        transcribed.append(audio_path)
+        return Transcript.from_segments([{"start": 0.0, "end": 2.0, "text": "hallo welt"}])
+
+    async def fake_summarize(transcript: Transcript, api_key: str, model: str) -> str:
+        return "# Episode Summary"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "cdn.example.com":
+            return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"audio")
+        sent.append(json.loads(request.content)["text"])
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    monkeypatch.setattr("pod2text.main.transcribe_segments", fake_transcribe)
+    monkeypatch.setattr("pod2text.main.summarize_transcript_async", fake_summarize)
+    original = Episode("ep-1", "Episode 1", "https://cdn.example.com/ep1.mp3")
+    reissue = Episode("ep-1-reissue", "Episode 1 (re-release)", "https://cdn.example.com/ep1.mp3")
+
+    again = Episode("ep-1-again", "Episode 1 (again)", "https://cdn.example.com/ep1.mp3")
+
+    async def run() -> list[EpisodeResult]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            results: list[EpisodeResult] = []
+            for feed_url, episode in [
+                ("https://feed.example.com/rss", original),
+                ("https://other.example.com/rss", reissue),
+                ("https://third.example.com/rss", again),
+            ]:
+                if episode is again and results[0].audio_path is not None:
+                    # The original's audio has been pruned by now.
+                    results[0].audio_path.unlink()
+                results.append(
+                    await process_episode_async(
+                        feed_url=feed_url,
+                        episode=episode,
+                        output_dir=tmp_path,
+                        # Only the original is transcribed; the copies must inherit "en".
+                        options=PipelineOptions(
+                            skip_duplicates=True,
+                            language="en" if episode is original else "auto",
+                        ),
+                        http_client=client,
+                    )
+                )
+            return results
+
+    first, reused, pruned = asyncio.run(run())
+
+    assert transcribed == [first.audio_path]
+    assert reused.audio_path == first.audio_path
+    assert reused.summary_path is not None
+    assert reused.summary_path != first.summary_path
+    assert reused.summary_path.read_text(encoding="utf-8") == "# Episode Summary"
+    assert Transcript.read_ndjson(reused.transcript_path).text == "hallo welt"
+    for result in (reused, pruned):
+        metadata = json.loads((result.transcript_path.parent / "episode.json").read_text())
+        assert metadata["language"] == "en"
+    assert pruned.audio_path is None
+    assert pruned.summary_path is not None and pruned.summary_path.exists()
+    assert len(sent) == 3
+    assert sent[1].startswith("Episode 1 (re-release)\nDuplicate of already processed episode")
+
+
+def test_cancelled_stage_wait_leaves_the_permit_free() -> None:
+    limit = threading.Semaphore(1)
+    limit.acquire()
+    entered: list[str] = []
+
+    async def download() -> None:
+        async with _stage("download", None, {"download": limit}):
+            entered.append("download")
+
+    async def run() -> None:
+        waiting = asyncio.create_task(download())
+        await asyncio.sleep(0.1)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        limit.release()
+        await download()
+
+    asyncio.run(run())
+
+    assert entered == ["download"]
+    assert limit.acquire(blocking=False)
+
+
+def test_sync_wrappers_close_llm_clients_before_their_loop_ends(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    closed: list[asyncio.AbstractEventLoop] = []
+
+    async def close_loop_clients() -> None:
+        closed.append(asyncio.get_running_loop())
+
+    async def failing() -> None:
+        raise ValueError("boom")
+
+    monkeypatch.setattr("pod2text.main.close_loop_clients", close_loop_clients)
+
+    with pytest.raises(ValueError, match="boom"):
+        _run(failing())
+
+    assert len(closed) == 1 and closed[0].is_closed()
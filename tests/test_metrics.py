@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import urllib.request
+from pathlib import Path
+
+from pod2text.metrics import MetricsRegistry, start_metrics_server
+
+
+def test_render_prometheus_includes_histogram_buckets() -> None:
+    registry = MetricsRegistry()
+    registry.observe("pod2text_stage_duration_seconds", 0.3, stage="download")
+    registry.observe("pod2text_stage_duration_seconds", 42.0, stage="download")
+    registry.inc("pod2text_feed_polls_total", status="304")
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE pod2text_stage_duration_seconds histogram" in text
+    assert 'pod2text_stage_duration_seconds_bucket{stage="download",le="0.5"} 1' in text
+    assert 'pod2text_stage_duration_seconds_bucket{stage="download",le="+Inf"} 2' in text
+    assert 'pod2text_stage_duration_seconds_count{stage="download"} 2' in text
+    assert 'pod2text_feed_polls_total{status="304"} 1' in text
+
+
+def test_write_json_summarizes_stages(tmp_path: Path) -> None:
+    registry = MetricsRegistry()
+    with registry.time("pod2text_stage_duration_seconds", stage="summarize"):
+        pass
+
+    path = registry.write_json(tmp_path / "metrics.json")
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    [histogram] = data["histograms"]
+    assert histogram["labels"] == {"stage": "summarize"}
+    assert histogram["count"] == 1
+
+
+def test_metrics_server_serves_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    registry.set_gauge("pod2text_queue_depth", 3, queue="jobs")
+    server = start_metrics_server(0, registry=registry)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'pod2text_queue_depth{queue="jobs"} 3' in body
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pod2text.model_select import (
+    DurationEstimate,
+    ModelSpeed,
+    choose_model,
+    estimate_duration,
+    load_speeds,
+    model_size,
+    record_speed,
+)
+
+
+def test_choose_model_picks_largest_model_within_budget() -> None:
+    speeds = {"small": ModelSpeed(0.2, 3), "medium": ModelSpeed(0.6, 2)}
+
+    short = choose_model(DurationEstimate(10 * 60, "ffprobe"), 30 * 60, speeds, "medium")
+    long = choose_model(DurationEstimate(120 * 60, "itunes:duration"), 30 * 60, speeds, "medium")
+
+    assert (short.model_name, short.measured) == ("medium", True)
+    assert long.model_name == "small"
+    assert long.estimated_seconds == pytest.approx(120 * 60 * 0.2 * 1.2)
+    assert "duration from itunes:duration" in long.describe()
+
+
+def test_choose_model_falls_back_to_smallest_and_keeps_variant_names() -> None:
+    hopeless = choose_model(DurationEstimate(600 * 60, "file size"), 60, {}, "small")
+    exact = choose_model(DurationEstimate(60, "ffprobe"), 3600, {}, "large-v3")
+
+    assert (hopeless.model_name, hopeless.fits) == ("tiny", False)
+    assert "OVER" in hopeless.describe()
+    assert exact.model_name == "large-v3"
+
+
+def test_choose_model_accepts_every_whisper_name(capsys) -> None:
+    short = DurationEstimate(60, "ffprobe")
+    long = DurationEstimate(60 * 60, "ffprobe")
+
+    assert choose_model(short, 3600, {}, "turbo").model_name == "turbo"
+    assert choose_model(short, 3600, {}, "large-v3-turbo").model_name == "large-v3-turbo"
+    assert choose_model(long, 45 * 60, {}, "large-v2").model_name == "turbo"
+    assert choose_model(short, 3600, {}, "medium.en").model_name == "medium.en"
+    assert model_size("large-v1") == "large"
+
+    custom = choose_model(short, 3600, {}, "distil-whisper")
+    assert (custom.model_name, custom.real_time_factor) == ("distil-whisper", 2.5)
+    assert "No speed class" in capsys.readouterr().out
+
+
+def test_record_speed_keeps_moving_average(tmp_path: Path) -> None:
+    path = tmp_path / "model_speed.json"
+
+    record_speed(path, "small.en", elapsed_seconds=60, audio_seconds=300)
+    record_speed(path, "small", elapsed_seconds=120, audio_seconds=300)
+
+    speed = load_speeds(path)["small"]
+    assert speed.samples == 2
+    assert speed.real_time_factor == pytest.approx(0.2 + 0.3 * (0.4 - 0.2))
+
+
+def test_estimate_duration_prefers_probe_then_feed_then_size(monkeypatch, tmp_path: Path) -> None:
+    audio = tmp_path / "audio.mp3"
+    audio.write_bytes(b"x" * 16_000)
+    monkeypatch.setattr("pod2text.model_select.probe_duration", lambda _: None)
+
+    assert estimate_duration(audio, feed_duration=90.0) == DurationEstimate(90.0, "itunes:duration")
+    assert estimate_duration(audio) == DurationEstimate(1.0, "file size")
+
+    monkeypatch.setattr("pod2text.model_select.probe_duration", lambda _: 42.0)
+    assert estimate_duration(audio, feed_duration=90.0) == DurationEstimate(42.0, "ffprobe")
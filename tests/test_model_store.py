@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import httpx
+import pytest
+import whisper
+
+from pod2text.model_store import MODEL_DIR_ENV, ensure_models, model_dir
+
+WEIGHTS = b"fake whisper weights"
+SHA256 = hashlib.sha256(WEIGHTS).hexdigest()
+
+
+@pytest.fixture
+def fake_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(whisper._MODELS, "fake", f"https://models.example.com/{SHA256}/fake.pt")
+
+
+def _client(body: bytes, requests: list[str]) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(200, content=body)
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_ensure_models_downloads_once_then_only_verifies(tmp_path: Path, fake_model: None) -> None:
+    requests: list[str] = []
+    with _client(WEIGHTS, requests) as client:
+        first = ensure_models(["fake", "fake"], tmp_path, client=client)
+        second = ensure_models(["fake"], tmp_path, client=client)
+
+    assert [check.status for check in first] == ["downloaded"]
+    assert [check.status for check in second] == ["verified"]
+    assert len(requests) == 1
+    assert (tmp_path / "fake.pt").read_bytes() == WEIGHTS
+
+
+def test_offline_check_reports_missing_and_corrupt_weights(
+    tmp_path: Path, fake_model: None
+) -> None:
+    assert [check.status for check in ensure_models(["fake"], tmp_path, download=False)] == [
+        "missing"
+    ]
+    (tmp_path / "fake.pt").write_bytes(b"truncated")
+
+    check = ensure_models(["fake"], tmp_path, download=False)[0]
+
+    assert (check.status, check.ok) == ("corrupt", False)
+
+
+def test_download_with_wrong_checksum_leaves_nothing_behind(
+    tmp_path: Path, fake_model: None
+) -> None:
+    with _client(b"tampered", []) as client, pytest.raises(ValueError, match="Checksum"):
+        ensure_models(["fake"], tmp_path, client=client)
+
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ValueError, match="Unknown Whisper model"):
+        ensure_models(["huge"], tmp_path)
+
+
+def test_model_dir_prefers_environment(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv(MODEL_DIR_ENV, str(tmp_path))
+    assert model_dir() == tmp_path
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import httpx
 import pytest
 
-from pod2text.podcast import fetch_latest_episode, resolve_feed_url
+from pod2text.podcast import (
+    Episode,
+    FeedValidators,
+    fetch_latest_episode,
+    iter_feed_episodes,
+    poll_latest_episode,
+    resolve_feed_url,
+)
 
 
 def test_resolve_feed_url_with_catalog_name() -> None:
@@ -20,24 +31,129 @@ def test_resolve_feed_url_unknown_podcast() -> None:
 
 
 def test_fetch_latest_episode(monkeypatch: pytest.MonkeyPatch) -> None:
-    class Entry:
-        title = "Episode 1"
-        published = "today"
-        links = [
-            {
-                "rel": "enclosure",
-                "type": "audio/mpeg",
-                "href": "https://cdn.example.com/ep1.mp3",
-            }
-        ]
-
-    class Parsed:
-        bozo = False
-        entries = [Entry()]
-
-    monkeypatch.setattr("pod2text.podcast.feedparser.parse", lambda _: Parsed())
+    feed = b"""<rss version="2.0"><channel><item>
+<title>Episode 1</title><pubDate>today</pubDate>
+<enclosure url="https://cdn.example.com/ep1.mp3" type="audio/mpeg"/>
+</item></channel></rss>"""
+    monkeypatch.setattr("pod2text.podcast._feed_chunks", lambda _: (chunk for chunk in [feed]))
 
     episode = fetch_latest_episode("https://example.com/feed.xml")
     assert episode.identifier == "https://cdn.example.com/ep1.mp3"
     assert episode.title == "Episode 1"
     assert episode.audio_url == "https://cdn.example.com/ep1.mp3"
+    assert episode.published == "today"
+
+
+def test_poll_latest_episode_sends_validators_and_stops_on_not_modified(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    feed = b"""<rss version="2.0"><channel><item><guid>ep-1</guid>
+<enclosure url="https://cdn.example.com/ep1.mp3" type="audio/mpeg"/>
+</item></channel></rss>"""
+    sent: list[dict[str, str]] = []
+
+    @contextmanager
+    def fake_stream(
+        method: str, url: str, headers: dict[str, str], **_: object
+    ) -> Iterator[httpx.Response]:
+        sent.append(headers)
+        request = httpx.Request(method, url, headers=headers)
+        if headers.get("If-None-Match") == '"v1"':
+            yield httpx.Response(304, request=request)
+        else:
+            validators = {"ETag": '"v1"', "Last-Modified": "Mon, 19 Oct 2026 06:00:00 GMT"}
+            yield httpx.Response(200, headers=validators, content=feed, request=request)
+
+    monkeypatch.setattr("pod2text.podcast.httpx.stream", fake_stream)
+
+    episode, validators = poll_latest_episode("https://example.com/feed.xml")
+    unchanged, kept = poll_latest_episode("https://example.com/feed.xml", validators)
+
+    assert episode is not None and episode.identifier == "ep-1"
+    assert validators == FeedValidators('"v1"', "Mon, 19 Oct 2026 06:00:00 GMT")
+    assert (unchanged, kept) == (None, validators)
+    assert sent == [
+        {},
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 19 Oct 2026 06:00:00 GMT"},
+    ]
+
+
+def test_iter_feed_episodes_reads_rss_and_atom() -> None:
+    rss = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel>
+<item><title>Folge 2 &amp; mehr</title><guid>ep-2</guid><itunes:duration>62:05</itunes:duration>
+<enclosure url="https://cdn.example.com/2.mp3" type="audio/mpeg"/></item>
+<item><title>Trailer</title><link>https://example.com/trailer</link></item>
+<item><title>Folge 1</title><link>https://example.com/1</link>
+<enclosure url="https://cdn.example.com/1.mp3" type="audio/mpeg"/></item>
+</channel></rss>"""
+    atom = b"""<feed xmlns="http://www.w3.org/2005/Atom"><entry>
+<title>Atom</title><id>urn:ep:1</id><published>2024-01-01T00:00:00Z</published>
+<link rel="enclosure" href="https://cdn.example.com/a.mp3" type="audio/mpeg"/>
+</entry></feed>"""
+
+    episodes = list(iter_feed_episodes([rss[:100], rss[100:]]))
+    assert [(e.identifier, e.title) for e in episodes] == [
+        ("ep-2", "Folge 2 & mehr"),
+        ("https://example.com/1", "Folge 1"),
+    ]
+    assert episodes[0].duration_seconds == 3725.0
+    assert list(iter_feed_episodes([atom])) == [
+        Episode(
+            identifier="urn:ep:1",
+            title="Atom",
+            audio_url="https://cdn.example.com/a.mp3",
+            published="2024-01-01T00:00:00Z",
+        )
+    ]
+
+
+def test_iter_feed_episodes_stops_at_known_identifier() -> None:
+    items = "".join(
+        f"<item><guid>ep-{number}</guid>"
+        f'<enclosure url="https://cdn.example.com/{number}.mp3" type="audio/mpeg"/></item>'
+        for number in range(100, 0, -1)
+    )
+    feed = f"<rss><channel>{items}</channel></rss>".encode()
+    chunks = [feed[offset : offset + 256] for offset in range(0, len(feed), 256)]
+    read: list[bytes] = []
+
+    def stream() -> Iterator[bytes]:
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    episodes = list(iter_feed_episodes(stream(), stop_at={"ep-97"}))
+
+    assert [episode.identifier for episode in episodes] == ["ep-100", "ep-99", "ep-98"]
+    assert len(read) < len(chunks) // 10
+
+
+def test_iter_feed_episodes_falls_back_to_feedparser_for_malformed_feeds() -> None:
+    feed = b"""<rss><channel>
+<item><guid>ep-2</guid><enclosure url="https://cdn.example.com/2.mp3" type="audio/mpeg"/></item>
+<item><title>Caf&eacute;</title><guid>ep-1</guid>
+<enclosure url="https://cdn.example.com/1.mp3" type="audio/mpeg"/></item>
+</channel></rss>"""
+    split = feed.index(b"<item><title>")
+
+    episodes = list(iter_feed_episodes([feed[:split], feed[split:]]))
+
+    assert [(e.identifier, e.title) for e in episodes] == [
+        ("ep-2", "latest_episode"),
+        ("ep-1", "Caf\u00e9"),
+    ]
+
+
+def test_iter_feed_episodes_rejects_feeds_without_entries() -> None:
+    with pytest.raises(ValueError, match="No entries"):
+        list(iter_feed_episodes([b"<rss><channel><title>Empty</title></channel></rss>"]))
+
+
+def test_parse_itunes_duration_formats() -> None:
+    from pod2text.podcast import parse_itunes_duration
+
+    assert parse_itunes_duration("1:02:05") == 3725.0
+    assert parse_itunes_duration("62:05") == 3725.0
+    assert parse_itunes_duration("3725") == 3725.0
+    assert parse_itunes_duration("") is None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from pod2text.profiling import profile_stage
+
+
+def _busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_profile_stage_writes_prof_and_folded_files(tmp_path: Path) -> None:
+    with profile_stage("transcribe", tmp_path):
+        _busy_wait(0.05)
+
+    assert (tmp_path / "transcribe.prof").stat().st_size > 0
+    folded = (tmp_path / "transcribe.folded").read_text(encoding="utf-8")
+    assert "_busy_wait" in folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert ";" in stack
+    assert int(count) >= 1
+
+
+def test_profile_stage_is_noop_when_disabled(tmp_path: Path) -> None:
+    with profile_stage("transcribe", None):
+        pass
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_overlapping_stages_share_one_cprofile(tmp_path: Path) -> None:
+    inner_started = threading.Event()
+    outer_done = threading.Event()
+
+    def download() -> None:
+        with profile_stage("download", tmp_path):
+            inner_started.set()
+            outer_done.wait(5)
+
+    thread = threading.Thread(target=download)
+    thread.start()
+    inner_started.wait(5)
+    try:
+        with profile_stage("transcribe", tmp_path):
+            _busy_wait(0.02)
+    finally:
+        outer_done.set()
+        thread.join()
+
+    assert (tmp_path / "download.prof").exists()
+    assert not (tmp_path / "transcribe.prof").exists()
+    assert "_busy_wait" in (tmp_path / "transcribe.folded").read_text(encoding="utf-8")
+    with profile_stage("summarize", tmp_path):
+        pass
+    assert (tmp_path / "summarize.prof").exists()
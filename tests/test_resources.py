@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextvars import ContextVar
+
+import pytest
+
+from pod2text.resources import (
+    PROCESS_CORES,
+    activate,
+    active_plan,
+    decoding,
+    ffmpeg_threads,
+    plan_cpus,
+    run_in_slot,
+)
+
+_REQUEST: ContextVar[str] = ContextVar("request", default="")
+
+
+def test_plan_reserves_io_and_decode_then_splits_evenly() -> None:
+    plan = plan_cpus(budget=8, transcribe_workers=2, cores=range(16))
+
+    assert plan.io == (0,)
+    assert plan.decode == (1,)
+    assert plan.transcribe == ((2, 3, 4), (5, 6, 7))
+    assert plan.threads_per_worker == 3
+    assert "2 transcription worker(s) x 3 thread(s) on cores 2-4 | cores 5-7" in plan.describe()
+
+
+def test_plan_gives_leftover_cores_to_decoding() -> None:
+    plan = plan_cpus(budget=0, transcribe_workers=4, cores=range(7))
+
+    assert plan.transcribe == ((2,), (3,), (4,), (5,))
+    assert plan.decode == (1, 6)
+
+
+def test_small_budget_shares_cores_instead_of_failing() -> None:
+    plan = plan_cpus(budget=2, transcribe_workers=2, cores=range(4))
+
+    assert plan.transcribe == ((0,), (1,))
+    assert plan.decode == plan.io == (0, 1)
+    with pytest.raises(ValueError, match="cannot give 3"):
+        plan_cpus(budget=2, transcribe_workers=3, cores=range(4))
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs CPU affinity")
+def test_activate_pins_threads_and_sizes_ffmpeg() -> None:
+    plan = plan_cpus(budget=1, transcribe_workers=1, cores=PROCESS_CORES)
+    try:
+        activate(plan)
+        assert active_plan() is plan
+        assert os.environ["OMP_NUM_THREADS"] == "1"
+        assert ffmpeg_threads() == str(len(plan.decode))
+        with decoding():
+            assert os.sched_getaffinity(0) == set(plan.decode)
+        assert os.sched_getaffinity(0) == set(plan.io)
+    finally:
+        activate(None)
+
+    assert active_plan() is None
+    assert ffmpeg_threads() == "0"
+    assert os.sched_getaffinity(0) == set(PROCESS_CORES)
+    assert "OMP_NUM_THREADS" not in os.environ
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs CPU affinity")
+def test_slot_work_runs_on_one_thread_pinned_before_it_starts() -> None:
+    cores = PROCESS_CORES[:1]
+    caller_affinity = os.sched_getaffinity(0)
+
+    def observe() -> tuple[int | None, set[int], str]:
+        return threading.get_ident(), os.sched_getaffinity(0), _REQUEST.get()
+
+    _REQUEST.set("episode-1")
+    first = run_in_slot(cores, observe)
+    second = run_in_slot(cores, observe)
+
+    assert first == second
+    assert first[0] != threading.get_ident()
+    assert first[1:] == (set(cores), "episode-1")
+    assert os.sched_getaffinity(0) == caller_affinity
+    assert run_in_slot((), observe)[0] == threading.get_ident()
+    with pytest.raises(ValueError, match="boom"):
+        run_in_slot(cores, lambda: int("boom"))
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import pytest
+
+from pod2text.metrics import METRICS
+from pod2text.scheduler import (
+    JOB_QUEUE_SECONDS,
+    CancelToken,
+    JobCancelled,
+    JobScheduler,
+    Priority,
+    format_queue,
+)
+
+
+def test_jobs_run_by_priority_then_submission_order() -> None:
+    scheduler = JobScheduler()
+    ran: list[str] = []
+    for name, priority in [
+        ("backfill-1", Priority.BACKFILL),
+        ("new", Priority.NEW_EPISODE),
+        ("backfill-2", Priority.BACKFILL),
+        ("/go", Priority.INTERACTIVE),
+    ]:
+        scheduler.submit(name, lambda _, name=name: ran.append(name), priority)
+
+    while scheduler.run_next(timeout=0) is not None:
+        pass
+
+    assert ran == ["/go", "new", "backfill-1", "backfill-2"]
+    histograms = {entry["name"] for entry in METRICS.snapshot()["histograms"]}
+    assert JOB_QUEUE_SECONDS in histograms
+
+
+def test_submit_deduplicates_by_key() -> None:
+    scheduler = JobScheduler()
+    first = scheduler.submit("/go", lambda _: None, Priority.INTERACTIVE, key="go")
+    second = scheduler.submit("/go", lambda _: None, Priority.INTERACTIVE, key="go")
+
+    assert first is second
+    assert len(scheduler.jobs()) == 1
+
+
+def test_interactive_job_preempts_and_requeues_backfill() -> None:
+    scheduler = JobScheduler()
+    ran: list[str] = []
+
+    def backfill(token: CancelToken) -> None:
+        if not ran:
+            # Stands in for a transcription window boundary after /go arrived.
+            scheduler.submit("/go", lambda _: ran.append("/go"), Priority.INTERACTIVE)
+            ran.append("backfill-window-1")
+            token.check()
+        ran.append("backfill-rest")
+
+    scheduler.submit("backfill", backfill, Priority.BACKFILL, preemptible=True)
+
+    first = scheduler.run_next(timeout=0)
+    assert first is not None and first.state == "queued"
+    scheduler.run_next(timeout=0)
+    resumed = scheduler.run_next(timeout=0)
+
+    assert ran == ["backfill-window-1", "/go", "backfill-rest"]
+    assert resumed is first and resumed.state == "done"
+
+
+def test_cancel_removes_queued_job_and_stops_running_one() -> None:
+    scheduler = JobScheduler()
+    ran: list[str] = []
+    queued = scheduler.submit("later", lambda _: ran.append("later"), Priority.BACKFILL)
+
+    def running(token: CancelToken) -> None:
+        assert scheduler.cancel() is not None
+        token.check()
+        ran.append("unreachable")
+
+    scheduler.submit("now", running, Priority.INTERACTIVE)
+    assert scheduler.cancel(queued.id) is queued
+    job = scheduler.run_next(timeout=0)
+
+    assert job is not None and job.state == "cancelled"
+    assert scheduler.run_next(timeout=0) is None
+    assert ran == []
+    assert scheduler.cancel(999) is None
+
+
+def test_queue_depth_gauge_follows_submit_run_and_cancel() -> None:
+    scheduler = JobScheduler()
+
+    def depth() -> float:
+        return next(
+            entry["value"]
+            for entry in METRICS.snapshot()["gauges"]
+            if entry["name"] == "pod2text_queue_depth" and entry["labels"] == {"queue": "scheduler"}
+        )
+
+    scheduler.submit("first", lambda _: None, Priority.BACKFILL)
+    second = scheduler.submit("second", lambda _: None, Priority.BACKFILL)
+    assert depth() == 2
+    scheduler.run_next(timeout=0)
+    assert depth() == 1
+    scheduler.cancel(second.id)
+    assert depth() == 0
+
+
+def test_on_cancel_runs_for_cancel_but_not_when_stopped() -> None:
+    scheduler = JobScheduler()
+    notified: list[str] = []
+
+    def stopped(token: CancelToken) -> None:
+        token.cancel("stopped")
+        token.check()
+
+    scheduler.submit(
+        "queued", lambda _: None, Priority.BACKFILL, on_cancel=lambda: notified.append("queued")
+    )
+    scheduler.submit(
+        "stopped", stopped, Priority.INTERACTIVE, on_cancel=lambda: notified.append("stopped")
+    )
+    scheduler.cancel(1)
+    scheduler.run_next(timeout=0)
+
+    assert notified == ["queued"]
+
+
+def test_guard_stops_after_reporting_progress() -> None:
+    token = CancelToken()
+    seen: list[float] = []
+    report = token.guard(lambda done, total: seen.append(done))
+
+    report(10.0, 100.0)
+    token.cancel("preempted")
+    with pytest.raises(JobCancelled) as raised:
+        report(20.0, 100.0)
+
+    assert seen == [10.0, 20.0]
+    assert raised.value.reason == "preempted"
+
+
+def test_format_queue_lists_running_job_first() -> None:
+    scheduler = JobScheduler()
+    scheduler.submit("backfill: Folge 1", lambda _: None, Priority.BACKFILL)
+    scheduler.submit("/go", lambda _: None, Priority.INTERACTIVE)
+
+    lines = format_queue(scheduler.jobs()).splitlines()
+
+    assert lines[0].startswith("#2 queued /go (interactive")
+    assert "backfill: Folge 1" in lines[1]
+    assert format_queue([]) == "Queue is empty."
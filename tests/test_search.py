@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from pod2text.search import fts_query, index_transcript, reindex, search, search_db_path
+from pod2text.transcript import Transcript
+
+
+def _transcript(*texts: str) -> Transcript:
+    return Transcript.from_segments(
+        [
+            {"start": index * 40.0, "end": index * 40.0 + 5.0, "text": text}
+            for index, text in enumerate(texts)
+        ]
+    )
+
+
+def test_index_transcript_replaces_episode_passages(tmp_path: Path) -> None:
+    db_path = tmp_path / "search.sqlite"
+    episode_dir = tmp_path / "episode"
+    index_transcript(
+        db_path, episode_dir, "https://feed", "Folge 1", _transcript("Intro", "Über Zölle")
+    )
+
+    hits = search(db_path, "zolle")
+    assert [(hit.title, hit.start) for hit in hits] == [("Folge 1", 40.0)]
+    assert hits[0].snippet == "Über *Zölle*"
+
+    index_transcript(db_path, episode_dir, "https://feed", "Folge 1 (neu)", _transcript("Wetter"))
+    assert search(db_path, "zölle") == []
+    assert [hit.title for hit in search(db_path, "wett*")] == ["Folge 1 (neu)"]
+
+
+def test_index_leaves_a_wal_database_in_rollback_journal_mode(tmp_path: Path) -> None:
+    db_path = tmp_path / "search.sqlite"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+    connection.close()
+
+    index_transcript(db_path, tmp_path / "episode", "https://feed", "Folge 1", _transcript("x"))
+
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    connection.close()
+
+
+def test_reindex_reads_episode_directories(tmp_path: Path) -> None:
+    episode_dir = tmp_path / "feeds" / "feedkey" / "episodekey"
+    episode_dir.mkdir(parents=True)
+    (episode_dir / "episode.json").write_text(
+        json.dumps({"feed_url": "https://feed", "title": "Archiv"}), encoding="utf-8"
+    )
+    _transcript("Die Bundesbank warnt").write_ndjson(episode_dir / "transcript.ndjson")
+
+    assert reindex(tmp_path) == 1
+    assert [hit.title for hit in search(search_db_path(tmp_path), "bundesbank")] == ["Archiv"]
+
+
+def test_fts_query_quotes_terms() -> None:
+    assert fts_query('Kanzler AND "Wahl" OR zins*') == '"Kanzler" "AND" "Wahl" "OR" "zins"*'
+    with pytest.raises(ValueError):
+        search(Path("missing.sqlite"), "   ")
@@ -3,8 +3,13 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from pod2text.podcast import Episode
+from pod2text.options import PipelineOptions
+from pod2text.podcast import Episode, FeedValidators
+from pod2text.scheduler import CancelToken, JobScheduler, Priority
+from pod2text.search import index_transcript, search_db_path
 from pod2text.server import check_go_command_and_run, process_once, run_server
+from pod2text.telegram import BotCommand
+from pod2text.transcript import Transcript
 
 
 def test_process_once_runs_pipeline_for_new_episode(monkeypatch, tmp_path: Path) -> None:
@@ -13,36 +18,109 @@ def test_process_once_runs_pipeline_for_new_episode(monkeypatch, tmp_path: Path)
 
     monkeypatch.setattr("pod2text.server.resolve_feed_url", lambda _: "https://feed.example.com")
     monkeypatch.setattr(
-        "pod2text.server.fetch_latest_episode",
-        lambda _: Episode(
-            identifier="ep-1",
-            title="Episode 1",
-            audio_url="https://cdn.example.com/ep1.mp3",
-            published=None,
+        "pod2text.server.poll_latest_episode",
+        lambda *_: (
+            Episode(
+                identifier="ep-1",
+                title="Episode 1",
+                audio_url="https://cdn.example.com/ep1.mp3",
+                published=None,
+            ),
+            FeedValidators(etag='"v1"'),
         ),
     )
 
     called: list[str] = []
 
-    def fake_run_pipeline(**_: object) -> tuple[Path, Path]:
-        called.append("run")
-        return output_dir / "latest_episode.mp3", output_dir / "summary.md"
+    def fake_process_episode(feed_url: str, episode: Episode, *_: object, **__: object) -> None:
+        called.append(episode.identifier)
 
-    monkeypatch.setattr("pod2text.server.run_pipeline", fake_run_pipeline)
+    monkeypatch.setattr("pod2text.server.process_episode", fake_process_episode)
 
     did_run = process_once(
         podcast="Was jetzt",
         output_dir=output_dir,
-        transcription_model="small",
-        llm_model="gpt-4o-mini",
-        language="de",
+        options=PipelineOptions(),
         state_file=state_file,
     )
 
     assert did_run is True
-    assert called == ["run"]
+    assert called == ["ep-1"]
     stored = json.loads(state_file.read_text(encoding="utf-8"))
     assert stored["episodes"]["https://feed.example.com"] == "ep-1"
+    assert stored["feed_validators"]["https://feed.example.com"]["etag"] == '"v1"'
+
+
+def test_process_once_sends_stored_validators_and_stops_on_not_modified(
+    monkeypatch, tmp_path: Path
+) -> None:
+    state_file = tmp_path / "state.json"
+    state_file.write_text(
+        json.dumps(
+            {
+                "episodes": {"https://feed.example.com": "ep-1"},
+                "feed_validators": {
+                    "https://feed.example.com": {"etag": '"v1"', "last_modified": None}
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr("pod2text.server.resolve_feed_url", lambda _: "https://feed.example.com")
+    sent: list[FeedValidators | None] = []
+
+    def not_modified(
+        feed_url: str, validators: FeedValidators | None
+    ) -> tuple[None, FeedValidators]:
+        sent.append(validators)
+        return None, validators or FeedValidators()
+
+    monkeypatch.setattr("pod2text.server.poll_latest_episode", not_modified)
+
+    did_run = process_once(
+        podcast="Was jetzt",
+        output_dir=tmp_path / "output",
+        options=PipelineOptions(),
+        state_file=state_file,
+    )
+
+    assert did_run is False
+    assert sent == [FeedValidators(etag='"v1"')]
+
+
+def test_process_once_remembers_cancelled_new_episodes(monkeypatch, tmp_path: Path) -> None:
+    state_file = tmp_path / "state.json"
+    episodes = iter(["ep-1", "ep-2"])
+    monkeypatch.setattr("pod2text.server.resolve_feed_url", lambda _: "https://feed.example.com")
+    monkeypatch.setattr(
+        "pod2text.server.poll_latest_episode",
+        lambda *_: (
+            Episode(next(episodes), "Episode", "https://cdn.example.com/ep.mp3"),
+            FeedValidators(),
+        ),
+    )
+
+    def cancelled_run(*_: object, cancel: CancelToken, **__: object) -> None:
+        assert scheduler.cancel() is not None
+        cancel.check()
+
+    monkeypatch.setattr("pod2text.server.process_episode", cancelled_run)
+    scheduler = JobScheduler()
+
+    def poll_and_cancel(cancel_queued: bool) -> str:
+        process_once("Was jetzt", tmp_path, PipelineOptions(), state_file, scheduler=scheduler)
+        if cancel_queued:
+            assert scheduler.cancel(scheduler.jobs()[0].id) is not None
+        else:
+            job = scheduler.run_next(timeout=0)
+            assert job is not None and job.state == "cancelled"
+        return json.loads(state_file.read_text(encoding="utf-8"))["episodes"][
+            "https://feed.example.com"
+        ]
+
+    assert poll_and_cancel(cancel_queued=False) == "ep-1"
+    assert poll_and_cancel(cancel_queued=True) == "ep-2"
+    assert scheduler.jobs() == []
 
 
 def test_process_once_skips_known_episode(monkeypatch, tmp_path: Path) -> None:
@@ -51,29 +129,25 @@ def test_process_once_skips_known_episode(monkeypatch, tmp_path: Path) -> None:
 
     monkeypatch.setattr("pod2text.server.resolve_feed_url", lambda _: "https://feed.example.com")
     monkeypatch.setattr(
-        "pod2text.server.fetch_latest_episode",
-        lambda _: Episode(
-            identifier="ep-1",
-            title="Episode 1",
-            audio_url="https://cdn.example.com/ep1.mp3",
-            published=None,
+        "pod2text.server.poll_latest_episode",
+        lambda *_: (
+            Episode(
+                identifier="ep-1",
+                title="Episode 1",
+                audio_url="https://cdn.example.com/ep1.mp3",
+                published=None,
+            ),
+            FeedValidators(etag='"v1"'),
         ),
     )
 
     called: list[str] = []
-
-    def fake_run_pipeline(**_: object) -> tuple[Path, Path]:
-        called.append("run")
-        return Path("a"), Path("b")
-
-    monkeypatch.setattr("pod2text.server.run_pipeline", fake_run_pipeline)
+    monkeypatch.setattr("pod2text.server.process_episode", lambda *_, **__: called.append("run"))
 
     did_run = process_once(
         podcast="Was jetzt",
         output_dir=tmp_path / "output",
-        transcription_model="small",
-        llm_model="gpt-4o-mini",
-        language="de",
+        options=PipelineOptions(),
         state_file=state_file,
     )
 
@@ -101,9 +175,7 @@ def test_run_server_sends_ready_message_on_start(monkeypatch, tmp_path: Path) ->
         run_server(
             podcast="Was jetzt",
             output_dir=tmp_path / "output",
-            transcription_model="small",
-            llm_model="gpt-4o-mini",
-            language="de",
+            options=PipelineOptions(),
             interval_minutes=30,
             state_file=tmp_path / "state.json",
             notify_startup=True,
@@ -119,7 +191,7 @@ def test_check_go_command_triggers_pipeline(monkeypatch, tmp_path: Path) -> None
     state_file = tmp_path / "state.json"
     state_file.write_text(json.dumps({"telegram_update_offset": 10}), encoding="utf-8")
 
-    monkeypatch.setattr("pod2text.server.poll_go_commands", lambda **_: (True, 11))
+    monkeypatch.setattr("pod2text.server.poll_commands", lambda **_: ([BotCommand(name="go")], 11))
     called: list[str] = []
 
     def fake_run_pipeline(**_: object) -> tuple[Path, Path]:
@@ -131,9 +203,7 @@ def test_check_go_command_triggers_pipeline(monkeypatch, tmp_path: Path) -> None
     triggered, next_offset = check_go_command_and_run(
         podcast="Was jetzt",
         output_dir=tmp_path / "output",
-        transcription_model="small",
-        llm_model="gpt-4o-mini",
-        language="de",
+        options=PipelineOptions(),
         state_file=state_file,
         bot_token="token",
         chat_id="chat-id",
@@ -143,3 +213,74 @@ def test_check_go_command_triggers_pipeline(monkeypatch, tmp_path: Path) -> None
     assert triggered is True
     assert next_offset == 11
     assert called == ["run"]
+
+
+def test_check_go_command_answers_search(monkeypatch, tmp_path: Path) -> None:
+    output_dir = tmp_path / "output"
+    transcript = Transcript.from_segments(
+        [
+            {"start": 0.0, "end": 5.0, "text": "Hallo und willkommen"},
+            {"start": 95.0, "end": 99.0, "text": "Heute geht es um die Schuldenbremse"},
+        ]
+    )
+    index_transcript(
+        search_db_path(output_dir), tmp_path / "ep", "https://feed", "Folge 7", transcript
+    )
+    monkeypatch.setattr(
+        "pod2text.server.poll_commands",
+        lambda **_: ([BotCommand(name="search", argument="schuldenbremse")], 3),
+    )
+    sent: list[str] = []
+    monkeypatch.setattr("pod2text.server.send_text", lambda **kwargs: sent.append(kwargs["text"]))
+    monkeypatch.setattr("pod2text.server.run_pipeline", lambda **_: None)
+
+    triggered, next_offset = check_go_command_and_run(
+        podcast="Was jetzt",
+        output_dir=output_dir,
+        options=PipelineOptions(),
+        state_file=tmp_path / "state.json",
+        bot_token="token",
+        chat_id="chat-id",
+        timeout_seconds=1,
+    )
+
+    assert (triggered, next_offset) == (False, 3)
+    assert "Folge 7 [01:35]" in sent[0]
+    assert "*Schuldenbremse*" in sent[0]
+
+
+def test_check_go_command_queues_go_and_answers_queue_and_cancel(
+    monkeypatch, tmp_path: Path
+) -> None:
+    scheduler = JobScheduler()
+    backfill = scheduler.submit("backfill: Folge 1", lambda _: None, Priority.BACKFILL)
+    commands = [
+        BotCommand(name="cancel", argument=f"#{backfill.id}"),
+        BotCommand(name="go"),
+        BotCommand(name="queue"),
+    ]
+    monkeypatch.setattr("pod2text.server.poll_commands", lambda **_: (commands, 4))
+    sent: list[str] = []
+    monkeypatch.setattr("pod2text.server.send_text", lambda **kwargs: sent.append(kwargs["text"]))
+    runs: list[object] = []
+    monkeypatch.setattr("pod2text.server.run_pipeline", lambda **kwargs: runs.append(kwargs))
+
+    triggered, _ = check_go_command_and_run(
+        podcast="Was jetzt",
+        output_dir=tmp_path / "output",
+        options=PipelineOptions(),
+        state_file=tmp_path / "state.json",
+        bot_token="token",
+        chat_id="chat-id",
+        timeout_seconds=1,
+        scheduler=scheduler,
+    )
+
+    assert triggered is True
+    assert runs == []
+    assert sent[0] == "Removed job #1 (backfill: Folge 1) from the queue."
+    assert sent[1] == "Queued /go as job #2 (0 job(s) ahead)."
+    assert sent[2].startswith("#2 queued /go (interactive, ")
+    job = scheduler.run_next(timeout=0)
+    assert job is not None and job.state == "done"
+    assert isinstance(runs[0]["cancel"], CancelToken)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from pod2text.checkpoint import transcribe_windows
+from pod2text.stream import SAMPLE_RATE, PcmBuffer, StreamDecodeError, StreamDecoder
+
+HEADER = {"format": "pod2text-journal", "audio": "https://cdn/ep.mp3", "window_seconds": 10}
+
+
+class FakeModel:
+    def __init__(self) -> None:
+        self.window_lengths: list[int] = []
+
+    def transcribe(self, audio: np.ndarray, language: str, initial_prompt: str | None) -> Any:
+        self.window_lengths.append(len(audio))
+        end = len(audio) / SAMPLE_RATE
+        return {"segments": [{"start": 0.0, "end": end, "tokens": [1], "text": f" {end:.0f}"}]}
+
+
+def _pcm16(seconds: float) -> bytes:
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16).tobytes()
+
+
+def test_pcm_buffer_waits_for_samples_and_handles_odd_bytes() -> None:
+    pcm = PcmBuffer(expected_seconds=120.0)
+    data = np.arange(SAMPLE_RATE * 2, dtype=np.int16).tobytes()
+    pcm.append_pcm16(data[:3])
+    pcm.append_pcm16(data[3:])
+
+    assert pcm.wait_for(1.0) == (2.0, False)
+    assert pcm.total_seconds == 120.0
+    assert pcm.window(0.0, 1.0)[1] == pytest.approx(1 / 32768)
+
+    threading.Timer(0.05, pcm.finish).start()
+    assert pcm.wait_for(10.0) == (2.0, True)
+    assert pcm.total_seconds == 2.0
+
+
+def test_stream_decoder_appends_output_until_closed() -> None:
+    pcm = PcmBuffer()
+    # ``cat`` stands in for ffmpeg: feeding raw PCM must come back unchanged.
+    decoder = StreamDecoder(pcm, command=["cat"])
+    for _ in range(3):
+        decoder.feed(_pcm16(0.5))
+    decoder.close()
+    decoder.join(timeout=5)
+
+    assert pcm.wait_for(10.0) == (1.5, True)
+
+
+def test_stream_decoder_failure_is_raised_to_the_consumer() -> None:
+    pcm = PcmBuffer()
+    decoder = StreamDecoder(pcm, command=["false"])
+    decoder.feed(b"moov atom not found")
+    decoder.close()
+    decoder.join(timeout=5)
+
+    with pytest.raises(StreamDecodeError, match="exited with 1"):
+        pcm.wait_for(1.0)
+
+
+def test_stream_decoder_survives_a_chatty_decoder() -> None:
+    pcm = PcmBuffer()
+    # Far more warnings than a stderr pipe buffer holds, then a failure.
+    script = "head -c 200000 /dev/zero | tr '\\0' w >&2; cat; echo 'bad frame' >&2; exit 3"
+    decoder = StreamDecoder(pcm, command=["sh", "-c", script])
+    decoder.feed(_pcm16(0.5))
+    decoder.close()
+    decoder.join(timeout=5)
+
+    with pytest.raises(StreamDecodeError, match="exited with 3: w+bad frame"):
+        pcm.wait_for(1.0)
+    assert pcm.seconds == 0.5
+
+
+def test_transcribe_windows_keeps_up_with_a_growing_buffer(tmp_path: Path) -> None:
+    pcm = PcmBuffer(expected_seconds=25.0)
+
+    def download() -> None:
+        for _ in range(5):
+            pcm.append_pcm16(_pcm16(5.0))
+        pcm.finish()
+
+    producer = threading.Thread(target=download)
+    producer.start()
+    model = FakeModel()
+    transcript = transcribe_windows(pcm, tmp_path / "journal.ndjson", model, "de", 10, HEADER)
+    producer.join()
+
+    assert model.window_lengths == [10 * SAMPLE_RATE, 10 * SAMPLE_RATE, 5 * SAMPLE_RATE]
+    assert transcript.duration == 25.0
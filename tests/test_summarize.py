@@ -1,25 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
-from pod2text.summarize import summarize_transcript
+from pod2text.summarize import summarize_chapters_async, summarize_transcript
+from pod2text.topics import Chapter
+from pod2text.transcript import Transcript
 
 
-def test_summarize_transcript_uses_openai_client(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_summarize_transcript_uses_shared_llm_client(monkeypatch: pytest.MonkeyPatch) -> None:
     class DummyResponse:
         output_text = "# Episode Summary"
 
-    class DummyResponses:
+    class DummyClient:
         @staticmethod
-        def create(**_: object) -> DummyResponse:
+        def create_response(**_: object) -> DummyResponse:
             return DummyResponse()
 
-    class DummyClient:
-        def __init__(self, api_key: str) -> None:
-            assert api_key == "sk-test"
-            self.responses = DummyResponses()
+    def fake_get_llm_client(api_key: str) -> DummyClient:
+        assert api_key == "sk-test"
+        return DummyClient()
 
-    monkeypatch.setattr("pod2text.summarize.OpenAI", DummyClient)
+    monkeypatch.setattr("pod2text.summarize.get_llm_client", fake_get_llm_client)
     summary = summarize_transcript("hello world", api_key="sk-test")
     assert summary == "# Episode Summary"
 
@@ -27,3 +30,68 @@ def test_summarize_transcript_uses_openai_client(monkeypatch: pytest.MonkeyPatch
 def test_summarize_transcript_rejects_empty_text() -> None:
     with pytest.raises(ValueError):
         summarize_transcript("   ", api_key="sk-test")
+
+
+def test_summarize_transcript_sends_timestamps_for_segmented_transcripts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    captured: dict[str, object] = {}
+
+    class DummyResponse:
+        output_text = "# Episode Summary"
+
+    class DummyClient:
+        @staticmethod
+        def create_response(**kwargs: object) -> DummyResponse:
+            captured.update(kwargs)
+            return DummyResponse()
+
+    monkeypatch.setattr("pod2text.summarize.get_llm_client", lambda api_key: DummyClient())
+    transcript = Transcript.from_segments(
+        [
+            {"start": 0.0, "end": 5.0, "text": "Intro"},
+            {"start": 95.0, "end": 99.0, "text": "Thema zwei"},
+        ]
+    )
+
+    summarize_transcript(transcript, api_key="sk-test")
+
+    user_message = captured["input"][1]["content"]
+    assert "[00:00] Intro\n[01:35] Thema zwei" in user_message
+    assert "Chapter 1 (03:15)" in user_message
+
+
+def test_summarize_chapters_async_assembles_chapter_markdown(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    requests: list[str] = []
+
+    class DummyResponse:
+        def __init__(self, output_text: str) -> None:
+            self.output_text = output_text
+
+    class DummyClient:
+        @staticmethod
+        async def create_response_async(**kwargs: object) -> DummyResponse:
+            content = kwargs["input"][1]["content"]
+            requests.append(content)
+            if content.startswith("###"):
+                return DummyResponse("## TL;DR\n- Kurz.\n\n## Key Takeaways\n- Merken.")
+            return DummyResponse(f"Title: Über {content.split()[0]}\n- Punkt zu {content}.")
+
+    monkeypatch.setattr("pod2text.summarize.get_llm_client", lambda api_key: DummyClient())
+    chapters = [
+        Chapter(start=0.0, end=300.0, text="Wahl und Parteien"),
+        Chapter(start=305.0, end=600.0, text="Fußball am Wochenende"),
+    ]
+
+    summary = asyncio.run(summarize_chapters_async(chapters, api_key="sk-test"))
+
+    assert summary == (
+        "# Episode Summary\n\n## TL;DR\n- Kurz.\n\n## Chapters\n\n"
+        "### Chapter 1 (00:00): Über Wahl\n- Punkt zu Wahl und Parteien.\n\n"
+        "### Chapter 2 (05:05): Über Fußball\n- Punkt zu Fußball am Wochenende.\n\n"
+        "## Key Takeaways\n- Merken."
+    )
+    assert len(requests) == 3
+    assert requests[2].startswith("### Chapter 1 (00:00): Über Wahl")
@@ -144,3 +144,11 @@ def test_send_text_retries_and_raises_after_exhaustion(monkeypatch) -> None:
 
     assert call_count == 3
     assert sleeps == [2, 4]
+
+
+def test_parse_command_reads_name_and_argument() -> None:
+    from pod2text.telegram import BotCommand, parse_command
+
+    assert parse_command("/search@pod2text_bot  Zinsen EZB ") == BotCommand("search", "Zinsen EZB")
+    assert parse_command("/GO") == BotCommand("go")
+    assert parse_command("hello /go") is None
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import random
+
+from pod2text.topics import segment_topics
+from pod2text.transcript import Transcript
+
+TOPICS = [
+    ["wahl", "partei", "kanzler", "stimmen", "umfrage", "koalition"],
+    ["fußball", "trainer", "spiel", "liga", "verein", "tabelle"],
+    ["klima", "hitze", "emission", "energie", "solar", "wind"],
+]
+
+
+def _transcript(segments_per_topic: int) -> Transcript:
+    rng = random.Random(7)
+    segments = []
+    for topic_index, words in enumerate(TOPICS):
+        for index in range(segments_per_topic):
+            start = (topic_index * segments_per_topic + index) * 10.0
+            text = " ".join(rng.choice(words) for _ in range(8)) + " und das ist so"
+            segments.append({"start": start, "end": start + 10.0, "text": text})
+    return Transcript.from_segments(segments)
+
+
+def test_segment_topics_finds_vocabulary_shifts() -> None:
+    chapters = segment_topics(_transcript(60), language="de")
+
+    assert [(chapter.start, chapter.end) for chapter in chapters] == [
+        (0.0, 600.0),
+        (600.0, 1200.0),
+        (1200.0, 1800.0),
+    ]
+    assert "trainer" in chapters[1].text
+    assert "wahl" not in chapters[1].text
+
+
+def test_segment_topics_keeps_short_transcripts_in_one_chapter() -> None:
+    transcript = _transcript(3)
+
+    chapters = segment_topics(transcript, language="de")
+
+    assert len(chapters) == 1
+    assert chapters[0].text == transcript.text
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from pod2text.transcribe_worker import TranscriptionJob, TranscriptionWorker
+from pod2text.transcript import Transcript
+
+
+def fake_runner(job: TranscriptionJob, progress: Callable[[float, float], None]) -> Transcript:
+    # Runs in the spawned child, so it must be importable at module level.
+    text = job.audio_path.read_text(encoding="utf-8")
+    if text == "crash":
+        os._exit(3)
+    if text == "fail":
+        raise ValueError("unreadable audio")
+    progress(1.0, 2.0)
+    return Transcript.from_segments([{"start": 0.0, "end": 1.0, "text": f"{text} {os.getpid()}"}])
+
+
+def _job(tmp_path: Path, name: str, content: str) -> TranscriptionJob:
+    audio_path = tmp_path / f"{name}.mp3"
+    audio_path.write_text(content, encoding="utf-8")
+    return TranscriptionJob(audio_path, tmp_path / f"{name}.ndjson")
+
+
+def test_worker_is_reused_and_recycled_after_max_jobs(tmp_path: Path) -> None:
+    worker = TranscriptionWorker(max_jobs=2, max_rss_mb=0, runner=fake_runner)
+    progress: list[tuple[float, float]] = []
+
+    def report(done: float, total: float) -> None:
+        progress.append((done, total))
+
+    try:
+        first = worker.transcribe(_job(tmp_path, "one", "hello"), report)
+        second = worker.transcribe(_job(tmp_path, "two", "world"))
+        third = worker.transcribe(_job(tmp_path, "three", "again"))
+    finally:
+        worker.close()
+
+    pids = [transcript.text.split()[-1] for transcript in (first, second, third)]
+    assert first.text.startswith("hello")
+    assert (tmp_path / "two.ndjson").exists()
+    assert pids[0] == pids[1] != pids[2]
+    assert pids[0] != str(os.getpid())
+    assert worker.recycles == 1
+    assert progress == [(1.0, 2.0)]
+
+
+def test_worker_survives_job_errors_and_crashes(tmp_path: Path) -> None:
+    worker = TranscriptionWorker(max_jobs=10, max_rss_mb=0, runner=fake_runner)
+    try:
+        with pytest.raises(RuntimeError, match="ValueError: unreadable audio"):
+            worker.transcribe(_job(tmp_path, "bad", "fail"))
+        pid = worker.pid
+        with pytest.raises(RuntimeError, match="exit code 3"):
+            worker.transcribe(_job(tmp_path, "dead", "crash"))
+        recovered = worker.transcribe(_job(tmp_path, "ok", "fine"))
+    finally:
+        worker.close()
+
+    assert recovered.text.startswith("fine")
+    assert recovered.text.split()[-1] != str(pid)
+    assert not (tmp_path / "dead.ndjson").exists()
+
+
+def test_worker_recycles_when_rss_exceeds_limit(tmp_path: Path) -> None:
+    worker = TranscriptionWorker(max_jobs=10, max_rss_mb=1, runner=fake_runner)
+    try:
+        worker.transcribe(_job(tmp_path, "one", "hello"))
+    finally:
+        worker.close()
+
+    assert worker.recycles == 1
+    assert worker.pid is None
+
+
+def test_worker_rejects_invalid_limits() -> None:
+    with pytest.raises(ValueError):
+        TranscriptionWorker(max_jobs=0)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from pod2text.transcript import Transcript
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.0, "text": " Hallo und willkommen.", "tokens": [1, 2, 3]},
+    {"start": 4.0, "end": 9.5, "text": " Heute geht es um Energie.", "tokens": [4, 5, 6, 7]},
+    {"start": 9.5, "end": 12.0, "text": "   ", "tokens": [8]},
+    {"start": 40.0, "end": 45.0, "text": " Zweites Thema: Verkehr.", "tokens": [9, 10]},
+]
+
+
+def test_from_segments_builds_shared_text_buffer() -> None:
+    transcript = Transcript.from_segments(SEGMENTS)
+
+    assert len(transcript) == 3
+    assert transcript.text == (
+        "Hallo und willkommen. Heute geht es um Energie. Zweites Thema: Verkehr."
+    )
+    assert list(transcript.tokens) == [3, 4, 2]
+    assert transcript.segment(1).text == "Heute geht es um Energie."
+    assert transcript.duration == 45.0
+
+
+def test_time_and_offset_lookups() -> None:
+    transcript = Transcript.from_segments(SEGMENTS)
+
+    assert transcript.text_at_time(5.0) == "Heute geht es um Energie."
+    assert transcript.text_at_time(100.0) == "Zweites Thema: Verkehr."
+    offset = transcript.text.index("Verkehr")
+    assert transcript.time_at_offset(offset) == 40.0
+    assert transcript.text_between(0.0, 40.0) == ("Hallo und willkommen. Heute geht es um Energie.")
+
+
+def test_timestamped_text_groups_segments_into_blocks() -> None:
+    transcript = Transcript.from_segments(SEGMENTS)
+
+    assert transcript.timestamped_text(interval_seconds=30) == (
+        "[00:00] Hallo und willkommen. Heute geht es um Energie.\n[00:40] Zweites Thema: Verkehr."
+    )
+
+
+def test_ndjson_round_trip(tmp_path: Path) -> None:
+    transcript = Transcript.from_segments(SEGMENTS)
+    path = transcript.write_ndjson(tmp_path / "transcript.ndjson")
+
+    restored = Transcript.read_ndjson(path)
+
+    assert restored.text == transcript.text
+    assert list(restored.starts) == list(transcript.starts)
+    assert list(restored.tokens) == list(transcript.tokens)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from pod2text.main import EpisodeResult
+from pod2text.metrics import METRICS
+from pod2text.options import PipelineOptions
+from pod2text.podcast import Episode
+from pod2text.scheduler import JobCancelled, JobScheduler, Priority
+from pod2text.server import deliver_finished
+from pod2text.work_queue import (
+    WorkQueue,
+    episode_job_key,
+    episode_payload,
+    format_counts,
+    payload_episode,
+    run_worker,
+)
+
+
+def _episode(identifier: str) -> Episode:
+    return Episode(
+        identifier=identifier,
+        title=f"Folge {identifier}",
+        audio_url=f"https://cdn.example.com/{identifier}.mp3",
+        published=None,
+        duration_seconds=600.0,
+    )
+
+
+def _enqueue(queue: WorkQueue, identifier: str, priority: Priority) -> int:
+    episode = _episode(identifier)
+    options = PipelineOptions(transcription_model="base", resumable=True)
+    return queue.enqueue(
+        episode_job_key("https://feed", episode),
+        episode_payload("https://feed", episode, options),
+        priority,
+    )
+
+
+def test_claim_follows_priority_and_enqueue_deduplicates(tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    backfill = _enqueue(queue, "old", Priority.BACKFILL)
+    _enqueue(queue, "new", Priority.NEW_EPISODE)
+    # /go for an episode that is already waiting promotes it instead of adding a copy.
+    assert _enqueue(queue, "old", Priority.INTERACTIVE) == backfill
+
+    first = queue.claim("host-a", lease_seconds=60)
+    second = queue.claim("host-b", lease_seconds=60)
+
+    assert first is not None and first.id == backfill
+    assert second is not None and payload_episode(second.payload)[1].identifier == "new"
+    assert queue.claim("host-c") is None
+    feed_url, episode, options = payload_episode(first.payload)
+    assert (feed_url, episode.duration_seconds) == ("https://feed", 600.0)
+    assert (options.transcription_model, options.resumable) == ("base", True)
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    _enqueue(queue, "ep", Priority.NEW_EPISODE)
+
+    stale = queue.claim("host-a", lease_seconds=0.01)
+    time.sleep(0.05)
+    fresh = queue.claim("host-b", lease_seconds=60)
+
+    assert stale is not None and fresh is not None and fresh.id == stale.id
+    assert fresh.attempts == 2
+    assert queue.heartbeat(stale.id, "host-a", 60) is False
+    assert queue.complete(stale.id, "host-a", {}) is False
+    assert queue.heartbeat(fresh.id, "host-b", 60) is True
+    assert queue.complete(fresh.id, "host-b", {"transcript_path": "t.ndjson"}) is True
+    assert [job.result for job in queue.finished()] == [{"transcript_path": "t.ndjson"}]
+
+
+def test_job_whose_lease_keeps_expiring_is_given_up(tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    _enqueue(queue, "ep", Priority.NEW_EPISODE)
+
+    for _ in range(2):
+        # The worker dies (e.g. killed for memory) without failing the job.
+        assert queue.claim("host-a", lease_seconds=0.01, max_attempts=2) is not None
+        time.sleep(0.05)
+
+    assert queue.claim("host-b", max_attempts=2) is None
+    assert queue.counts() == {"failed": 1}
+
+
+def test_failed_jobs_are_retried_then_given_up(tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    _enqueue(queue, "ep", Priority.BACKFILL)
+
+    for _ in range(2):
+        job = queue.claim("host-a")
+        assert job is not None
+        queue.fail(job.id, "host-a", "ValueError: no audio", max_attempts=2)
+
+    assert queue.claim("host-a") is None
+    assert queue.counts() == {"failed": 1}
+    assert format_counts(queue.counts()) == "Shared queue: 1 failed."
+    # Queuing it again (e.g. /go) starts over.
+    _enqueue(queue, "ep", Priority.INTERACTIVE)
+    assert queue.counts() == {"queued": 1}
+    gauges = METRICS.snapshot()["gauges"]
+    assert {"name": "pod2text_queue_depth", "labels": {"queue": "shared"}, "value": 1} in gauges
+
+
+def test_run_worker_transcribes_without_summary_and_completes(monkeypatch, tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    _enqueue(queue, "ep", Priority.NEW_EPISODE)
+    calls: list[dict[str, object]] = []
+
+    def fake_process_episode(feed_url, episode, output_dir, **kwargs):
+        calls.append({"episode": episode.identifier, **kwargs})
+        return EpisodeResult(output_dir / "audio.mp3", output_dir / "transcript.ndjson", None)
+
+    monkeypatch.setattr("pod2text.work_queue.process_episode", fake_process_episode)
+
+    assert run_worker(queue, tmp_path / "out", "host-a", once=True) == 1
+    assert calls[0]["episode"] == "ep"
+    assert calls[0]["options"].defer_summary is True
+    assert calls[0]["post_to_telegram"] is False
+    assert queue.counts() == {"done": 1}
+
+
+def test_run_worker_abandons_job_when_cancelled(monkeypatch, tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    _enqueue(queue, "ep", Priority.NEW_EPISODE)
+
+    def lost_lease(*_, **__):
+        raise JobCancelled("lease lost")
+
+    monkeypatch.setattr("pod2text.work_queue.process_episode", lost_lease)
+
+    assert run_worker(queue, tmp_path / "out", "host-a", once=True) == 0
+    assert queue.counts() == {"leased": 1}
+
+
+def test_deliver_finished_summarizes_and_marks_delivered(monkeypatch, tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    _enqueue(queue, "ep", Priority.INTERACTIVE)
+    job = queue.claim("host-a")
+    assert job is not None
+    queue.complete(job.id, "host-a", {"transcript_path": "t.ndjson"})
+    summarized: list[str] = []
+
+    def fake_summarize(feed_url, episode, output_dir, **_):
+        summarized.append(episode.identifier)
+        return output_dir / "summary.md"
+
+    monkeypatch.setattr("pod2text.server.summarize_episode", fake_summarize)
+    scheduler = JobScheduler()
+
+    assert deliver_finished(queue, scheduler, tmp_path / "out") == 1
+    assert deliver_finished(queue, scheduler, tmp_path / "out") == 1
+    assert len(scheduler.jobs()) == 1
+    delivered = scheduler.run_next(timeout=0)
+
+    assert delivered is not None and delivered.priority == Priority.INTERACTIVE
+    assert summarized == ["ep"]
+    assert queue.counts() == {"delivered": 1}